@@ -0,0 +1,225 @@
+'''
+Created on Oct 16, 2026
+
+Benchmarks for the textgrid code
+
+These are not unit tests--they are meant to be run by hand to check that
+operations scale with the size of their input.  Each benchmark runs on
+inputs of increasing size and prints the time taken per item.  For a
+linear-time operation, the time per item should stay roughly constant.
+
+e.g.
+python benchmarks.py
+'''
+
+import os
+import io
+import time
+import tempfile
+
+from praatio import tgio
+
+SIZE_LIST = [10 ** 4, 10 ** 5, 10 ** 6]
+
+
+def _timeIt(func, *args):
+    startTime = time.time()
+    retVal = func(*args)
+
+    return time.time() - startTime, retVal
+
+
+def _makeEntryList(numIntervals, offset=0.0, step=0.01, duration=None):
+    if duration is None:
+        duration = step
+    # Rounded so that adjacent intervals share a boundary exactly
+    return [(round(offset + i * step, 9),
+             round(offset + i * step + duration, 9),
+             "ph%d" % (i % 50))
+            for i in range(numIntervals)]
+
+
+def _writeSyntheticTextgrid(fn, numIntervals, longForm=False):
+    '''Writes a textgrid with a single interval tier of /numIntervals/'''
+    maxT = numIntervals * 0.01
+    entryList = _makeEntryList(numIntervals)
+
+    if longForm is False:
+        tg = tgio.Textgrid()
+        tg.addTier(tgio.IntervalTier("phones", entryList, 0, maxT))
+        tg.save(fn)
+        return
+
+    with io.open(fn, "w", encoding="utf-8") as fd:
+        fd.write(u'File type = "ooTextFile"\nObject class = "TextGrid"\n\n'
+                 u'xmin = 0 \nxmax = %s \ntiers? <exists> \nsize = 1 \n'
+                 u'item []: \n    item [1]:\n'
+                 u'        class = "IntervalTier" \n'
+                 u'        name = "phones" \n'
+                 u'        xmin = 0 \n        xmax = %s \n'
+                 u'        intervals: size = %d \n'
+                 % (repr(maxT), repr(maxT), numIntervals))
+        for i, (start, stop, label) in enumerate(entryList):
+            fd.write(u'        intervals [%d]:\n'
+                     u'            xmin = %s \n'
+                     u'            xmax = %s \n'
+                     u'            text = "%s" \n'
+                     % (i + 1, repr(start), repr(stop), label))
+
+
+def benchmarkOpenTextgrid(sizeList=None):
+    '''Times openTextgrid() on short and long textgrids of increasing size'''
+    if sizeList is None:
+        sizeList = SIZE_LIST
+
+    tmpPath = tempfile.mkdtemp()
+    for longForm in [False, True]:
+        for numIntervals in sizeList:
+            fn = os.path.join(tmpPath, "synthetic.TextGrid")
+            _writeSyntheticTextgrid(fn, numIntervals, longForm)
+
+            duration = _timeIt(tgio.openTextgrid, fn)[0]
+            os.remove(fn)
+
+            print("openTextgrid(%s, %d intervals): %0.3fs (%0.3f us/interval)"
+                  % ("long" if longForm else "short", numIntervals, duration,
+                     duration / numIntervals * 10 ** 6))
+    os.rmdir(tmpPath)
+
+
+def benchmarkInsertEntry(sizeList=None):
+    '''
+    Times inserting intervals into a tier one at a time and as a batch
+    
+    Every other interval is inserted one at a time and then the rest
+    are inserted in between them as a single batch.
+    '''
+    if sizeList is None:
+        sizeList = SIZE_LIST
+
+    for numIntervals in sizeList:
+        entryList = _makeEntryList(numIntervals)
+        tier = tgio.IntervalTier("phones", [], 0, numIntervals * 0.01)
+
+        def insertAll():
+            for entry in entryList[::2]:
+                tier.insertEntry(entry)
+
+        for name, duration in [
+                ("insertEntry", _timeIt(insertAll)[0]),
+                ("insertEntries",
+                 _timeIt(tier.insertEntries, entryList[1::2])[0])]:
+            print("%s(%d intervals): %0.3fs (%0.3f us/interval)"
+                  % (name, numIntervals / 2, duration,
+                     duration / numIntervals * 2 * 10 ** 6))
+
+
+def benchmarkSetOperations(sizeList=None):
+    '''
+    Times union(), intersection(), and difference() on two tiers
+    
+    Each interval in one tier overlaps one interval in the other tier.
+    '''
+    if sizeList is None:
+        sizeList = [10 ** 4, 10 ** 5]
+
+    for numIntervals in sizeList:
+        maxT = numIntervals * 0.01 + 0.01
+        tier = tgio.IntervalTier("phones", _makeEntryList(numIntervals),
+                                 0, maxT)
+        otherTier = tgio.IntervalTier("syllables",
+                                      _makeEntryList(numIntervals, 0.002,
+                                                     duration=0.005),
+                                      0, maxT)
+
+        for name in ["union", "intersection", "difference"]:
+            duration = _timeIt(getattr(tier, name), otherTier)[0]
+            print("%s(2 x %d intervals): %0.3fs (%0.3f us/interval)"
+                  % (name, numIntervals, duration,
+                     duration / numIntervals * 10 ** 6))
+
+
+def benchmarkMergeTiers(sizeList=None, numTiers=20):
+    '''Times mergeTiers() on numTiers tiers with staggered intervals'''
+    if sizeList is None:
+        sizeList = [10 ** 4, 10 ** 5]
+
+    for numIntervals in sizeList:
+        tg = tgio.Textgrid()
+        for i in range(numTiers):
+            entryList = _makeEntryList(numIntervals // numTiers,
+                                       i * 0.01, numTiers * 0.01, 0.005)
+            tg.addTier(tgio.IntervalTier("tier%d" % i, entryList,
+                                         0, numIntervals * 0.01))
+
+        duration = _timeIt(tg.mergeTiers)[0]
+        print("mergeTiers(%d x %d intervals): %0.3fs (%0.3f us/interval)"
+              % (numTiers, numIntervals // numTiers, duration,
+                 duration / numIntervals * 10 ** 6))
+
+
+def benchmarkNew(sizeList=None, numEdits=100):
+    '''Times copying a textgrid with new() and then renaming its tiers'''
+    if sizeList is None:
+        sizeList = SIZE_LIST
+
+    for numIntervals in sizeList:
+        tg = tgio.Textgrid()
+        tg.addTier(tgio.IntervalTier("phones", _makeEntryList(numIntervals),
+                                     0, numIntervals * 0.01))
+
+        def editAll():
+            newTG = tg
+            for i in range(numEdits):
+                newTG = newTG.new()
+                newTG.renameTier(newTG.tierNameList[0], "tier%d" % i)
+
+        duration = _timeIt(editAll)[0]
+        print("new() + renameTier()(%d x %d intervals): %0.3fs "
+              "(%0.3f us/edit)" % (numEdits, numIntervals, duration,
+                                   duration / numEdits * 10 ** 6))
+
+
+def benchmarkGetValuesInIntervals(sizeList=None, samplesPerInterval=10):
+    '''Times getValuesInIntervals() on sorted data, like a pitch track'''
+    if sizeList is None:
+        sizeList = SIZE_LIST
+
+    for numIntervals in sizeList:
+        tier = tgio.IntervalTier("phones", _makeEntryList(numIntervals),
+                                 0, numIntervals * 0.01)
+        step = 0.01 / samplesPerInterval
+        dataList = [(i * step, i)
+                    for i in range(numIntervals * samplesPerInterval)]
+
+        duration = _timeIt(tier.getValuesInIntervals, dataList)[0]
+        print("getValuesInIntervals(%d intervals, %d samples): %0.3fs "
+              "(%0.3f us/interval)" % (numIntervals, len(dataList), duration,
+                                       duration / numIntervals * 10 ** 6))
+
+
+def benchmarkConcatenateTextgrids(numList=None, numIntervals=1000):
+    '''Times concatenateTextgrids() on increasing numbers of textgrids'''
+    if numList is None:
+        numList = [10, 100, 1000]
+
+    tg = tgio.Textgrid()
+    tg.addTier(tgio.IntervalTier("phones", _makeEntryList(numIntervals),
+                                 0, numIntervals * 0.01))
+
+    for numTextgrids in numList:
+        duration = _timeIt(tgio.concatenateTextgrids,
+                           [tg] * numTextgrids)[0]
+        print("concatenateTextgrids(%d x %d intervals): %0.3fs "
+              "(%0.3f ms/textgrid)" % (numTextgrids, numIntervals, duration,
+                                       duration / numTextgrids * 10 ** 3))
+
+
+if __name__ == "__main__":
+    benchmarkOpenTextgrid()
+    benchmarkInsertEntry()
+    benchmarkSetOperations()
+    benchmarkMergeTiers()
+    benchmarkNew()
+    benchmarkGetValuesInIntervals()
+    benchmarkConcatenateTextgrids()
@@ -14,6 +14,9 @@ generated files.
 
 import unittest
 import os
+import io
+import shutil
+import wave
 from os.path import join
 
 from praatio import tgio
@@ -66,6 +69,41 @@ class IOTests(unittest.TestCase):
         
         self.assertTrue(areTheSame(inputFN, outputFN, tgio.openTextgrid))
     
+    def test_tg_io_save_normalizes(self):
+        '''Tests that gaps are filled in on save without changing the tg'''
+        outputFN = join(self.outputRoot, "gaps.TextGrid")
+        
+        tg = tgio.Textgrid()
+        tg.addTier(tgio.IntervalTier("words", [(2, 3, "b"), (0.5, 1, "a"),
+                                               (3, 3 + 1e-12, "x")], 0, 4))
+        entryList = list(tg.tierDict["words"].entryList)
+        tg.save(outputFN)
+        
+        self.assertEqual(entryList, tg.tierDict["words"].entryList)
+        self.assertEqual([(0.5, 1, "a"), (2, 3 + 1e-12, "b")],
+                         tgio.openTextgrid(outputFN).tierDict["words"]
+                         .entryList)
+        with io.open(outputFN, "r", encoding="utf-8") as fd:
+            self.assertEqual(3, fd.read().count('\n""\n'))
+    
+    def test_tg_io_file_objects(self):
+        '''Tests writing textgrids to file-like objects'''
+        fn = "mary.TextGrid"
+        inputFN = join(self.dataRoot, fn)
+        outputFN = join(self.outputRoot, fn)
+        
+        tgio.openTextgrid(inputFN).save(outputFN)
+        with io.open(outputFN, "rb") as fd:
+            expectedData = fd.read()
+        
+        byteStream = io.BytesIO()
+        tgio.openTextgrid(inputFN).save(byteStream)
+        self.assertEqual(expectedData, byteStream.getvalue())
+        
+        textStream = io.StringIO()
+        tgio.openTextgrid(inputFN).save(textStream)
+        self.assertEqual(expectedData.decode("utf-8"), textStream.getvalue())
+    
     def test_tg_io_long_vs_short(self):
         '''Tests reading of long vs short textgrids'''
         
@@ -74,6 +112,315 @@ class IOTests(unittest.TestCase):
         
         self.assertTrue(areTheSame(shortFN, longFN, tgio.openTextgrid))
     
+    def test_tg_io_binary(self):
+        '''Tests that binary textgrids match the text textgrids'''
+        for fn in ["mary.TextGrid", "textgrid_to_merge.TextGrid",
+                   "textgrid_to_merge_longfile.TextGrid",
+                   "damon_set_test.TextGrid"]:
+            inputFN = join(self.dataRoot, fn)
+            binaryFN = join(self.outputRoot, fn + ".bin")
+            textFN = join(self.outputRoot, fn)
+            
+            tgio.openTextgrid(inputFN).save(binaryFN, format="binary")
+            binaryTG = tgio.openTextgrid(binaryFN)
+            self.assertTrue(tgio.openTextgrid(inputFN) == binaryTG)
+            
+            # And back again
+            binaryTG.save(textFN)
+            self.assertTrue(areTheSame(inputFN, textFN, tgio.openTextgrid))
+            
+            binaryTG = tgio.openTextgrid(binaryFN)
+            lazyTG = tgio.openTextgrid(binaryFN, lazy=True)
+            self.assertTrue(binaryTG == lazyTG)
+            
+            tierName = binaryTG.tierNameList[-1]
+            subTG = tgio.openTextgrid(binaryFN, tierNames=[tierName])
+            self.assertEqual([tierName], subTG.tierNameList)
+            self.assertEqual(binaryTG.tierDict[tierName],
+                             subTG.tierDict[tierName])
+    
+    def test_tg_io_binary_unicode(self):
+        '''Tests reading and writing non-ascii text in binary textgrids'''
+        outputFN = join(self.outputRoot, "unicode.TextGrid")
+        
+        entryList = [(0, 1, u"m\u0259ri"), (1, 2, u"\U0001F600 smile"),
+                     (2, 3, u"ascii")]
+        tg = tgio.Textgrid()
+        tg.addTier(tgio.IntervalTier(u"w\u00f6rds", entryList, 0, 3))
+        tg.addTier(tgio.PointTier(u"tones", [(1.5, u"H\u2193")], 0, 3))
+        tg.save(outputFN, format="binary")
+        
+        binaryTG = tgio.openTextgrid(outputFN)
+        self.assertTrue(tg == binaryTG)
+        self.assertEqual(entryList,
+                         binaryTG.tierDict[u"w\u00f6rds"].entryList)
+        
+        subTG = tgio.openTextgrid(outputFN, tierNames=["tones"])
+        self.assertEqual([(1.5, u"H\u2193")],
+                         subTG.tierDict["tones"].entryList)
+    
+    def test_tg_io_lazy(self):
+        '''Tests that lazily opened textgrids match fully opened ones'''
+        for fn in ["mary.TextGrid", "textgrid_to_merge_longfile.TextGrid"]:
+            inputFN = join(self.dataRoot, fn)
+            
+            tg = tgio.openTextgrid(inputFN)
+            lazyTG = tgio.openTextgrid(inputFN, lazy=True)
+            
+            # Nothing is parsed until it is asked for
+            tierName = lazyTG.tierNameList[0]
+            self.assertTrue(isinstance(dict.get(lazyTG.tierDict, tierName),
+                                       tgio._UnparsedTier))
+            self.assertEqual(tg.tierDict[tierName],
+                             lazyTG.tierDict[tierName])
+            self.assertTrue(isinstance(dict.get(lazyTG.tierDict, tierName),
+                                       tgio.TextgridTier))
+            
+            self.assertTrue(tg == lazyTG)
+    
+    def test_tg_io_lazy_large_tiers(self):
+        '''Tests skipping over tiers with many entries'''
+        outputFN = join(self.outputRoot, "large_tiers.TextGrid")
+        
+        tg = tgio.Textgrid()
+        for tierName in ["a", "b", "c"]:
+            entryList = [(i, i + 1, "%s%d" % (tierName, i))
+                         for i in range(1500)]
+            tg.addTier(tgio.IntervalTier(tierName, entryList, 0, 1500))
+        tg.save(outputFN)
+        
+        lazyTG = tgio.openTextgrid(outputFN, lazy=True)
+        self.assertEqual(tg.tierDict["c"], lazyTG.tierDict["c"])
+        self.assertTrue(tg == lazyTG)
+        
+        # Unparsed tiers don't depend on the file once it has been opened
+        for format in ["short", "binary"]:
+            tg.save(outputFN, format=format)
+            lazyTG = tgio.openTextgrid(outputFN, lazy=True)
+            tgio.Textgrid().save(outputFN)
+            self.assertTrue(tg == lazyTG)
+    
+    def test_tg_io_lazy_truncated(self):
+        '''Tests locating tiers in a file with fewer entries than listed'''
+        outputFN = join(self.outputRoot, "truncated.TextGrid")
+        
+        for numEntries, numPresent in [(400, 300), (2000, 40)]:
+            entryList = [(i, i + 1, "w%d" % i) for i in range(numEntries)]
+            tg = tgio.Textgrid()
+            tg.addTier(tgio.IntervalTier("words", entryList, 0, numEntries))
+            tg.save(outputFN)
+            
+            # The header (12 lines) and the first /numPresent/ intervals
+            with io.open(outputFN, "r", encoding="utf-8") as fd:
+                lineList = fd.readlines()[:12 + 3 * numPresent]
+            with io.open(outputFN, "w", encoding="utf-8") as fd:
+                fd.writelines(lineList)
+            
+            self.assertRaises(ValueError, tgio.openTextgrid, outputFN,
+                              lazy=True)
+            self.assertRaises(ValueError, tgio.openTextgrid, outputFN,
+                              tierNames=["words"])
+    
+    def test_tg_io_tier_names(self):
+        '''Tests opening only some of the tiers in a textgrid'''
+        inputFN = join(self.dataRoot, "textgrid_to_merge_longfile.TextGrid")
+        
+        tg = tgio.openTextgrid(inputFN)
+        subTG = tgio.openTextgrid(inputFN, tierNames=["sarah", "bob"])
+        
+        self.assertEqual(["bob", "sarah"], subTG.tierNameList)
+        for tierName in subTG.tierNameList:
+            self.assertEqual(tg.tierDict[tierName], subTG.tierDict[tierName])
+    
+    def test_tg_io_escaped_labels(self):
+        '''Tests reading of labels with quotes, newlines, and brackets'''
+        outputFN = join(self.outputRoot, "escaped_labels.TextGrid")
+        
+        data = (u'File type = "ooTextFile"\n'
+               u'Object class = "TextGrid"\n\n'
+               u'xmin = 0 \nxmax = 2 \ntiers? <exists> \nsize = 2 \n'
+               u'item []: \n'
+               u'    item [1]:\n'
+               u'        class = "IntervalTier" \n'
+               u'        name = "words" \n'
+               u'        xmin = 0 \n        xmax = 2 \n'
+               u'        intervals: size = 2 \n'
+               u'        intervals [1]:\n'
+               u'            xmin = 0 \n            xmax = 1 \n'
+               u'            text = "say ""hi"" [1]" \n'
+               u'        intervals [2]:\n'
+               u'            xmin = 1 \n            xmax = 2 \n'
+               u'            text = "two\nlines" \n'
+               u'    item [2]:\n'
+               u'        class = "TextTier" \n'
+               u'        name = "tones" \n'
+               u'        xmin = 0 \n        xmax = 2 \n'
+               u'        points: size = 1 \n'
+               u'        points [1]:\n'
+               u'            number = 1.5 \n'
+               u'            mark = "H*" \n')
+        with io.open(outputFN, "w", encoding="utf-8") as fd:
+            fd.write(data)
+        
+        tg = tgio.openTextgrid(outputFN)
+        
+        self.assertEqual([(0.0, 1.0, 'say "hi" [1]'),
+                          (1.0, 2.0, "two\nlines")],
+                         tg.tierDict["words"].entryList)
+        self.assertEqual([(1.5, "H*")], tg.tierDict["tones"].entryList)
+    
+    def test_tg_io_truncated(self):
+        '''Tests that reading past the end of a textgrid is an error'''
+        inputFN = join(self.dataRoot, "mary.TextGrid")
+        outputFN = join(self.outputRoot, "truncated.TextGrid")
+        
+        with io.open(inputFN, "r", encoding="utf-8") as fd:
+            data = fd.read()
+        
+        # Cut off in the header, in a tier header, and in a tier's entries
+        for numLines in [4, 10, 20, 60]:
+            with io.open(outputFN, "w", encoding="utf-8") as fd:
+                fd.write(u"\n".join(data.split(u"\n")[:numLines]))
+            
+            for columnar in [False, True]:
+                self.assertRaises(ValueError, tgio.openTextgrid, outputFN,
+                                  columnar=columnar)
+    
+    def test_tg_io_columnar(self):
+        '''Tests that columnar textgrids load and save like regular ones'''
+        for fn in ["mary.TextGrid", "textgrid_to_merge.TextGrid"]:
+            inputFN = join(self.dataRoot, fn)
+            tg = tgio.openTextgrid(inputFN)
+            
+            for kwargs in [{}, {"lazy": True}, {"tierNames": ["phone"]}]:
+                columnarTG = tgio.openTextgrid(inputFN, columnar=True,
+                                               **kwargs)
+                for name in columnarTG.tierNameList:
+                    tier = columnarTG.tierDict[name]
+                    self.assertTrue(type(tier).__name__.startswith("Columnar"))
+                    self.assertEqual(tg.tierDict[name], tier)
+            
+            columnarTG = tgio.openTextgrid(inputFN, columnar=True)
+            for fmt in ["short", "binary"]:
+                tgFD = io.BytesIO()
+                columnarFD = io.BytesIO()
+                tg.save(tgFD, format=fmt)
+                columnarTG.save(columnarFD, format=fmt)
+                self.assertEqual(tgFD.getvalue(), columnarFD.getvalue())
+    
+    def test_tg_io_open_textgrids(self):
+        '''Tests opening many textgrids at once in worker processes'''
+        fnList = [join(self.dataRoot, fn) for fn in
+                  ["mary.TextGrid", "missing.TextGrid",
+                   "textgrid_to_merge.TextGrid"]]
+        
+        for workers in [1, 2]:
+            for columnar in [False, True]:
+                resultList = list(tgio.openTextgrids(fnList, workers,
+                                                     columnar=columnar))
+                self.assertEqual(fnList, [fn for fn, _, _ in resultList])
+                
+                for fn, tg, error in resultList:
+                    if fn.endswith("missing.TextGrid"):
+                        self.assertEqual(None, tg)
+                        self.assertTrue(isinstance(error, EnvironmentError))
+                        continue
+                    
+                    self.assertEqual(None, error)
+                    self.assertEqual(tgio.openTextgrid(fn), tg)
+                    for tier in tg.tierDict.values():
+                        self.assertEqual(
+                            columnar,
+                            type(tier).__name__.startswith("Columnar"))
+    
+    def test_tg_io_cache(self):
+        '''Tests loading textgrids through an on-disk cache'''
+        cachePath = join(self.outputRoot, "cache")
+        outputFN = join(self.outputRoot, "cached.TextGrid")
+        
+        for hashContents in [False, True]:
+            cache = tgio.TextgridCache(cachePath, hashContents=hashContents)
+            cache.clear()
+            
+            tgio.openTextgrid(join(self.dataRoot, "mary.TextGrid")).save(
+                outputFN)
+            tg = tgio.openTextgrid(outputFN)
+            self.assertEqual(tg, tgio.openTextgrid(outputFN, cache=cache))
+            self.assertEqual(1, len(os.listdir(cachePath)))
+            
+            # The second time, the textgrid comes from the cache
+            cachedTG = tgio.openTextgrid(outputFN, cache=cache)
+            self.assertEqual(tg, cachedTG)
+            subTG = tgio.openTextgrid(outputFN, ["phone"], cache=cache)
+            self.assertEqual(["phone"], subTG.tierNameList)
+            
+            # Changing the textgrid replaces the old version in the cache
+            tg.removeTier("phone")
+            tg.save(outputFN)
+            os.utime(outputFN, (0, 0))
+            tg = tgio.openTextgrid(outputFN)
+            self.assertEqual(tg, tgio.openTextgrid(outputFN, cache=cache))
+            self.assertEqual(1, len(os.listdir(cachePath)))
+            
+            cache.invalidate(outputFN)
+            self.assertEqual([], os.listdir(cachePath))
+            
+            # Tiers are picked from the parsed textgrid when it is stored
+            subTG = tgio.openTextgrid(outputFN, ["word"], columnar=True,
+                                      cache=cache)
+            self.assertEqual(["word"], subTG.tierNameList)
+            self.assertTrue(isinstance(subTG.tierDict["word"],
+                                       tgio.ColumnarIntervalTier))
+            self.assertEqual(tg.tierDict["word"], subTG.tierDict["word"])
+            self.assertEqual(1, len(os.listdir(cachePath)))
+        
+        # Only the most recently used textgrids are kept
+        cache = tgio.TextgridCache(cachePath, maxSize=1)
+        tgio.openTextgrid(outputFN, cache=cache)
+        self.assertEqual([], os.listdir(cachePath))
+        
+        cache = tgio.TextgridCache(cachePath)
+        tgio.openTextgrid(outputFN, cache=cache)
+        cacheFN = cache._getCacheFN(outputFN)
+        os.utime(cacheFN, (0, 0))
+        
+        otherFN = join(self.outputRoot, "cached_2.TextGrid")
+        tg.save(otherFN)
+        cache.maxSize = os.path.getsize(cacheFN) * 3 // 2
+        tgio.openTextgrid(otherFN, cache=cache)
+        self.assertEqual([os.path.basename(cache._getCacheFN(otherFN))],
+                         os.listdir(cachePath))
+        
+        # A damaged cache file is dropped and the textgrid parsed again
+        cacheFN = cache._getCacheFN(otherFN)
+        size = os.path.getsize(cacheFN)
+        for lazy in [False, True]:
+            with io.open(cacheFN, "r+b") as fd:
+                fd.truncate(size // 2)
+            cachedTG = tgio.openTextgrid(otherFN, lazy=lazy, cache=cache)
+            self.assertEqual(tg, cachedTG)
+            self.assertEqual(size, os.path.getsize(cacheFN))
+            self.assertEqual(size, cache._cacheSize)
+    
+    def test_tg_io_encodings(self):
+        '''Tests reading textgrids in utf-16 and with windows newlines'''
+        fn = "mary.TextGrid"
+        inputFN = join(self.dataRoot, fn)
+        tg = tgio.openTextgrid(inputFN)
+        
+        with io.open(inputFN, "r", encoding="utf-8") as fd:
+            data = fd.read()
+        
+        for encoding in ["utf-16", "utf-16-le", "utf-16-be", "utf-8-sig"]:
+            for newline in ["\n", "\r\n"]:
+                outputFN = join(self.outputRoot, "%s.TextGrid" % encoding)
+                with io.open(outputFN, "w", encoding=encoding,
+                             newline=newline) as fd:
+                    fd.write(data)
+                
+                self.assertEqual(tg, tgio.openTextgrid(outputFN))
+                self.assertEqual(tg, tgio.openTextgrid(outputFN, lazy=True))
+    
     def test_get_audio_duration(self):
         '''Tests that the two audio duration methods output the same value.'''
         wavFN = join(self.dataRoot, "bobby.wav")
@@ -82,6 +429,186 @@ class IOTests(unittest.TestCase):
         durationB = audioio.getDuration(wavFN)
         self.assertTrue(durationA == durationB)
     
+    def test_wav_io(self):
+        '''Tests reading, editing, and writing wav files'''
+        wavFN = join(self.dataRoot, "bobby.wav")
+        outputFN = join(self.outputRoot, "bobby.wav")
+        
+        wavObj = audioio.openAudioFile(wavFN)
+        querySamples = audioio.WavQueryObj(wavFN).getSamples(0, 0.5)
+        self.assertEqual(list(querySamples),
+                         list(wavObj.getSamples(0, 0.5)))
+        
+        wavObj.save(outputFN)
+        with io.open(wavFN, "rb") as fd:
+            expectedData = fd.read()
+        with io.open(outputFN, "rb") as fd:
+            self.assertEqual(expectedData, fd.read())
+        
+        # Edits that undo each other leave the samples as they were
+        newWavObj = wavObj.new()
+        newWavObj.insert(0.5, wavObj.getSamples(0.1, 0.2))
+        newWavObj.insertSilence(0.1, 0.05)
+        newWavObj.deleteSegment(0.1, 0.15)
+        newWavObj.deleteSegment(0.5, 0.6)
+        self.assertEqual(list(wavObj.audioSamples),
+                         list(newWavObj.audioSamples))
+    
+    def test_wav_sample_backends(self):
+        '''Tests that audio behaves the same with and without numpy'''
+        wavFN = join(self.dataRoot, "bobby.wav")
+        outputFN = join(self.outputRoot, "bobby_backend.wav")
+        deleteList = [(0.1, 0.2), (0.5, 0.7)]
+        
+        backendList = [None]
+        if audioio.numpy is not None:
+            backendList.append(audioio.numpy)
+        
+        originalNumpy = audioio.numpy
+        resultList = []
+        try:
+            for numpyModule in backendList:
+                audioio.numpy = numpyModule
+                wavObj = audioio.openAudioFile(wavFN)
+                wavQObj = audioio.WavQueryObj(wavFN)
+                
+                # Subsegments and new WavObjs don't share their samples
+                subWavObj = wavObj.getSubsegment(0.1, 0.2)
+                firstSample = wavObj.audioSamples[4410]
+                subWavObj.audioSamples[0] = firstSample + 1
+                self.assertEqual(firstSample, wavObj.audioSamples[4410])
+                
+                sampleArray = wavObj.audioSamples
+                copiedWavObj = audioio.WavObj(sampleArray, wavObj.params)
+                copiedWavObj.audioSamples[0] = sampleArray[0] + 1
+                self.assertNotEqual(sampleArray[0],
+                                    copiedWavObj.audioSamples[0])
+                
+                wavObj.insert(0.5, subWavObj.getSamples(0, 0.05))
+                wavObj.deleteSegment(0.1, 0.15)
+                wavObj.save(outputFN)
+                resultList.append(
+                    list(audioio.openAudioFile(outputFN).audioSamples))
+                
+                resultList.append(list(wavQObj.getSamples(0.25, 0.5)))
+                resultList.append([list(block) for block
+                                   in wavQObj.iterBlocks(1000, 500)])
+                
+                wavQObj.deleteWavSections(outputFN, deleteList=deleteList,
+                                          operation="sine wave")
+                resultList.append(
+                    list(audioio.openAudioFile(outputFN).audioSamples))
+        finally:
+            audioio.numpy = originalNumpy
+        
+        if len(backendList) == 2:
+            self.assertEqual(resultList[:4], resultList[4:])
+    
+    def test_wav_query_io(self):
+        '''Tests reading frames from a memory-mapped wav file'''
+        wavFN = join(self.dataRoot, "bobby.wav")
+        outputFN = join(self.outputRoot, "bobby_query.wav")
+        
+        wavQObj = audioio.WavQueryObj(wavFN)
+        wavFile = wave.open(wavFN, "r")
+        self.assertEqual(tuple(wavFile.getparams()), tuple(wavQObj.params))
+        
+        wavFile.setpos(int(0.25 * wavQObj.framerate))
+        self.assertEqual(wavFile.readframes(int(0.5 * wavQObj.framerate)),
+                         bytes(wavQObj.getFrames(0.25, 0.75)))
+        wavFile.close()
+        
+        # Ranges past the end of the file are cut short
+        self.assertEqual(bytes(wavQObj.getFrames(0.25)),
+                         bytes(wavQObj.getFrames(0.25, 1000)))
+        
+        wavQObj.outputModifiedWav(wavQObj.getFrames(), outputFN)
+        with io.open(wavFN, "rb") as fd:
+            expectedData = fd.read()
+        with io.open(outputFN, "rb") as fd:
+            self.assertEqual(expectedData, fd.read())
+    
+    def test_wav_query_threads(self):
+        '''Tests extracting segments from one wav file in many threads'''
+        wavFN = join(self.dataRoot, "bobby.wav")
+        wavQObj = audioio.WavQueryObj(wavFN)
+        
+        segmentList = []
+        for i in range(20):
+            outputFN = join(self.outputRoot, "bobby_%d.wav" % i)
+            segmentList.append((i * 0.05, i * 0.05 + 0.1, outputFN))
+        wavQObj.extractSegments(segmentList, workers=4)
+        
+        for startTime, endTime, outputFN in segmentList:
+            wavFile = wave.open(outputFN, "r")
+            self.assertEqual(bytes(wavQObj.getFrames(startTime, endTime)),
+                             wavFile.readframes(wavFile.getnframes()))
+            wavFile.close()
+    
+    def test_wav_query_blocks(self):
+        '''Tests reading a wav file block by block'''
+        wavFN = join(self.dataRoot, "bobby.wav")
+        wavQObj = audioio.WavQueryObj(wavFN)
+        sampleList = list(wavQObj.getSamples(0, wavQObj.getDuration()))
+        
+        blockList = [list(block) for block in wavQObj.iterBlocks(1000)]
+        self.assertEqual(sampleList, sum(blockList, []))
+        self.assertEqual(len(sampleList) % 1000, len(blockList[-1]))
+        
+        # Overlapping blocks over part of the file
+        blockList = list(wavQObj.iterBlocks(1000, 400, 0.1, 0.2))
+        startI = int(0.1 * wavQObj.framerate)
+        endI = int(0.2 * wavQObj.framerate)
+        for i, block in enumerate(blockList):
+            blockStart = startI + i * 400
+            self.assertEqual(sampleList[blockStart:min(blockStart + 1000,
+                                                       endI)],
+                             list(block))
+        self.assertEqual(endI, startI + (len(blockList) - 1) * 400 +
+                         len(blockList[-1]))
+    
+    def test_delete_wav_sections(self):
+        '''Tests removing or filling in sections of a wav file'''
+        wavFN = join(self.dataRoot, "bobby.wav")
+        outputFN = join(self.outputRoot, "bobby_deleted.wav")
+        deleteList = [(0.1, 0.2), (0.3, 0.35), (0.5, 0.7)]
+        wavQObj = audioio.WavQueryObj(wavFN)
+        
+        wavQObj.deleteWavSections(outputFN, deleteList=deleteList)
+        self.assertEqual(
+            list(audioio.openAudioFile(wavFN,
+                                       deleteList=deleteList).audioSamples),
+            list(audioio.openAudioFile(outputFN).audioSamples))
+        
+        wavQObj.deleteWavSections(outputFN, deleteList=deleteList,
+                                  operation="silence")
+        wavObj = audioio.openAudioFile(outputFN)
+        self.assertEqual(
+            list(audioio.openAudioFile(wavFN, deleteList=deleteList,
+                                       doShrink=False).audioSamples),
+            list(wavObj.audioSamples))
+        
+        wavQObj.deleteWavSections(outputFN, deleteList=[(0.5, 0.7)],
+                                  operation="sine wave",
+                                  sineWaveAmplitude=1000)
+        wavObj = audioio.openAudioFile(outputFN)
+        sineWave = audioio.generateSineWave(0.7 - 0.5, 200, wavObj.framerate,
+                                            1000)
+        self.assertEqual(sineWave,
+                         list(wavObj.getSamples(0.5, 0.7))[:len(sineWave)])
+        keptList = list(wavQObj.getSamples(0.2, 0.3))
+        self.assertEqual(keptList,
+                         list(wavObj.getSamples(0.2, 0.3))[:len(keptList)])
+        
+        # A file can be overwritten by the WavQueryObj reading it
+        expectedSamples = list(audioio.openAudioFile(
+            wavFN, deleteList=deleteList).audioSamples)
+        shutil.copy(wavFN, outputFN)
+        with audioio.WavQueryObj(outputFN) as wavQObj:
+            wavQObj.deleteWavSections(outputFN, deleteList=deleteList)
+        self.assertEqual(expectedSamples,
+                         list(audioio.openAudioFile(outputFN).audioSamples))
+    
     def test_duration_tier_io(self):
         '''Tests for reading/writing duration tiers'''
         fn = "mary.DurationTier"
@@ -6,12 +6,15 @@ Created on Dec 7, 2017
 
 import unittest
 import os
+import io
 from os.path import join
 
 from praatio import tgio
 from praatio import dataio
 from praatio import kgio
 from praatio import audioio
+from praatio import praatio_scripts
+from praatio.utilities import utils
 
 class IOTests(unittest.TestCase):
     """Testing input and output"""
@@ -56,6 +59,370 @@ class IOTests(unittest.TestCase):
         self.assertTrue("phone" not in tg.tierNameList)
         self.assertTrue("candy" in tg.tierNameList)
     
+    def test_insert_entry(self):
+        '''Testing insertion of entries and collision handling'''
+        tier = tgio.IntervalTier("words", [(1, 2, "b"), (3, 4, "d")], 0, 5)
+        
+        tier.insertEntry((2, 3, "c"))
+        tier.insertEntry((0, 1, "a"))
+        self.assertEqual([(0, 1, "a"), (1, 2, "b"), (2, 3, "c"), (3, 4, "d")],
+                         tier.entryList)
+        
+        self.assertRaises(tgio.TextgridCollisionException,
+                          tier.insertEntry, (1.5, 2.5, "x"))
+        
+        tier.insertEntry((1.5, 2.5, "x"), False, "merge")
+        self.assertEqual([(0, 1, "a"), (1, 3, "b-x-c"), (3, 4, "d")],
+                         tier.entryList)
+        
+        tier.insertEntry((0.5, 3.5, "y"), False, "replace")
+        self.assertEqual([(0.5, 3.5, "y")], tier.entryList)
+        
+        tier.deleteEntry((0.5, 3.5, "y"))
+        self.assertEqual([], tier.entryList)
+        
+        pointTier = tgio.PointTier("tones", [(1, "H"), (2, "L")], 0, 5)
+        pointTier.insertEntry((1.5, "M"))
+        pointTier.insertEntry((2, "H"), False, "merge")
+        self.assertEqual([(1, "H"), (1.5, "M"), (2, "L-H")],
+                         pointTier.entryList)
+        self.assertRaises(tgio.TextgridCollisionException,
+                          pointTier.insertEntry, (1, "L"))
+    
+    def test_insert_entries(self):
+        '''Testing insertion of many entries at once'''
+        tier = tgio.IntervalTier("words", [(1, 2, "b"), (3, 4, "d")], 0, 5)
+        
+        self.assertRaises(tgio.TextgridCollisionException,
+                          tier.insertEntries, [(0, 1, "a"), (1.5, 2.5, "x")])
+        self.assertEqual([(1, 2, "b"), (3, 4, "d")], tier.entryList)
+        
+        collisionList = tier.insertEntries([(2, 3, "c"), (1.5, 2.5, "x"),
+                                            (0, 1, "a")], False, "merge")
+        self.assertEqual([(0, 1, "a"), (1, 3, "b-x-c"), (3, 4, "d")],
+                         tier.entryList)
+        self.assertEqual(2, len(collisionList))
+        
+        pointTier = tgio.PointTier("tones", [(1, "H"), (2, "L")], 0, 5)
+        pointTier.insertEntries([(2, "H"), (1.5, "M")], False, "replace")
+        self.assertEqual([(1, "H"), (1.5, "M"), (2, "H")],
+                         pointTier.entryList)
+    
+    def test_set_operations(self):
+        '''Testing union, intersection, and difference of tiers'''
+        tier = tgio.IntervalTier("words", [(0, 1, "a"), (1, 2, "b"),
+                                           (3, 4, "c")], 0, 5)
+        otherTier = tgio.IntervalTier("cut", [(0.5, 1.5, "x"),
+                                              (3.2, 3.4, "y")], 0, 5)
+        
+        self.assertEqual([(0, 2, "a-x-b"), (3, 4, "c-y")],
+                         tier.union(otherTier).entryList)
+        self.assertEqual([(0.5, 1, "x-a"), (1, 1.5, "x-b"), (3.2, 3.4, "y-c")],
+                         tier.intersection(otherTier).entryList)
+        self.assertEqual([(0, 0.5, "a"), (1.5, 2, "b"),
+                          (3, 3.2, "c"), (3.4, 4, "c")],
+                         tier.difference(otherTier).entryList)
+    
+    def test_merge_tiers(self):
+        '''Testing merging of interval and point tiers into one of each'''
+        tg = tgio.Textgrid()
+        tg.addTier(tgio.IntervalTier("a", [(0, 1, "a1"), (2, 3, "a2")], 0, 4))
+        tg.addTier(tgio.IntervalTier("b", [(0.5, 1.5, "b1")], 0, 4))
+        tg.addTier(tgio.IntervalTier("c", [(0.2, 0.4, "c1"),
+                                           (3.5, 4, "c2")], 0, 4))
+        tg.addTier(tgio.PointTier("p", [(1, "H"), (2, "L")], 0, 4))
+        tg.addTier(tgio.PointTier("q", [(2, "H")], 0, 5))
+        
+        mergedTG = tg.mergeTiers()
+        self.assertEqual(["a", "p"], mergedTG.tierNameList)
+        self.assertEqual([(0, 1.5, "a1-c1-b1"), (2, 3, "a2"), (3.5, 4, "c2")],
+                         mergedTG.tierDict["a"].entryList)
+        self.assertEqual([(1, "H"), (2, "L-H")],
+                         mergedTG.tierDict["p"].entryList)
+        self.assertEqual(5, mergedTG.tierDict["p"].maxTimestamp)
+        
+        mergedTG = tg.mergeTiers(includeFunc=lambda entry: entry[-1] != "b1",
+                                 tierList=["a", "b"])
+        self.assertEqual([(0, 1, "a1"), (2, 3, "a2")],
+                         mergedTG.tierDict["a"].entryList)
+    
+    def test_concatenate_textgrids(self):
+        '''Testing joining several textgrids end to end'''
+        tgList = []
+        for nameList in [["a", "b"], ["b", "c"], ["a", "b"]]:
+            tg = tgio.Textgrid()
+            for name in nameList:
+                tg.addTier(tgio.IntervalTier(name, [(0.5, 1, name)], 0, 2))
+            tgList.append(tg)
+        
+        tg = tgio.concatenateTextgrids(tgList)
+        self.assertEqual(["b"], tg.tierNameList)
+        self.assertEqual(6, tg.maxTimestamp)
+        self.assertEqual([(0.5, 1, "b"), (2.5, 3, "b"), (4.5, 5, "b")],
+                         tg.tierDict["b"].entryList)
+        self.assertEqual(["a", "b"], tgList[0].tierNameList)
+        
+        tg = tgio.concatenateTextgrids(tgList, onlyMatchingNames=False)
+        self.assertEqual(["a", "b", "c"], tg.tierNameList)
+        self.assertEqual([(0.5, 1, "a"), (4.5, 5, "a")],
+                         tg.tierDict["a"].entryList)
+        self.assertEqual(tg, tgList[0].appendTextgrid(tgList[1], False)
+                         .appendTextgrid(tgList[2], False))
+        
+        # Writing straight to a file gives the same file as saving
+        outputFN = join(self.outputRoot, "concatenated.TextGrid")
+        tg.save(outputFN)
+        with io.open(outputFN, "rb") as fd:
+            expectedData = fd.read()
+        
+        concatenatedFN = join(self.outputRoot, "concatenated_2.TextGrid")
+        tgio.concatenateTextgridsToFile(iter(tgList), concatenatedFN,
+                                        onlyMatchingNames=False)
+        with io.open(concatenatedFN, "rb") as fd:
+            self.assertEqual(expectedData, fd.read())
+    
+    def test_columnar_tier(self):
+        '''Testing that columnar tiers behave like regular tiers'''
+        tgFN = join(self.dataRoot, "mary.TextGrid")
+        
+        tg = tgio.openTextgrid(tgFN)
+        columnarTG = tgio.openTextgrid(tgFN, columnar=True)
+        
+        for name in tg.tierNameList:
+            tier = tg.tierDict[name]
+            columnarTier = columnarTG.tierDict[name]
+            
+            for mode in ["strict", "lax", "truncated"]:
+                for start, stop in [(0.3, 0.9), (0.0, 5.0), (0.41, 0.42)]:
+                    self.assertEqual(
+                        tier.crop(start, stop, mode, True).entryList,
+                        list(columnarTier.crop(start, stop, mode,
+                                               True).entryList))
+            
+            self.assertEqual(tier.editTimestamps(0.1, True),
+                             columnarTier.editTimestamps(0.1, True))
+            self.assertEqual(tier.find("m"), columnarTier.find("m"))
+            self.assertEqual(tier.find("a", substrMatchFlag=True),
+                             columnarTier.find("a", substrMatchFlag=True))
+        
+        dataList = [(i / 100.0, i) for i in range(200)]
+        self.assertEqual(
+            tg.tierDict["phone"].getValuesInIntervals(dataList),
+            columnarTG.tierDict["phone"].getValuesInIntervals(dataList))
+        
+        # Edits go through to the columns
+        columnarTier = columnarTG.tierDict["phone"]
+        columnarTier.insertEntry((2.0, 2.1, "new"), warnFlag=False)
+        self.assertEqual(tgio.Interval(2.0, 2.1, "new"),
+                         columnarTier.entryList[-1])
+        self.assertEqual([len(columnarTier.entryList) - 1],
+                         columnarTier.find("new"))
+    
+    def test_get_values_in_intervals(self):
+        '''Testing the join of time-series data to intervals'''
+        tier = tgio.IntervalTier("words", [(0, 1, "a"), (1, 2, "b"),
+                                           (3, 4, "c")], 0, 5)
+        dataList = [(0.5, 10), (1, 11), (1.5, 12), (2.5, 13), (4, 14)]
+        
+        self.assertEqual([((0, 1, "a"), 0, 2), ((1, 2, "b"), 1, 3),
+                          ((3, 4, "c"), 4, 5)],
+                         tier.getIndexRangesInIntervals(
+                             [dataTuple[0] for dataTuple in dataList]))
+        
+        valueList = [((0, 1, "a"), [(0.5, 10), (1, 11)]),
+                     ((1, 2, "b"), [(1, 11), (1.5, 12)]),
+                     ((3, 4, "c"), [(4, 14)])]
+        self.assertEqual(valueList, tier.getValuesInIntervals(dataList))
+        
+        # Unsorted data is still matched up, in its original order
+        dataList.reverse()
+        self.assertEqual([(interval, dataSubList[::-1])
+                          for interval, dataSubList in valueList],
+                         tier.getValuesInIntervals(dataList))
+    
+    def test_get_values_at_points(self):
+        '''Testing the lookup of time-series data at points'''
+        tier = tgio.PointTier("tones", [(1, "H"), (2.2, "L"), (3, "H")], 0, 5)
+        dataList = [(3, 30), (0.5, 5), (1, 10), (2, 20), (4.5, 45)]
+        
+        self.assertEqual([(1, "H", 10), (2.2, "L", "--"), (3, "H", 30)],
+                         tier.getValuesAtPoints(dataList))
+        self.assertEqual([(1, "H", 10), (2, "L", 20), (3, "H", 30)],
+                         tier.getValuesAtPoints(dataList, True))
+    
+    def test_get_values_from_list_rows(self):
+        '''Testing the lookup of data stored as lists, not tuples'''
+        tier = tgio.PointTier("tones", [(1, "H"), (2.2, "L")], 0, 5)
+        dataList = [[0.5, 105.0, 0], [1.0, 110.0, 1], [2.0, 120.0, 2]]
+        
+        self.assertEqual((1.0, 110.0, 1),
+                         utils.getValueAtTime(1.0, dataList))
+        self.assertEqual((2.0, 120.0, 2),
+                         utils.getValueAtTime(2.2, dataList, True, 1))
+        self.assertEqual([(1.0, "H", 110.0), (2.0, "L", 120.0)],
+                         tier.getValuesAtPoints(dataList, True))
+    
+    def test_sample_indices(self):
+        '''Testing textgrids with times in samples'''
+        tgFN = join(self.dataRoot, "mary.TextGrid")
+        
+        tg = tgio.openTextgrid(tgFN)
+        sampleTG = tgio.openTextgrid(tgFN, sampleRate=16000)
+        self.assertEqual(sampleTG, tg.toSampleIndices(16000))
+        self.assertEqual(tgio.Interval(5047, 6164, "m"),
+                         sampleTG.tierDict["phone"].entryList[0])
+        
+        # Edits that undo each other leave the times exactly as they were
+        stretchedTG = sampleTG.insertSpace(16000, 1601, "stretch")
+        self.assertEqual(16000, stretchedTG.sampleRate)
+        self.assertEqual(sampleTG.tierDict["phone"].entryList,
+                         stretchedTG.eraseRegion(16000, 17601)
+                         .tierDict["phone"].entryList)
+        
+        secondsTG = sampleTG.toSeconds()
+        self.assertEqual(None, secondsTG.sampleRate)
+        for name in tg.tierNameList:
+            for entry, secondsEntry in zip(tg.tierDict[name].entryList,
+                                           secondsTG.tierDict[name].entryList):
+                self.assertEqual(entry[-1], secondsEntry[-1])
+                for time, secondsTime in zip(entry[:-1], secondsEntry[:-1]):
+                    self.assertAlmostEqual(time, secondsTime,
+                                           delta=1 / 16000.0)
+        
+        # Intervals shorter than a sample are dropped
+        tier = tgio.IntervalTier("words", [(0, 1, "a"), (1, 1.00001, "b")],
+                                 0, 2)
+        tg = tgio.Textgrid()
+        tg.addTier(tier)
+        self.assertEqual([(0, 16000, "a")],
+                         tg.toSampleIndices(16000).tierDict["words"]
+                         .entryList)
+        
+        # Tiers in seconds and in samples can't be mixed
+        self.assertEqual(16000, sampleTG.tierDict["phone"]
+                         .crop(16000, 32000, "lax", False).sampleRate)
+        self.assertRaises(AssertionError, tg.addTier,
+                          sampleTG.tierDict["phone"])
+        self.assertRaises(AssertionError, sampleTG.addTier, tier.new("new"))
+        wavObj = audioio.openAudioFile(join(self.dataRoot, "mary.wav"))
+        self.assertRaises(AssertionError,
+                          praatio_scripts.tgBoundariesToZeroCrossings,
+                          sampleTG, wavObj)
+    
+    def test_new_shares_entries(self):
+        '''Testing that copies made by new() are independent'''
+        tgFN = join(self.dataRoot, "mary.TextGrid")
+        
+        for columnar in [False, True]:
+            for lazy in [False, True]:
+                tg = tgio.openTextgrid(tgFN, lazy=lazy, columnar=columnar)
+                oldEntryList = list(tg.tierDict["phone"].entryList)
+                
+                # Edits to the copy don't show up in the original
+                newTG = tg.new()
+                newTier = newTG.tierDict["phone"]
+                newTier.insertEntry((2.0, 2.1, "new"))
+                newTier.entryList.pop(0)
+                self.assertEqual(oldEntryList,
+                                 list(tg.tierDict["phone"].entryList))
+                
+                # ...and vice versa, even through a list handed out earlier
+                entryList = tg.tierDict["phone"].entryList
+                newTier = tg.tierDict["phone"].new()
+                entryList.pop(0)
+                tg.tierDict["phone"].deleteEntry(entryList[0])
+                self.assertEqual(oldEntryList, list(newTier.entryList))
+                self.assertEqual(oldEntryList[2:], list(entryList))
+                
+                tg.renameTier("phone", "phones")
+                self.assertEqual(oldEntryList[2:],
+                                 list(tg.tierDict["phones"].entryList))
+        
+        # Edits made through tier methods don't stop later copies sharing
+        tier = tgio.openTextgrid(tgFN).tierDict["phone"].new()
+        tier.insertEntry((2.0, 2.1, "new"))
+        tier.deleteEntry((2.0, 2.1, "new"))
+        newTier = tier.new()
+        self.assertTrue(newTier._entryList is tier._entryList)
+        
+        # Tiers made by fromSorted() don't share the list they were given
+        entryList = list(oldEntryList)
+        tier = tgio.IntervalTier.fromSorted("phone", entryList, 0, 5)
+        newTier = tier.new()
+        entryList.pop(0)
+        self.assertEqual(oldEntryList, list(tier.entryList))
+        self.assertEqual(oldEntryList, list(newTier.entryList))
+    
+    def test_validate(self):
+        '''Testing that validate() catches malformed tiers'''
+        tgFN = join(self.dataRoot, "mary.TextGrid")
+
+        tg = tgio.openTextgrid(tgFN)
+        for tier in tg.tierDict.values():
+            tier.validate()
+            tier.crop(0.4, 1.0, "lax", False).validate()
+            tier.editTimestamps(-0.5, True).validate()
+
+        Interval = tgio.Interval
+        for entryList in [[Interval(0.0, 1.0, "a"), Interval(0.5, 2.0, "b")],
+                          [Interval(1.0, 1.0, "a")],
+                          [Interval(1.0, 3.0, "a")],
+                          [(0.0, 1.0, "a")]]:
+            tier = tgio.IntervalTier.fromSorted("words", entryList, 0.0, 2.0)
+            self.assertRaises(tgio.InvalidTierError, tier.validate)
+
+        tier = tgio.PointTier.fromSorted("tones", [tgio.Point(1.0, "H"),
+                                                   tgio.Point(1.0, "L")],
+                                         0.0, 2.0)
+        self.assertRaises(tgio.InvalidTierError, tier.validate)
+
+        # Unsorted tiers written by other programs are sorted when read
+        outputFN = join(self.outputRoot, "unsorted.TextGrid")
+        with io.open(outputFN, "w", encoding="utf-8") as fd:
+            fd.write(u'File type = "ooTextFile"\nObject class = "TextGrid"\n'
+                     u'\n0\n2\n<exists>\n1\n"IntervalTier"\n"words"\n'
+                     u'0\n2\n2\n1\n2\n"b"\n0\n1\n"a"\n')
+        for columnar in [False, True]:
+            tier = tgio.openTextgrid(outputFN,
+                                     columnar=columnar).tierDict["words"]
+            tier.validate()
+            self.assertEqual([(0.0, 1.0, "a"), (1.0, 2.0, "b")],
+                             [tuple(entry) for entry in tier.entryList])
+
+    def test_align_boundaries(self):
+        '''Testing that nearby boundaries across tiers are aligned'''
+        tgFN = join(self.dataRoot, "mary_misaligned.TextGrid")
+        
+        tg = praatio_scripts.alignBoundariesAcrossTiers(tgFN, 0.01)
+        for tier in tg.tierDict.values():
+            tier.validate()
+        
+        wordEnd = tg.tierDict["word"].entryList[1][1]
+        phoneEndList = [entry[1] for entry in tg.tierDict["phone"].entryList]
+        self.assertTrue(wordEnd in phoneEndList)
+        
+        # A textgrid with nothing to align comes back unchanged
+        tgFN = join(self.dataRoot, "mary.TextGrid")
+        self.assertEqual(tgio.openTextgrid(tgFN),
+                         praatio_scripts.alignBoundariesAcrossTiers(tgFN,
+                                                                    0.001))
+        
+        # Intervals whose start and end are aligned to one time are removed
+        tg = tgio.Textgrid()
+        tg.addTier(tgio.IntervalTier("words", [(0.5, 1.002, "a"),
+                                               (1.002, 2.0, "b")], 0, 2.0))
+        tg.addTier(tgio.IntervalTier("phones", [(0.5, 1.0, "w"),
+                                                (1.0, 1.002, "x"),
+                                                (1.002, 2.0, "y")], 0, 2.0))
+        tgFN = join(self.outputRoot, "collapsing.TextGrid")
+        tg.save(tgFN)
+        
+        tg = praatio_scripts.alignBoundariesAcrossTiers(tgFN, 0.01)
+        phoneTier = tg.tierDict["phones"]
+        phoneTier.validate()
+        self.assertEqual([(0.5, 1.002, "w"), (1.002, 2.0, "y")],
+                         [tuple(entry) for entry in phoneTier.entryList])
+    
     def setUp(self):
         if not os.path.exists(self.outputRoot):
             os.mkdir(self.outputRoot)
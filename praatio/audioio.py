@@ -4,15 +4,32 @@ Created on Apr 4, 2017
 @author: Tim
 '''
 
+import os
+import sys
 import math
 import wave
 import struct
 import copy
+import array
+import tempfile
+from multiprocessing.pool import ThreadPool
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 from praatio.utilities import utils
 
 sampWidthDict = {1: 'b', 2: 'h', 4: 'i', 8: 'q'}
 
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Python 2's arrays don't support memoryviews, so without numpy, samples
+# are copied there instead of viewed
+_canViewArrays = hasattr(memoryview, "cast")
+
 
 class EndOfAudioData(Exception):
     pass
@@ -31,26 +48,188 @@ class FindZeroCrossingError(Exception):
         return retString % (self.startTime, self.endTime)
 
 
+def _getArrayTypecode(sampleWidth):
+    '''Returns the array typecode for signed ints of /sampleWidth/ bytes'''
+    for typecode in "bhilq":
+        if array.array(typecode).itemsize == sampleWidth:
+            return typecode
+    
+    raise ValueError("Unsupported sample width: %d" % sampleWidth)
+
+
+def _bytesAsArray(data, typecode):
+    '''Returns the machine-order values in a bytes-like object as an array'''
+    sampleArray = array.array(typecode)
+    if hasattr(sampleArray, "frombytes"):
+        sampleArray.frombytes(data)
+    else:
+        sampleArray.fromstring(data)
+    
+    return sampleArray
+
+
+def _arrayAsBytes(sampleArray):
+    '''Returns the values in an array (of either backend) as bytes'''
+    if hasattr(sampleArray, "tobytes"):
+        return sampleArray.tobytes()
+    
+    return sampleArray.tostring()
+
+
+def _asSampleArray(samples, sampleWidth):
+    '''
+    Returns samples as a typed, contiguous array of ints
+    
+    The array is a numpy array if numpy is installed and an array.array
+    otherwise.  Samples that are already stored that way are not copied;
+    use _concatenateSamples() to always get a copy.
+    '''
+    if numpy is not None:
+        return numpy.asarray(samples, dtype="<i%d" % sampleWidth)
+    
+    if (isinstance(samples, array.array) and
+            samples.typecode == _getArrayTypecode(sampleWidth)):
+        return samples
+    
+    return _concatenateSamples([samples], sampleWidth)
+
+
+def _concatenateSamples(sampleLists, sampleWidth):
+    '''Joins lists, arrays, or views of samples into one sample array'''
+    if numpy is not None:
+        return numpy.concatenate([_asSampleArray(samples, sampleWidth)
+                                  for samples in sampleLists])
+    
+    sampleArray = array.array(_getArrayTypecode(sampleWidth))
+    for samples in sampleLists:
+        # Arrays and views of the same width are copied over wholesale
+        if (isinstance(samples, array.array) and
+                samples.typecode == sampleArray.typecode):
+            sampleArray.extend(samples)
+        elif (isinstance(samples, memoryview) and
+                samples.itemsize == sampleWidth):
+            sampleArray.frombytes(samples.cast("B"))
+        else:
+            sampleArray.extend(samples)
+    
+    return sampleArray
+
+
+def _sliceSamples(sampleArray, start, stop):
+    '''
+    Returns a view of part of a sample array, without copying it
+    
+    On Python 2, slices of an array.array are copies.
+    '''
+    if isinstance(sampleArray, array.array) and _canViewArrays:
+        sampleArray = memoryview(sampleArray)
+    
+    return sampleArray[start:stop]
+
+
 def samplesAsNums(waveData, sampleWidth):
+    '''Returns the little-endian samples in waveData as a sample array'''
     if len(waveData) == 0:
         raise EndOfAudioData()
     
-    byteCode = sampWidthDict[sampleWidth]
-    actualNumFrames = int(len(waveData) / float(sampleWidth))
-    audioFrameList = struct.unpack("<" + byteCode * actualNumFrames, waveData)
+    if numpy is not None:
+        return numpy.frombuffer(waveData, dtype="<i%d" % sampleWidth).copy()
+    
+    sampleArray = _bytesAsArray(waveData, _getArrayTypecode(sampleWidth))
+    if sys.byteorder == "big":
+        sampleArray.byteswap()
 
-    return audioFrameList
+    return sampleArray
 
 
 def numsAsSamples(sampleWidth, numList):
-    byteCode = sampWidthDict[sampleWidth]
-    byteStr = struct.pack("<" + byteCode * len(numList), *numList)
+    '''Returns the samples in numList as little-endian bytes'''
+    sampleArray = _asSampleArray(numList, sampleWidth)
+    if sys.byteorder == "big" and isinstance(sampleArray, array.array):
+        sampleArray = array.array(sampleArray.typecode, sampleArray)
+        sampleArray.byteswap()
+    
+    return _arrayAsBytes(sampleArray)
+
+
+def _asSampleView(waveData, sampleWidth):
+    '''
+    Returns the little-endian samples in waveData without copying them
+    
+    Without numpy, the samples are copied if the machine is big-endian
+    or if this is Python 2.
+    '''
+    if len(waveData) == 0:
+        raise EndOfAudioData()
+    
+    if numpy is not None:
+        return numpy.frombuffer(waveData, dtype="<i%d" % sampleWidth)
+    
+    if sys.byteorder == "big" or not _canViewArrays:
+        return samplesAsNums(waveData, sampleWidth)
     
-    return byteStr
+    return memoryview(waveData).cast("B").cast(_getArrayTypecode(sampleWidth))
+
+
+def _viewBytes(fileData, start, length):
+    '''Returns a read-only view of part of a bytes-like object'''
+    try:
+        return memoryview(fileData)[start:start + length]
+    except TypeError:
+        # Python 2's mmap only supports the old buffer interface.  Slices
+        # of a buffer are copies, but only of the part that is sliced.
+        return buffer(fileData, start, length)
+
+
+def _readWavHeader(fileData):
+    '''
+    Reads the header of a wav file held in a bytes-like object
+    
+    Returns the parameters of the file, as returned by
+    wave.getparams(), and the offset and length of its data chunk.
+    '''
+    if fileData[:4] != b"RIFF" or fileData[8:12] != b"WAVE":
+        raise wave.Error("file does not start with RIFF id")
+    
+    fmtChunk = None
+    i = 12
+    while i + 8 <= len(fileData):
+        chunkID = fileData[i:i + 4]
+        chunkSize = struct.unpack_from("<I", fileData, i + 4)[0]
+        i += 8
+        
+        if chunkID == b"fmt ":
+            fmtChunk = struct.unpack_from("<HHIIHH", fileData, i)
+        elif chunkID == b"data":
+            if fmtChunk is None:
+                raise wave.Error("data chunk before fmt chunk")
+            break
+        
+        # Chunks are padded to an even length
+        i += chunkSize + chunkSize % 2
+    else:
+        raise wave.Error("fmt chunk and/or data chunk missing")
+    
+    wFormatTag, nchannels, framerate = fmtChunk[:3]
+    bitsPerSample = fmtChunk[5]
+    if wFormatTag not in [WAVE_FORMAT_PCM, WAVE_FORMAT_EXTENSIBLE]:
+        raise wave.Error("unknown format: %r" % (wFormatTag, ))
+    
+    sampwidth = (bitsPerSample + 7) // 8
+    frameSize = nchannels * sampwidth
+    
+    # Truncated files keep whatever whole frames they have
+    dataLength = min(chunkSize, len(fileData) - i)
+    dataLength -= dataLength % frameSize
+    params = (nchannels, sampwidth, framerate, dataLength // frameSize,
+              "NONE", "not compressed")
+    
+    return params, i, dataLength
 
 
 def getDuration(wavFN):
-    return WavQueryObj(wavFN).getDuration()
+    with WavQueryObj(wavFN) as wavQObj:
+        return wavQObj.getDuration()
 
     
 def getMaxAmplitude(sampleWidth):
@@ -71,9 +250,50 @@ def generateSilence(duration, samplingFreq):
     return silence
 
 
+def _iterSilenceFrames(nFrames, nchannels, sampleWidth, blockSize=2 ** 16):
+    '''Yields /nFrames/ frames of silence, /blockSize/ frames at a time'''
+    frameSize = nchannels * sampleWidth
+    block = memoryview(b"\x00" * frameSize * min(nFrames, blockSize))
+    for i in range(0, nFrames, blockSize):
+        yield block[:frameSize * min(blockSize, nFrames - i)]
+
+
+def _iterSineWaveFrames(nFrames, freq, samplingFreq, amplitude, nchannels,
+                        sampleWidth, blockSize=2 ** 16):
+    '''
+    Yields /nFrames/ frames of a sine wave, /blockSize/ frames at a time
+    
+    The samples are the same as those from generateSineWave() and are
+    repeated in every channel.
+    '''
+    wavSpec = 2 * math.pi * freq / float(samplingFreq)
+    for i in range(0, nFrames, blockSize):
+        j = min(i + blockSize, nFrames)
+        if numpy is not None:
+            sineWave = amplitude * numpy.sin(wavSpec * numpy.arange(i, j))
+            sineWave = numpy.repeat(sineWave.astype("<i%d" % sampleWidth),
+                                    nchannels)
+        else:
+            sineWave = [int(amplitude * math.sin(wavSpec * k))
+                        for k in range(i, j) for _ in range(nchannels)]
+        
+        yield numsAsSamples(sampleWidth, sineWave)
+
+
 def extractSubwav(fn, outputFN, startT, endT):
     audioObj = openAudioFile(fn, [(startT, endT), ], doShrink=True)
     audioObj.save(outputFN)
+
+
+def extractSubwavs(fn, segmentList, workers=None):
+    '''
+    Outputs one subwav for each (startT, endT, outputFN) in segmentList
+    
+    The subwavs are written in parallel by /workers/ threads (see
+    WavQueryObj.extractSegments())
+    '''
+    with WavQueryObj(fn) as wavQObj:
+        wavQObj.extractSegments(segmentList, workers)
     
 
 class AbstractWav(object):
@@ -208,14 +428,21 @@ class WavQueryObj(AbstractWav):
     '''
     A class for getting information about a wave file
     
-    The wave file is never loaded--we only keep a reference to the
-    fd.  All operations on WavQueryObj are fast.  WavQueryObjs don't
-    (shouldn't) change state.  For doing multiple modifications,
-    use a WavObj.
+    The wave file is never loaded--it is memory mapped and its header is
+    read once.  getFrames() and getSamples() return views into the
+    mapped file, so only the parts of the file that are looked at are
+    ever read from disk and nothing is copied.  All operations on
+    WavQueryObj are fast.  WavQueryObjs don't (shouldn't) change state.
+    For doing multiple modifications, use a WavObj.
+    
+    The file stays mapped until close() is called (or the WavQueryObj
+    is used in a 'with' block and the block ends).
     '''
     def __init__(self, fn):
-        self.audiofile = wave.open(fn, "r")
-        self.params = self.audiofile.getparams()
+        self.fn = fn
+        self.fileData = utils.mapFile(fn)
+        self.params, dataStart, dataLength = _readWavHeader(self.fileData)
+        self.frameData = _viewBytes(self.fileData, dataStart, dataLength)
     
         self.nchannels = self.params[0]
         self.sampwidth = self.params[1]
@@ -224,13 +451,31 @@ class WavQueryObj(AbstractWav):
         self.comptype = self.params[4]
         self.compname = self.params[5]
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.close()
+    
+    def close(self):
+        '''
+        Unmaps the wav file
+        
+        Views returned by getFrames() and getSamples() must be released
+        (or deleted) first.  The WavQueryObj can't be read from afterwards.
+        '''
+        if hasattr(self.frameData, "release"):
+            self.frameData.release()
+        if hasattr(self.fileData, "close"):
+            self.fileData.close()
+    
     def concatenate(self, targetFrames, outputFN, prepend=False):
         sourceFrames = self.getFrames()
         
         if prepend is True:
-            newFrames = targetFrames + sourceFrames
+            newFrames = b"".join([targetFrames, sourceFrames])
         else:
-            newFrames = sourceFrames + targetFrames
+            newFrames = b"".join([sourceFrames, targetFrames])
         
         self.outputModifiedWav(newFrames, outputFN)
     
@@ -241,29 +486,105 @@ class WavQueryObj(AbstractWav):
     def getFrames(self, startTime=None, endTime=None):
         '''
         Get frames with respect to time
+        
+        Returns a read-only memoryview of the frames in the mapped file
+        (on Python 2, a copy of the frames).
         '''
         if startTime is None:
             startTime = 0
         startFrame = int(startTime * float(self.framerate))
+        if startFrame < 0 or startFrame > self.nframes:
+            raise wave.Error("position not in range")
         
         if endTime is not None:
             duration = endTime - startTime
             nFrames = int(self.framerate * duration)
         else:
             nFrames = int(self.nframes - startFrame)
+        nFrames = max(0, min(nFrames, self.nframes - startFrame))
         
-        self.audiofile.setpos(startFrame)
-        frames = self.audiofile.readframes(nFrames)
+        frameSize = self.nchannels * self.sampwidth
+        start = startFrame * frameSize
         
-        return frames
+        return self.frameData[start:start + nFrames * frameSize]
 
     def getSamples(self, startTime, endTime):
-        
+        '''Returns a view of the samples from startTime to endTime'''
         frames = self.getFrames(startTime, endTime)
-        audioFrameList = samplesAsNums(frames, self.sampwidth)
+        audioFrameList = _asSampleView(frames, self.sampwidth)
      
         return audioFrameList
 
+    def iterBlocks(self, blockSize, hop=None, startTime=None, endTime=None):
+        '''
+        Yields the samples from startTime to endTime in blocks
+        
+        blockSize: the number of frames in each block
+        hop: the number of frames from the start of one block to the start
+             of the next (by default, blockSize).  If smaller than
+             blockSize, the blocks overlap.
+        
+        Each block is a view of the samples, as returned by getSamples(),
+        so a file of any length can be processed in constant memory.  The
+        last block is shorter than blockSize if the audio runs out first.
+        '''
+        if hop is None:
+            hop = blockSize
+        assert(blockSize > 0 and hop > 0)
+        
+        if startTime is None:
+            startTime = 0
+        startFrame = int(startTime * float(self.framerate))
+        if endTime is None:
+            endFrame = self.nframes
+        else:
+            endFrame = min(int(endTime * float(self.framerate)),
+                           self.nframes)
+        
+        frameSize = self.nchannels * self.sampwidth
+        for i in range(max(startFrame, 0), endFrame, hop):
+            j = min(i + blockSize, endFrame)
+            frames = self.frameData[i * frameSize:j * frameSize]
+            yield _asSampleView(frames, self.sampwidth)
+            
+            if j == endFrame:
+                break
+
+    def extractSegments(self, segmentList, workers=None):
+        '''
+        Outputs one wav file for each segment, in parallel
+        
+        segmentList: a list of (startTime, endTime, outputFN)
+        workers: the number of threads to write the files in (by default,
+                 one per cpu).  If 1, the files are written one by one.
+        
+        The threads all read from this WavQueryObj, so the writing of
+        one file overlaps with the reading of the next.  If several
+        segments have the same outputFN, the last one is written, as it
+        would be if the segments were written in order.
+        '''
+        lastIndexDict = dict((segment[2], i)
+                             for i, segment in enumerate(segmentList))
+        segmentList = [segment for i, segment in enumerate(segmentList)
+                       if lastIndexDict[segment[2]] == i]
+        
+        def extractSegment(segment):
+            startTime, endTime, outputFN = segment
+            self.outputModifiedWav(self.getFrames(startTime, endTime),
+                                   outputFN)
+        
+        if workers == 1:
+            for segment in segmentList:
+                extractSegment(segment)
+            return
+        
+        pool = ThreadPool(workers)
+        try:
+            pool.map(extractSegment, segmentList)
+        finally:
+            pool.close()
+            pool.join()
+    
     def deleteWavSections(self, outputFN, keepList=None,
                           deleteList=None, operation="shrink",
                           sineWaveAmplitude=None):
@@ -278,12 +599,24 @@ class WavQueryObj(AbstractWav):
                    a sine wave
         sineWaveAmplitude: if None and operation is "sine wave"
                            use max amplitude.
+        
+        If outputFN is this wav file, the output is written to a temporary
+        file that replaces it at the end, and this WavQueryObj is closed.
         '''
     
         assert(operation in ["shrink", "silence", "sine wave"])
     
         duration = float(self.nframes) / self.framerate
         
+        # The mapped file can't be overwritten while it is being read
+        overwrite = (os.path.exists(outputFN) and
+                     os.path.samefile(self.fn, outputFN))
+        writeFN = outputFN
+        if overwrite:
+            fd, writeFN = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(outputFN)))
+            os.close(fd)
+        
         # Need to specify what to keep or what to delete, but can't
         # specify both
         assert(keepList is not None or deleteList is not None)
@@ -297,37 +630,46 @@ class WavQueryObj(AbstractWav):
         deleteList = [[row[0], row[1], "delete"] for row in deleteList]
         iterList = sorted(keepList + deleteList)
         
-        zeroBinValue = struct.pack(sampWidthDict[self.sampwidth], 0)
+        if sineWaveAmplitude is None:
+            sineWaveAmplitude = getMaxAmplitude(self.sampwidth)
         
-        # Grab the sections to be kept
-        audioFrames = b""
-        for startT, stopT, label in iterList:
-            diff = stopT - startT
-            
-            if label == "keep":
-                self.audiofile.setpos(int(self.framerate * startT))
-                frames = self.audiofile.readframes(int(self.framerate * diff))
-                audioFrames += frames
-            
-            # If we are not keeping a region and we're not shrinking the
-            # duration, fill in the deleted portions with zeros
-            elif label == "delete" and operation == "silence":
-                frames = zeroBinValue * int(self.framerate * diff)
-                audioFrames += frames
-            # Or fill it with a sine wave
-            elif label == "delete" and operation == "sine wave":
-                frequency = 200
-                if sineWaveAmplitude is None:
-                    sineWaveAmplitude = getMaxAmplitude(self.sampwidth)
-                sineWave = generateSineWave(diff,
-                                            frequency,
-                                            self.framerate,
-                                            sineWaveAmplitude)
-                frames = numsAsSamples(self.sampwidth, sineWave)
-                audioFrames += frames
-    
-            self.outputModifiedWav(audioFrames, outputFN)
-            
+        # Write each section straight to the output file; the header is
+        # filled in once, when the file is closed
+        outWave = wave.open(writeFN, "w")
+        outWave.setparams([self.nchannels, self.sampwidth, self.framerate,
+                           0, self.comptype, self.compname])
+        try:
+            for startT, stopT, label in iterList:
+                if label == "keep":
+                    outWave.writeframesraw(self.getFrames(startT, stopT))
+                    continue
+                
+                # If we are not keeping a region and we're not shrinking
+                # the duration, fill in the deleted portions with zeros
+                # or with a sine wave
+                nFrames = int(self.framerate * (stopT - startT))
+                if operation == "silence":
+                    frameIter = _iterSilenceFrames(nFrames, self.nchannels,
+                                                   self.sampwidth)
+                elif operation == "sine wave":
+                    frameIter = _iterSineWaveFrames(nFrames, 200,
+                                                    self.framerate,
+                                                    sineWaveAmplitude,
+                                                    self.nchannels,
+                                                    self.sampwidth)
+                else:
+                    continue
+                
+                for frames in frameIter:
+                    outWave.writeframesraw(frames)
+        finally:
+            outWave.close()
+        
+        if overwrite:
+            self.close()
+            os.remove(outputFN)
+            os.rename(writeFN, outputFN)
+    
     def outputModifiedWav(self, audioFrames, outputFN):
         '''
         Output frames using the same parameters as this WavQueryObj
@@ -340,51 +682,61 @@ class WavQueryObj(AbstractWav):
         outWave = wave.open(outputFN, "w")
         outWave.setparams(outParams)
         outWave.writeframes(audioFrames)
+        outWave.close()
 
 
 class WavObj(AbstractWav):
     '''
     A class for manipulating audio files
     
-    The wav file is represented by its wavform as a series of signed
-    integers.  This can be very slow and take up lots of memory with
-    large files.
+    The wav file is represented by its waveform as a series of signed
+    integers.  These are stored in a typed, contiguous array (a numpy
+    array if numpy is installed and an array.array otherwise), which
+    takes as much memory as the wav file itself.  getSamples() returns
+    a view into that array rather than a copy.
     '''
     
     def __init__(self, audioSamples, params):
 
-        self.audioSamples = audioSamples
         self.params = params
         self.nchannels = params[0]
         self.sampwidth = params[1]
         self.framerate = params[2]
         self.comptype = params[4]
         self.compname = params[5]
+        
+        # Always copied, so a WavObj never shares samples with its source
+        self.audioSamples = _concatenateSamples([audioSamples],
+                                                self.sampwidth)
     
     def getIndexAtTime(self, startTime):
         return int(startTime * self.framerate)
     
     def insertSilence(self, startTime, silenceDuration):
         audioSamples = generateSilence(silenceDuration, self.framerate)
-        self.insertSegment(startTime, audioSamples)
+        self.insert(startTime, audioSamples)
     
     def insert(self, startTime, valueList):
         i = self.getIndexAtTime(startTime)
-        self.audioSamples = (self.audioSamples[:i] + valueList +
-                             self.audioSamples[i:])
+        self.audioSamples = _concatenateSamples(
+            [_sliceSamples(self.audioSamples, None, i), valueList,
+             _sliceSamples(self.audioSamples, i, None)], self.sampwidth)
     
     def deleteSegment(self, startTime, endTime):
         i = self.getIndexAtTime(startTime)
         j = self.getIndexAtTime(endTime)
-        self.audioSamples = self.audioSamples[:i] + self.audioSamples[j:]
+        self.audioSamples = _concatenateSamples(
+            [_sliceSamples(self.audioSamples, None, i),
+             _sliceSamples(self.audioSamples, j, None)], self.sampwidth)
 
     def getDuration(self):
         return float(len(self.audioSamples)) / self.framerate
     
     def getSamples(self, startTime, endTime):
+        '''Returns a view of the samples from startTime to endTime'''
         i = self.getIndexAtTime(startTime)
         j = self.getIndexAtTime(endTime)
-        return self.audioSamples[i:j]
+        return _sliceSamples(self.audioSamples, i, j)
 
     def getSubsegment(self, startTime, endTime):
         samples = self.getSamples(startTime, endTime)
@@ -398,13 +750,9 @@ class WavObj(AbstractWav):
         outParams = [self.nchannels, self.sampwidth, self.framerate,
                      len(self.audioSamples), self.comptype, self.compname]
         
-        byteCode = sampWidthDict[self.sampwidth]
-        byteStr = struct.pack("<" + byteCode * len(self.audioSamples),
-                              *self.audioSamples)
-        
         outWave = wave.open(outputFN, "w")
         outWave.setparams(outParams)
-        outWave.writeframes(byteStr)
+        outWave.writeframes(numsAsSamples(self.sampwidth, self.audioSamples))
 
 
 def openAudioFile(fn, keepList=None, deleteList=None, doShrink=True):
@@ -415,9 +763,13 @@ def openAudioFile(fn, keepList=None, deleteList=None, doShrink=True):
     doShrink - if False, segments not kept are replaced by silence
     '''
     
-    audiofile = wave.open(fn, "r")
-    
-    params = audiofile.getparams()
+    with WavQueryObj(fn) as wavQObj:
+        return _readAudioFile(wavQObj, keepList, deleteList, doShrink)
+
+
+def _readAudioFile(wavQObj, keepList, deleteList, doShrink):
+    '''Reads the parts of an open wav file for openAudioFile()'''
+    params = wavQObj.params
     sampwidth = params[1]
     framerate = params[2]
     nframes = params[3]
@@ -440,23 +792,20 @@ def openAudioFile(fn, keepList=None, deleteList=None, doShrink=True):
     iterList = sorted(keepList + deleteList)
     
     # Grab the sections to be kept
-    audioSampleList = []
-    byteCode = sampWidthDict[sampwidth]
+    frameList = []
     for startT, stopT, label in iterList:
         diff = stopT - startT
         
         if label == "keep":
-            audiofile.setpos(int(framerate * startT))
-            frames = audiofile.readframes(int(framerate * diff))
-            
-            actualNumFrames = int(len(frames) / float(sampwidth))
-            audioSamples = struct.unpack("<" + byteCode * actualNumFrames,
-                                         frames)
-            audioSampleList.extend(audioSamples)
+            frameList.append(wavQObj.getFrames(startT, stopT))
         
         # If we are not keeping a region and we're not shrinking the
         # duration, fill in the deleted portions with zeros
         elif label == "delete" and doShrink is False:
-            audioSampleList.extend([0, ] * int(framerate * diff))
+            frameList.append(b"\x00" * sampwidth * int(framerate * diff))
+    
+    audioFrames = b"".join(frameList)
+    if len(audioFrames) == 0:
+        return WavObj([], params)
 
-    return WavObj(audioSampleList, params)
+    return WavObj(_asSampleView(audioFrames, sampwidth), params)
@@ -218,13 +218,7 @@ class Klattgrid(tgio.Textgrid):
 
 def openKlattGrid(fnFullPath):
 
-    try:
-        with io.open(fnFullPath, "r", encoding="utf-16") as fd:
-            data = fd.read()
-    except UnicodeError:
-        with io.open(fnFullPath, "r", encoding="utf-8") as fd:
-            data = fd.read()
-    data = data.replace("\r\n", "\n")
+    data = utils.readTextFile(fnFullPath)
 
     # Right now, can only open normal klatt grid and not short ones
     kg = _openNormalKlattGrid(data)
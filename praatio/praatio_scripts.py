@@ -10,7 +10,6 @@ Created on Jul 27, 2015
 import os
 from os.path import join
 import math
-import copy
 
 from praatio import tgio
 from praatio import audioio
@@ -39,8 +38,7 @@ def _shiftTimes(tg, timeV, newTimeV):
                 tier.deleteEntry(entry)
                 insertEntryList.append((newStart, newStop, entry[2]))
             
-            for entry in insertEntryList:
-                tier.insertEntry(entry)
+            tier.insertEntries(insertEntryList)
         
         elif isinstance(tier, tgio.PointTier):
             entryList = [entry for entry in tier.entryList
@@ -70,7 +68,10 @@ def audioSplice(audioObj, spliceSegment, tg, tierName, newLabel,
     alignToZeroCrossing - if True, moves all involved times to the nearest
                           zero crossing in the audio.  Generally results
                           in better sounding output
+    
+    The times in tg must be in seconds (see tgio.Textgrid.toSeconds())
     '''
+    assert(tg.sampleRate is None)
 
     retTG = tg.new()
 
@@ -159,8 +160,8 @@ def spellCheckEntries(tg, targetTierName, newTierName, checkFunction,
             if printEntries is True:
                 print((startT, stopT, mispelledTxt))
     
-    tier = tgio.IntervalTier(newTierName, mispelledEntryList,
-                             tg.minTimestamp, tg.maxTimestamp)
+    tier = tier.new(newTierName, mispelledEntryList,
+                    tg.minTimestamp, tg.maxTimestamp)
     tg.addTier(tier)
     
     return tg
@@ -218,9 +219,7 @@ def splitTierEntries(tg, sourceTierName, targetTierName,
     
     # Or insert new entries into existing target tier
     else:
-
-        for entry in newEntryList:
-            targetTier.insertEntry(entry, True)
+        targetTier.insertEntries(newEntryList, True)
     
     # Insert the tier into the textgrid
     if targetTierName in tg.tierNameList:
@@ -236,7 +235,10 @@ def tgBoundariesToZeroCrossings(tg, wavObj, adjustPointTiers=True):
     
     adjustPointTiers: if True, point tiers will be adjusted too.  Otherwise,
                       only interval tiers are adjusted.
+    
+    The times in tg must be in seconds (see tgio.Textgrid.toSeconds())
     '''
+    assert(tg.sampleRate is None)
     
     for tierName in tg.tierNameList[:]:
         tier = tg.tierDict[tierName]
@@ -262,7 +264,8 @@ def tgBoundariesToZeroCrossings(tg, wavObj, adjustPointTiers=True):
 
 def splitAudioOnTier(wavFN, tgFN, tierName, outputPath,
                      outputTGFlag=False, nameStyle=None,
-                     noPartialIntervals=False, silenceLabel=None):
+                     noPartialIntervals=False, silenceLabel=None,
+                     workers=None):
     '''
     Outputs one subwav for each entry in the tier of a textgrid
     
@@ -281,6 +284,8 @@ def splitAudioOnTier(wavFN, tgFN, tierName, outputPath,
                   intervals (i.e. blank) then leave this alone.  If silences
                   are labeled using praat's "annotate >> to silences"
                   then this value should be "silences"
+    workers: the number of threads to write the subwavs in (by default,
+             one per cpu)
     '''
     if not os.path.exists(outputPath):
         os.mkdir(outputPath)
@@ -325,7 +330,8 @@ def splitAudioOnTier(wavFN, tgFN, tierName, outputPath,
     
     # Output wave files
     outputFNList = []
-    wavQObj = audioio.WavQueryObj(wavFN)
+    segmentList = []
+    outputFNSet = set()
     for i, entry in enumerate(entryList):
         start, stop, label = entry
         
@@ -340,15 +346,17 @@ def splitAudioOnTier(wavFN, tgFN, tierName, outputPath,
         
         outputFNFullPath = join(outputPath, outputName + ".wav")
 
-        if os.path.exists(outputFNFullPath) and firstWarning:
+        # The subwavs are only written after this loop, so earlier
+        # segments with the same name aren't on disk yet
+        isDuplicate = outputFNFullPath in outputFNSet
+        if (isDuplicate or os.path.exists(outputFNFullPath)) and firstWarning:
             print(("Overwriting wave files in: %s\n" +
                    "Files existed before or intervals exist with " +
                    "the same name:\n%s")
                   % (outputPath, outputName))
+        outputFNSet.add(outputFNFullPath)
         
-        frames = wavQObj.getFrames(start, stop)
-        wavQObj.outputModifiedWav(frames, outputFNFullPath)
-        
+        segmentList.append((start, stop, outputFNFullPath))
         outputFNList.append((start, stop, outputName + ".wav"))
         
         # Output the textgrid if requested
@@ -362,6 +370,8 @@ def splitAudioOnTier(wavFN, tgFN, tierName, outputPath,
             
             subTG.save(join(outputPath, outputName + ".TextGrid"))
     
+    audioio.extractSubwavs(wavFN, segmentList, workers)
+    
     return outputFNList
 
 
@@ -375,115 +385,95 @@ def alignBoundariesAcrossTiers(tgFN, maxDifference=0.01):
     not be the same, even if they were intended to be the same.
     
     This script will force all boundaries within /maxDifference/ amount
-    to be the same value.  The replacement value is either the majority
-    value found within /maxDifference/ or, if no majority exists, than
-    the value used in the search query.
+    to be the same value.  The boundaries of all tiers are sorted and
+    then grouped in a single pass: each group holds the boundaries
+    within /maxDifference/ of its first boundary, with at most one
+    boundary from each tier.  The boundaries in a group are set to the
+    most common value in the group or, if there is a tie, to the value
+    from the tier that comes first in the textgrid.  Each tier is then
+    rewritten once.
+    
+    If an interval's start and end are both moved to the same time, the
+    interval is removed.  Likewise, if a point is moved onto the time of
+    the point before it, it is removed.
     '''
     tg = tgio.openTextgrid(tgFN)
     
-    for tierName in tg.tierNameList:
-        altNameList = [tmpName for tmpName in tg.tierNameList
-                       if tmpName != tierName]
-        
+    # Gather the boundaries of all tiers as
+    # (time, tierIndex, entryIndex, timeIndex)
+    boundaryList = []
+    for tierIndex, tierName in enumerate(tg.tierNameList):
+        tier = tg.tierDict[tierName]
+        numTimes = 2 if tier.tierType == tgio.INTERVAL_TIER else 1
+        for entryIndex, entry in enumerate(tier.entryList):
+            for timeIndex in range(numTimes):
+                boundaryList.append((entry[timeIndex], tierIndex,
+                                     entryIndex, timeIndex))
+    boundaryList.sort()
+    
+    # Find the new time of each misaligned boundary
+    newTimeDict = {}
+    for cluster in _clusterBoundaries(boundaryList, maxDifference):
+        # On ties, the time from the first tier in the textgrid wins
+        timeList = [boundary[0] for boundary in cluster]
+        bestTime = max(cluster, key=lambda boundary: (
+            timeList.count(boundary[0]), -boundary[1]))[0]
+        for time, tierIndex, entryIndex, timeIndex in cluster:
+            if time != bestTime:
+                newTimeDict[(tierIndex, entryIndex, timeIndex)] = bestTime
+    
+    # Rewrite each tier that has misaligned boundaries
+    editedTierIndexSet = set([key[0] for key in newTimeDict.keys()])
+    for tierIndex in sorted(editedTierIndexSet):
+        tierName = tg.tierNameList[tierIndex]
         tier = tg.tierDict[tierName]
-        for entry in tier.entryList:
-            # Interval tier left boundary or point tier point
-            _findMisalignments(tg, entry[0], maxDifference,
-                               altNameList, tierName, entry, 0)
-        
-        # Interval tier right boundary
-        if tier.tierType == tgio.INTERVAL_TIER:
-            for entry in tier.entryList:
-                _findMisalignments(tg, entry[1], maxDifference,
-                                   altNameList, tierName, entry, 1)
-
-    return tg
-
-            
-def _findMisalignments(tg, timeV, maxDifference, tierNameList,
-                       tierName, entry, orderID):
-    '''
-    This is just used by alignBoundariesAcrossTiers()
-    '''
-    # Get the start time
-    filterStartT = timeV - maxDifference
-    if filterStartT < 0:
-        filterStartT = 0
-    
-    # Get the end time
-    filterStopT = timeV + maxDifference
-    if filterStopT > tg.maxTimestamp:
-        filterStopT = tg.maxTimestamp
-
-    croppedTG = tg.crop(filterStartT, filterStopT, "lax", False)
-
-    matchList = [(tierName, timeV, entry, orderID)]
-    for subTierName in tierNameList:
-        subCroppedTier = croppedTG.tierDict[subTierName]
         
-        # For each item that exists in the search span, find the boundary
-        # that lies in the search span
-        for subCroppedEntry in subCroppedTier.entryList:
-            
-            if subCroppedTier.tierType == tgio.INTERVAL_TIER:
-                subStart, subEnd, _ = subCroppedEntry
-                
-                # Left boundary?
-                leftMatchVal = None
-                if subStart >= filterStartT and subStart <= filterStopT:
-                    leftMatchVal = subStart
-
-                # Right boundary?
-                rightMatchVal = None
-                if subEnd >= filterStartT and subEnd <= filterStopT:
-                    rightMatchVal = subEnd
-                    
-                # There should be at most one matching boundary
-                assert(leftMatchVal is None or rightMatchVal is None)
-                
-                # Set the matching boundary info
-                if leftMatchVal is not None:
-                    matchVal = leftMatchVal
-                    subOrderID = 0
-                else:
-                    matchVal = rightMatchVal
-                    subOrderID = 1
+        newEntryList = []
+        for entryIndex, entry in enumerate(tier.entryList):
+            newEntry = list(entry)
+            for timeIndex in range(len(entry) - 1):
+                key = (tierIndex, entryIndex, timeIndex)
+                newEntry[timeIndex] = newTimeDict.get(key, entry[timeIndex])
             
-                # Match value could be none if, for an interval tier,
-                # no boundary sits inside the search span (the search span
-                # is wholly inside the interval)
-                if matchVal is None:
+            # Boundaries keep their order, but neighbouring boundaries
+            # in a tier can be moved to the same time
+            if tier.tierType == tgio.INTERVAL_TIER:
+                if newEntry[0] >= newEntry[1]:
                     continue
-            
-            elif subCroppedTier.tierType == tgio.POINT_TIER:
-                subStart, _ = subCroppedEntry
-                if subStart >= filterStartT and subStart <= filterStopT:
-                    matchVal = subStart
-                    subOrderID = 0
+            elif len(newEntryList) > 0 and newEntryList[-1][0] >= newEntry[0]:
+                continue
+            newEntryList.append(newEntry)
+        
+        tg.replaceTier(tierName, type(tier)(tierName, newEntryList,
+                                            tier.minTimestamp,
+                                            tier.maxTimestamp))
+    
+    return tg
 
-            matchList.append((subTierName, matchVal, subCroppedEntry,
-                              subOrderID))
-    
-    # Find the number of different values that are almost the same
-    valList = [row[1] for row in matchList]
-    valUniqueList = []
-    for val in valList:
-        if val not in valUniqueList:
-            valUniqueList.append(val)
-            
-    # If they're all the same, there is nothing to do
-    # If some are different, take the most common value (or else the first
-    # one) and set all similar times to that value
-    if len(valUniqueList) > 1:
-        countList = [valList.count(val) for val in valUniqueList]
-        bestVal = valUniqueList[countList.index(max(countList))]
-        assert(bestVal is not None)
-        for tierName, _, oldEntry, orderID in matchList:
 
-            newEntry = list(copy.deepcopy(oldEntry))
-            newEntry[orderID] = bestVal
-            newEntry = tuple(newEntry)
+def _clusterBoundaries(boundaryList, maxDifference):
+    '''
+    Groups sorted boundaries that lie within maxDifference of each other
+    
+    This is just used by alignBoundariesAcrossTiers().  Each group starts
+    at its first boundary and holds at most one time from each tier
+    (adjacent intervals share their boundary, so a time can appear twice).
+    Only groups with more than one time are yielded.
+    '''
+    cluster = []
+    tierTimeDict = {}
+    for boundary in boundaryList:
+        time, tierIndex = boundary[:2]
+        if (len(cluster) > 0 and
+                (time - cluster[0][0] > maxDifference or
+                 tierTimeDict.get(tierIndex, time) != time)):
+            if len(set(tierTimeDict.values())) > 1:
+                yield cluster
+            cluster = []
+            tierTimeDict = {}
         
-            tg.tierDict[tierName].deleteEntry(oldEntry)
-            tg.tierDict[tierName].entryList.append(newEntry)
-            tg.tierDict[tierName].entryList.sort()
+        cluster.append(boundary)
+        tierTimeDict[tierIndex] = time
+    
+    if len(set(tierTimeDict.values())) > 1:
+        yield cluster
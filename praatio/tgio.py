@@ -6,12 +6,29 @@ Created on Apr 15, 2013
 @author: timmahrt
 '''
 
+import os
 import re
 import copy
 import io
+import codecs
 import wave
+import struct
+import array
+import bisect
+import heapq
+import itertools
+import operator
+import pickle
+import multiprocessing
+import hashlib
+import tempfile
 from collections import namedtuple
 
+try:
+    from collections.abc import MutableSequence  # Python 3.3+
+except ImportError:
+    from collections import MutableSequence  # Python 2.x
+
 from praatio.utilities import utils
 
 INTERVAL_TIER = "IntervalTier"
@@ -21,6 +38,39 @@ MIN_INTERVAL_LENGTH = 0.00000001  # Arbitrary threshold
 Interval = namedtuple('Interval', ['start', 'end', 'label']) # interval entry
 Point = namedtuple('Point', ['time', 'label']) # point entry
 
+# Skips over any leading decoration (e.g. 'xmin = ') and then matches, in
+# order: a quoted string, a number, a flag (e.g. <exists>), or an index in
+# square brackets (e.g. 'item [1]:' in long textgrids)
+_DECORATION = r'[^"0-9.+<\[-]*'
+_STRING = r'"([^"]*(?:""[^"]*)*)"'
+_NUMBER = r'([-+]?(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)(?:[eE][-+]?[0-9]+)?)'
+_FLAG = r'<([a-z]+)>'
+_INDEX = r'\[[^\]\n]*\]'
+_TOKEN_RE = re.compile(r'%s(?:%s|%s|%s|%s)' % (_DECORATION, _STRING, _NUMBER,
+                                               _FLAG, _INDEX))
+
+# Matches a run of _SKIP_CHUNK_SIZE tokens in one go, treating indices as
+# part of the decoration.  Strings and numbers may not be followed by
+# another quote or digit, so each run of tokens can only be matched one way;
+# otherwise a failed match (e.g. near the end of the data) backtracks through
+# every way of splitting the numbers and strings into shorter tokens.
+_SKIP_CHUNK_SIZE = 1000
+_SKIP_RE = re.compile(r'(?:%s(?:%s%s)*(?:%s(?!")|%s(?![0-9.eE])|%s)){%d}' %
+                      (_DECORATION, _INDEX, _DECORATION, _STRING, _NUMBER,
+                       _FLAG, _SKIP_CHUNK_SIZE))
+
+# The same, for scanning utf-8 files directly as bytes
+_BYTES_TOKEN_RE = re.compile(_TOKEN_RE.pattern.encode("ascii"))
+_BYTES_SKIP_RE = re.compile(_SKIP_RE.pattern.encode("ascii"))
+
+# Praat's binary format stores numbers big-endian
+BINARY_HEADER = b"ooBinaryFile"
+_UINT8 = struct.Struct(">B")
+_UINT16 = struct.Struct(">H")
+_INT32 = struct.Struct(">i")
+_DOUBLE = struct.Struct(">d")
+_TWO_DOUBLES = struct.Struct(">2d")
+
 
 def _isclose(a, b, rel_tol=1e-14, abs_tol=0.0):
     return abs(a - b) <= max(rel_tol * max(abs(a), abs(b)), abs_tol)
@@ -37,93 +87,169 @@ def _getWavDuration(wavFN):
     return duration
 
 
-def _fillInBlanks(tier, blankLabel="", startTime=None, endTime=None):
+def _normalizeIntervals(entryList, startTime, endTime, minLength=None,
+                        blankLabel=""):
     '''
-    Fills in the space between intervals with empty space
+    Returns the entries of an interval tier in the form they are saved in
+    
+    The gaps before, between, and after the intervals are filled with
+    blank intervals so that the tier runs from startTime to endTime.
+    
+    If minLength is not None, intervals shorter than it are also removed.
+    Doing many small manipulations on intervals can lead to the creation
+    of ultrashort intervals (e.g. 1*10^-15 seconds long).  Each one is
+    absorbed into the interval before it, and boundaries that are almost
+    but not quite shared are snapped together.
     
-    This is necessary to do when saving to create a well-formed textgrid
+    This is all done in one pass over entryList, which must be sorted.
+    entryList itself is not modified.
     '''
-    if startTime is None:
-        startTime = tier.minTimestamp
-        
-    if endTime is None:
-        endTime = tier.maxTimestamp
+    startTime = float(startTime)
+    endTime = float(endTime)
     
-    # Special case: empty textgrid
-    if len(tier.entryList) == 0:
-        tier.entryList.append((startTime, endTime, blankLabel))
+    if len(entryList) > 0:
+        assert(float(entryList[0][0]) >= startTime)
+        assert(float(entryList[-1][1]) <= endTime)
+    
+    newEntryList = []
     
-    # Create a new entry list
-    entryList = tier.entryList[:]
-    entry = entryList[0]
-    prevEnd = float(entry[1])
-    newEntryList = [entry]
-    for entry in entryList[1:]:
-        newStart = float(entry[0])
-        newEnd = float(entry[1])
+    def addInterval(entry):
+        start, stop, label = entry
+        if minLength is not None:
+            if stop - start < minLength:
+                if len(newEntryList) > 0:
+                    lastStart, _, lastLabel = newEntryList[-1]
+                    newEntryList[-1] = Interval(lastStart, stop, lastLabel)
+                return
+            
+            # If the first intervals were removed, the first one that is
+            # kept takes their place.  Otherwise, a boundary that is almost
+            # shared with the previous interval is moved onto this one.
+            if len(newEntryList) == 0:
+                if start != startTime:
+                    entry = Interval(startTime, stop, label)
+            else:
+                lastStart, lastStop, lastLabel = newEntryList[-1]
+                diff = abs(lastStop - start)
+                if diff > 0 and diff < MIN_INTERVAL_LENGTH:
+                    newEntryList[-1] = Interval(lastStart, start, lastLabel)
         
-        if prevEnd < newStart:
-            newEntryList.append((prevEnd, newStart, blankLabel))
         newEntryList.append(entry)
-        
-        prevEnd = newEnd
     
-    # Special case: If there is a gap at the start of the file
-    assert(float(newEntryList[0][0]) >= float(startTime))
-    if float(newEntryList[0][0]) > float(startTime):
-        newEntryList.insert(0, (startTime, newEntryList[0][0], blankLabel))
+    prevEnd = startTime
+    for entry in entryList:
+        if prevEnd < entry[0]:
+            addInterval(Interval(prevEnd, float(entry[0]), blankLabel))
+        addInterval(entry)
+        prevEnd = float(entry[1])
+    
+    if prevEnd < endTime:
+        addInterval(Interval(prevEnd, endTime, blankLabel))
     
-    # Special case -- if there is a gap at the end of the file
-    if endTime is not None:
-        assert(float(newEntryList[-1][1]) <= float(endTime))
-        if float(newEntryList[-1][1]) < float(endTime):
-            newEntryList.append((newEntryList[-1][1], endTime, blankLabel))
+    return newEntryList
 
-    newEntryList.sort()
 
-    return IntervalTier(tier.name, newEntryList,
-                        tier.minTimestamp, tier.maxTimestamp)
+def _convertTierTimes(tier, convertTime, sampleRate):
+    '''
+    Returns a copy of tier with convertTime() applied to all of its times
+    
+    The copy is marked as being in samples at sampleRate (or in seconds,
+    if sampleRate is None).
+    
+    Intervals that convertTime() shrinks to nothing are dropped, as are
+    points that it moves onto the time of the point before them.
+    '''
+    if isinstance(tier, IntervalTier):
+        entryList = [Interval(convertTime(start), convertTime(stop), label)
+                     for start, stop, label in tier._entryList]
+        entryList = [entry for entry in entryList if entry[0] < entry[1]]
+    else:
+        entryList = []
+        for time, label in tier._entryList:
+            time = convertTime(time)
+            if len(entryList) == 0 or entryList[-1][0] < time:
+                entryList.append(Point(time, label))
+    
+    return type(tier)._fromOwnedList(tier.name, entryList,
+                                     convertTime(tier.minTimestamp),
+                                     convertTime(tier.maxTimestamp),
+                                     sampleRate)
 
 
-def _removeUltrashortIntervals(tier, minLength):
+def _getLabelMatchFunc(matchLabel, substrMatchFlag=False, usingRE=False):
     '''
-    Remove intervals that are very tiny
+    Returns a function that checks labels against matchLabel
     
-    Doing many small manipulations on intervals can lead to the creation
-    of ultrashort intervals (e.g. 1*10^-15 seconds long).  This function
-    removes such intervals.
+    See TextgridTier.find() for a description of the arguments
+    '''
+    if usingRE is True:
+        return lambda label: re.findall(matchLabel, label, re.I) != []
+    elif substrMatchFlag is True:
+        return lambda label: matchLabel in label
+    else:
+        return lambda label: label == matchLabel
+
+
+def _isSorted(valueList):
+    return all(value <= nextValue for value, nextValue
+               in zip(valueList, itertools.islice(valueList, 1, None)))
+
+
+def _bisectEntries(entryList, time, inclusive=False):
     '''
+    Returns the index of the first entry that starts at or after /time/
     
-    # First, remove tiny intervals
-    newEntryList = []
-    j = 0  # index to newEntryList
-    for start, stop, label in tier.entryList:
-        
-        if stop - start < minLength:
-            # Correct ultra-short entries
-            if len(newEntryList) > 0:
-                lastStart, _, lastLabel = newEntryList[j - 1]
-                newEntryList[j - 1] = (lastStart, stop, lastLabel)
-        else:
-            # Special case: the first entry in oldEntryList was ultra-short
-            if len(newEntryList) == 0 and start != 0:
-                newEntryList.append((0, stop, label))
-            # Normal case
-            else:
-                newEntryList.append((start, stop, label))
-            j += 1
+    If inclusive is True, entries that start exactly at /time/ are
+    skipped over too.  entryList must be sorted.
+    '''
+    i = bisect.bisect_left(entryList, (time, ))
+    if inclusive is True:
+        while i < len(entryList) and entryList[i][0] == time:
+            i += 1
     
-    # Next, shift near equivalent tiny boundaries
-    j = 0
-    while j < len(newEntryList) - 1:
-        diff = abs(newEntryList[j][1] - newEntryList[j + 1][0])
-        if diff > 0 and diff < MIN_INTERVAL_LENGTH:
-            newEntryList[j] = (newEntryList[j][0],
-                               newEntryList[j + 1][0],
-                               newEntryList[j][2])
-        j += 1
+    return i
+
+
+def _cropInterval(entry, cropStart, cropEnd, mode):
+    '''
+    Returns what is left of an interval after cropping, or None
     
-    return tier.new(entryList=newEntryList)
+    See IntervalTier.crop() for a description of the modes
+    '''
+    intervalStart = entry[0]
+    intervalEnd = entry[1]
+    intervalLabel = entry[2]
+    
+    # Don't need to investigate if the interval is before or after
+    # the crop region
+    if intervalEnd <= cropStart or intervalStart >= cropEnd:
+        return None
+    
+    # Determine if the current subEntry is wholly contained
+    # within the superEntry
+    if intervalStart >= cropStart and intervalEnd <= cropEnd:
+        return entry
+    
+    # If it is only partially contained within the superEntry AND
+    # inclusion is 'lax', include it anyways
+    elif mode == 'lax':
+        return entry
+    
+    # Otherwise only truncated intervals on the edges are kept
+    elif mode != "truncated":
+        return None
+    
+    # The current interval stradles the end of the new interval
+    elif intervalStart >= cropStart and intervalEnd > cropEnd:
+        return Interval(intervalStart, cropEnd, intervalLabel)
+    
+    # The current interval stradles the start of the new interval
+    elif intervalStart < cropStart and intervalEnd <= cropEnd:
+        return Interval(cropStart, intervalEnd, intervalLabel)
+    
+    # The current interval contains the new interval completely
+    else:
+        return Interval(cropStart, cropEnd, intervalLabel)
 
      
 def intervalOverlapCheck(interval, cmprInterval, percentThreshold=0,
@@ -186,7 +312,7 @@ class TextgridCollisionException(Exception):
         dataTuple = (str(self.insertInterval),
                      self.tierName,
                      str(self.collisionList))
-        return ("Attempted to insert interval %s into tier %s of textgrid" +
+        return ("Attempted to insert interval %s into tier %s of textgrid "
                 "but overlapping entries %s already exist" % dataTuple)
 
     
@@ -208,12 +334,26 @@ class BadIntervalError(Exception):
         dataTuple = (self.start, self.stop, self.label)
         return ("Problem with interval--could not create textgrid " +
                 "(%s,%s,%s)" % dataTuple)
+
+
+class InvalidTierError(Exception):
+    
+    def __init__(self, tierName, entry, problem):
+        super(InvalidTierError, self).__init__()
+        self.tierName = tierName
+        self.entry = entry
+        self.problem = problem
+    
+    def __str__(self):
+        return ("Problem with entry %s of tier %s: %s" %
+                (str(self.entry), self.tierName, self.problem))
         
 
 class TextgridTier(object):
     
     tierType = None
     entryType = Interval
+    sampleRate = None  # Times are in seconds (see Textgrid.sampleRate)
     
     def __init__(self, name, entryList, minT, maxT,
                  pairedWav=None):
@@ -221,19 +361,106 @@ class TextgridTier(object):
         entryList.sort()
         
         self.name = name
-        self.entryList = entryList
+        self._setOwnEntryList(entryList)
         self.minTimestamp = minT
         self.maxTimestamp = maxT
     
+    @classmethod
+    def fromSorted(cls, name, entryList, minT, maxT, sampleRate=None):
+        '''
+        Makes a tier from entries that are already well-formed
+        
+        Unlike the constructor, nothing is checked, converted, or sorted.
+        entryList must be a sorted list of Intervals (or Points) with float
+        times that don't overlap and that lie within minT and maxT.  The
+        textgrid parsers and the tier operations, whose output is already
+        well-formed, build their tiers this way (see _fromOwnedList()).  validate() can check a
+        tier made this way.  If sampleRate is not None, the times are
+        sample indices (see Textgrid.sampleRate).  entryList is copied, so
+        changing it afterwards doesn't change the tier.
+        '''
+        tier = cls._fromOwnedList(name, entryList, minT, maxT, sampleRate)
+        if tier._entryList is entryList:
+            tier._setOwnEntryList(tier._copyEntryList(entryList))
+        
+        return tier
+    
+    @classmethod
+    def _fromOwnedList(cls, name, entryList, minT, maxT, sampleRate=None):
+        '''
+        Like fromSorted(), but the tier takes over entryList without copying
+        
+        For the parsers and tier operations, which build a new list for
+        each tier and never touch it again.
+        '''
+        tier = cls.__new__(cls)
+        tier.name = name
+        tier._setOwnEntryList(entryList)
+        tier.minTimestamp = minT
+        tier.maxTimestamp = maxT
+        if sampleRate is not None:
+            tier.sampleRate = sampleRate
+        
+        return tier
+    
+    @property
+    def entryList(self):
+        '''
+        The entries of the tier
+        
+        Tiers made by new() share their entries with the original tier
+        until one of them is modified.  The shared entries are copied
+        here, before they are handed out, so the returned list can always
+        be modified safely.  Once the list has been handed out (or set
+        from outside), new() copies it instead of sharing it.
+        '''
+        entryList = self._getOwnEntryList()
+        self._entryListExposed = True
+        
+        return entryList
+    
+    @entryList.setter
+    def entryList(self, entryList):
+        self._setOwnEntryList(entryList)
+        
+        # The caller can still modify the list it passed in
+        self._entryListExposed = self._entryList is entryList
+    
+    def _getOwnEntryList(self):
+        '''
+        Returns the entries for the tier's own methods to modify
+        
+        Like entryList, shared entries are copied first, but the list
+        isn't marked as handed out.
+        '''
+        if self._entryListShared:
+            self._entryList = self._copyEntryList(self._entryList)
+            self._entryListShared = False
+        
+        return self._entryList
+    
+    def _setOwnEntryList(self, entryList):
+        '''Stores a list of entries that nothing outside the tier uses'''
+        self._entryList = entryList
+        self._entryListShared = False
+        self._entryListExposed = False
+    
+    def _copyEntryList(self, entryList):
+        '''Returns a shallow copy of entryList (entries are immutable)'''
+        return list(entryList)
+    
     def __eq__(self, other):
         isEqual = True
         isEqual &= self.name == other.name
         isEqual &= _isclose(self.minTimestamp, other.minTimestamp)
         isEqual &= _isclose(self.maxTimestamp, other.maxTimestamp)
-        isEqual &= len(self.entryList) == len(self.entryList)
+        isEqual &= len(self._entryList) == len(other._entryList)
         
-        if isEqual:
-            for selfEntry, otherEntry in zip(self.entryList, other.entryList):
+        # Times in samples, and times read from the same file, are
+        # usually exactly equal, which is much quicker to check
+        if isEqual and self._entryList != other._entryList:
+            for selfEntry, otherEntry in zip(self._entryList,
+                                             other._entryList):
                 for selfSubEntry, otherSubEntry in zip(selfEntry, otherEntry):
                     try:
                         isEqual &= _isclose(selfSubEntry, otherSubEntry)
@@ -255,7 +482,7 @@ class TextgridTier(object):
         
         assert(self.tierType == tier.tierType)
         
-        entryList = self.entryList + appendTier.entryList
+        entryList = list(self._entryList) + list(appendTier._entryList)
         entryList.sort()
         
         return self.new(self.name,
@@ -265,7 +492,12 @@ class TextgridTier(object):
 
     def deleteEntry(self, entry):
         '''Removes an entry from the entryList'''
-        self.entryList.pop(self.entryList.index(entry))
+        entry = self.entryType(*entry)
+        entryList = self._getOwnEntryList()
+        i = bisect.bisect_left(entryList, entry)
+        if i == len(entryList) or entryList[i] != entry:
+            i = entryList.index(entry)  # The entryList isn't sorted
+        del entryList[i]
     
     def find(self, matchLabel, substrMatchFlag=False, usingRE=False):
         '''
@@ -275,61 +507,109 @@ class TextgridTier(object):
                          if False, label must be the same as matchLabel.
         usingRE: if True, matchLabel is interpreted as a regular expression
         '''
-        returnList = []
-        if usingRE is True:
-            for i, entry in enumerate(self.entryList):
-                matchList = re.findall(matchLabel, entry[-1], re.I)
-                if matchList != []:
-                    returnList.append(i)
-        else:
-            for i, entry in enumerate(self.entryList):
-                if not substrMatchFlag:
-                    if entry[-1] == matchLabel:
-                        returnList.append(i)
-                else:
-                    if matchLabel in entry[-1]:
-                        returnList.append(i)
+        matchFunc = _getLabelMatchFunc(matchLabel, substrMatchFlag, usingRE)
         
-        return returnList
+        return [i for i, entry in enumerate(self._entryList)
+                if matchFunc(entry[-1])]
     
     def getAsText(self):
         '''Prints each entry in the tier on a separate line w/ timing info'''
-        text = ""
-        text += '"%s"\n' % self.tierType
-        text += '"%s"\n' % self.name
-        text += '%s\n%s\n%s\n' % (repr(self.minTimestamp),
-                                  repr(self.maxTimestamp),
-                                  len(self.entryList))
-        
-        for entry in self.entryList:
-            entry = [repr(val) for val in entry[:-1]] + ['"%s"' % entry[-1], ]
-            try:
-                unicode
-            except NameError:
-                unicodeFunc = str
-            else:
-                unicodeFunc = unicode
-            
-            text += "\n".join([unicodeFunc(val) for val in entry]) + "\n"
-            
-        return text
+        return u"".join(self._iterAsText())
+    
+    def _getTimeColumns(self):
+        '''Returns the start times and the end times of the entries'''
+        starts = [entry[0] for entry in self._entryList]
+        ends = [entry[-2] for entry in self._entryList]
+        
+        return starts, ends
+    
+    def _iterAsText(self):
+        '''Yields the text of the tier header and then of each entry'''
+        yield _getTierHeaderText(self.tierType, self.name,
+                                 self.minTimestamp, self.maxTimestamp,
+                                 len(self._entryList))
+        
+        for text in _iterEntriesAsText(self._entryList):
+            yield text
+    
+    def _iterAsBinary(self):
+        '''Yields the tier header and then each entry in binary'''
+        yield (_packBinaryString(self.tierType, _UINT8) +
+               _packBinaryString(self.name) +
+               _TWO_DOUBLES.pack(self.minTimestamp, self.maxTimestamp) +
+               _INT32.pack(len(self._entryList)))
+        
+        timeStruct = _TWO_DOUBLES if self.entryType is Interval else _DOUBLE
+        for entry in self._entryList:
+            yield timeStruct.pack(*entry[:-1]) + _packBinaryString(entry[-1])
+    
+    def _finishInsertEntries(self, newEntryList, collisionList, warnFlag,
+                             collisionCode):
+        '''
+        Stores the entry list built by insertEntries()
+        
+        collisionList holds a pair (entry, matchList) for each collision.
+        '''
+        if len(collisionList) > 0 and collisionCode not in ["replace",
+                                                            "merge"]:
+            raise TextgridCollisionException(
+                self.name,
+                [entry for entry, _ in collisionList],
+                [matchList for _, matchList in collisionList])
+        
+        # Shared entries are replaced rather than overwritten in place
+        if self._entryListShared:
+            self._setOwnEntryList(newEntryList)
+        else:
+            self._entryList[:] = newEntryList
+        
+        if len(collisionList) > 0 and warnFlag is True:
+            collisionText = "\n".join(["%s with items %s" % (str(entry),
+                                                             str(matchList))
+                                       for entry, matchList in collisionList])
+            fmtStr = "Collision warning for %d entries of tier %s:\n%s"
+            print((fmtStr % (len(collisionList), self.name, collisionText)))
+        
+        return collisionList
     
     def new(self, name=None, entryList=None, minTimestamp=None,
             maxTimestamp=None, pairedWav=None):
-        '''Make a new tier derived from the current one'''
+        '''
+        Make a new tier derived from the current one
+        
+        If only the name is changed, the new tier shares its entries with
+        this one (see entryList), so making it takes constant time.
+        '''
         if name is None:
             name = self.name
+        
+        if (entryList is None and minTimestamp is None and
+                maxTimestamp is None and pairedWav is None):
+            newTier = copy.copy(self)
+            newTier.name = name
+            
+            # Entries that have been handed out might still be modified
+            # through the returned list, so they can't be shared
+            if self._entryListExposed:
+                newTier._setOwnEntryList(
+                    self._copyEntryList(self._entryList))
+            else:
+                self._entryListShared = newTier._entryListShared = True
+            
+            return newTier
+        
         if entryList is None:
-            entryList = copy.deepcopy(self.entryList)
-            entryList = [self.entryType(*entry) if isinstance(entry, tuple)
-                         else entry
-                         for entry in entryList]
+            entryList = self._copyEntryList(self._entryList)
         if minTimestamp is None:
             minTimestamp = self.minTimestamp
         if maxTimestamp is None and pairedWav is None:
             maxTimestamp = self.maxTimestamp
-        return type(self)(name, entryList, minTimestamp, maxTimestamp,
-                          pairedWav)
+        newTier = type(self)(name, entryList, minTimestamp, maxTimestamp,
+                             pairedWav)
+        if self.sampleRate is not None:
+            newTier.sampleRate = self.sampleRate
+        
+        return newTier
     
     def sort(self):
         '''Sorts the entries in the entryList'''
@@ -339,10 +619,51 @@ class TextgridTier(object):
         # of the same data type.  The entry list is sorted whenever
         # the entry list is modified, so this is probably the best
         # place to enforce the data type
-        self.entryList = [entry if isinstance(entry, self.entryType) else
-                          self.entryType(*entry) for entry in self.entryList]
-        self.entryList.sort()
+        entryList = [entry if isinstance(entry, self.entryType) else
+                     self.entryType(*entry) for entry in self._entryList]
+        entryList.sort()
+        self._setOwnEntryList(entryList)
+        
+    def validate(self):
+        '''
+        Checks that the tier is well-formed
         
+        Each entry must be an Interval (or a Point) inside the tier that
+        ends at or before the next entry starts.  Intervals must also start
+        before they end.  Each check compares whole columns of times at
+        once; entries are only looked at one by one to report a problem.
+        Raises an InvalidTierError for the first problem found.
+        '''
+        entryList = self._entryList
+        starts, ends = self._getTimeColumns()
+        
+        def check(okList, problem, offset=0):
+            okList = list(okList)
+            if not all(okList):
+                i = okList.index(False) + offset
+                raise InvalidTierError(self.name, entryList[i], problem)
+        
+        # Entries stored in columns are always of the right type
+        if isinstance(entryList, list):
+            check((isinstance(entry, self.entryType) for entry in entryList),
+                  "it is not a %s" % self.entryType.__name__)
+        
+        if self.entryType is Interval:
+            check((start < end for start, end in zip(starts, ends)),
+                  "it doesn't start before it ends")
+            check((end <= start for end, start in zip(ends, starts[1:])),
+                  "it overlaps the next entry")
+        else:
+            check((time < nextTime for time, nextTime
+                   in zip(starts, starts[1:])),
+                  "it isn't before the next entry")
+        
+        if len(entryList) > 0:
+            check([starts[0] >= self.minTimestamp],
+                  "it starts before the tier")
+            check([ends[-1] <= self.maxTimestamp],
+                  "it ends after the tier", len(entryList) - 1)
+    
     def union(self, tier):
         '''
         The given tier is set unioned to this tier.
@@ -351,11 +672,7 @@ class TextgridTier(object):
         Overlapping entries are merged.
         '''
         retTier = self.new()
-        
-        for entry in tier.entryList:
-            retTier.insertEntry(entry, False, collisionCode='merge')
-        
-        retTier.sort()
+        retTier.insertEntries(tier._entryList, False, collisionCode='merge')
         
         return retTier
         
@@ -407,25 +724,24 @@ class PointTier(TextgridTier):
         mode is ignored.  This parameter is kept for compatibility with
         IntervalTier.crop()
         '''
-        newEntryList = []
-        
-        for entry in self.entryList:
-            timestamp = entry[0]
-            
-            if timestamp >= cropStart and timestamp <= cropEnd:
-                newEntryList.append(entry)
+        cropStart = float(cropStart)
+        cropEnd = float(cropEnd)
+        startI = _bisectEntries(self._entryList, cropStart)
+        endI = _bisectEntries(self._entryList, cropEnd, inclusive=True)
+        newEntryList = self._entryList[startI:endI]
 
         if rebaseToZero is True:
-            newEntryList = [(timeV - cropStart, label)
+            newEntryList = [Point(timeV - cropStart, label)
                             for timeV, label in newEntryList]
-            minT = 0
+            minT = 0.0
             maxT = cropEnd - cropStart
         else:
             minT = cropStart
             maxT = cropEnd
 
         # Create subtier
-        subTier = PointTier(self.name, newEntryList, minT, maxT)
+        subTier = PointTier._fromOwnedList(self.name, newEntryList, minT, maxT,
+                                           self.sampleRate)
         return subTier
 
     def editTimestamps(self, offset, allowOvershoot=False):
@@ -437,7 +753,7 @@ class PointTier(TextgridTier):
         '''
         
         newEntryList = []
-        for timestamp, label in self.entryList:
+        for timestamp, label in self._entryList:
             
             newTimestamp = timestamp + offset
             if not allowOvershoot:
@@ -447,7 +763,7 @@ class PointTier(TextgridTier):
             if newTimestamp < 0:
                 continue
             
-            newEntryList.append((newTimestamp, label))
+            newEntryList.append(Point(newTimestamp, label))
         
         # Determine new min and max timestamps
         timeList = [float(subList[0]) for subList in newEntryList]
@@ -460,7 +776,8 @@ class PointTier(TextgridTier):
         if newMax < self.maxTimestamp:
             newMax = self.maxTimestamp
         
-        return PointTier(self.name, newEntryList, newMin, newMax)
+        return PointTier._fromOwnedList(self.name, newEntryList, newMin,
+                                        newMax, self.sampleRate)
     
     def getValuesAtPoints(self, dataTupleList, fuzzyMatching=False):
         '''
@@ -469,28 +786,21 @@ class PointTier(TextgridTier):
         If fuzzyMatching is True, if there is not a feature value
         at a point, the nearest feature value will be taken.
         
-        The procedure assumes that all data is ordered in time.
         dataTupleList should be in the form
         [(t1, v1a, v1b, ..), (t2, v2a, v2b, ..), ..]
         
-        The procedure makes one pass through dataTupleList and one
-        pass through self.entryList.  If the data is not sequentially
-        ordered, the incorrect response will be returned.
+        dataTupleList is sorted by time (if it isn't already) and each
+        point is then found in it by bisection.
         '''
+        sortedDataTupleList = sorted(dataTupleList,
+                                     key=operator.itemgetter(0))
+        timestampList = [timestamp for timestamp, _ in self._entryList]
+        valueList = utils.getValuesAtTimes(timestampList,
+                                           sortedDataTupleList,
+                                           fuzzyMatching=fuzzyMatching)
         
-        i = 0
-        retList = []
-        
-        sortedDataTupleList = dataTupleList.sorted()
-        for timestamp, label in self.entryList:
-            retTuple = utils.getValueAtTime(timestamp,
-                                            sortedDataTupleList,
-                                            fuzzyMatching=fuzzyMatching,
-                                            startI=i)
-            retTime, retVal, i = retTuple
-            retList.append((retTime, label, retVal))
-    
-        return retList
+        return [(retTime, label, retVal) for (retTime, retVal), (_, label)
+                in zip(valueList, self._entryList)]
         
     def eraseRegion(self, start, stop, collisionCode=None, doShrink=True):
         '''
@@ -503,23 +813,14 @@ class PointTier(TextgridTier):
         '''
 
         newTier = self.new()
-        croppedTier = newTier.crop(start, stop, "truncated", False)
-        matchList = croppedTier.entryList
-        
-        if len(matchList) == 0:
-            pass
-        else:
-            
-            # Remove all the matches from the entryList
-            # Go in reverse order because we're destructively altering
-            # the order of the list (messes up index order)
-            for tmpEntry in matchList[::-1]:
-                newTier.deleteEntry(tmpEntry)
+        startI = _bisectEntries(newTier._entryList, start)
+        endI = _bisectEntries(newTier._entryList, stop, inclusive=True)
+        del newTier._getOwnEntryList()[startI:endI]
                 
         if doShrink is True:
             newEntryList = []
             diff = stop - start
-            for timestamp, label in newTier.entryList:
+            for timestamp, label in newTier._entryList:
                 if timestamp < start:
                     newEntryList.append((timestamp, label))
                 elif timestamp > stop:
@@ -549,35 +850,84 @@ class PointTier(TextgridTier):
         if not isinstance(entry, Point):
             entry = Point(timestamp, label)
         
-        matchList = []
-        i = None
-        for i, searchEntry in self.entryList:
-            if searchEntry[0] == entry[0]:
-                matchList.append(searchEntry)
-                break
+        if collisionCode is not None:
+            collisionCode = collisionCode.lower()
+        
+        # Only the first entry at or after the timestamp can collide
+        entryList = self._getOwnEntryList()
+        i = _bisectEntries(entryList, timestamp)
+        matchList = [searchEntry for searchEntry in entryList[i:i + 1]
+                     if searchEntry[0] == timestamp]
         
         if len(matchList) == 0:
-            self.entryList.append(entry)
+            entryList.insert(i, entry)
             
-        elif collisionCode.lower() == "replace":
-            self.deleteEntry(self.entryList[i])
-            self.entryList.append(entry)
+        elif collisionCode == "replace":
+            entryList[i] = entry
             
-        elif collisionCode.lower() == "merge":
-            oldEntry = self.entryList[i]
+        elif collisionCode == "merge":
+            oldEntry = entryList[i]
             newEntry = Point(timestamp, "-".join([oldEntry[-1], label]))
-            self.deleteEntry(self.entryList[i])
-            self.entryList.append(newEntry)
+            entryList[i] = newEntry
             
         else:
             raise TextgridCollisionException(self.name, entry, matchList)
-            
-        self.sort()
         
         if len(matchList) != 0 and warnFlag is True:
             fmtStr = "Collision warning for %s with items %s of tier %s"
             print((fmtStr % (str(entry), str(matchList), self.name)))
     
+    def insertEntries(self, entryList, warnFlag=True, collisionCode=None):
+        '''
+        Inserts many points into the tier at once
+        
+        The result is the same as calling insertEntry() with each new
+        entry, in sorted order.  However, the new entries are sorted just
+        once and then merged with the existing entries in a single pass.
+        
+        collisionCode: as in insertEntry().  If any entries collide and
+                       collisionCode is not 'replace' or 'merge', the tier
+                       is left unchanged and a TextgridCollisionException
+                       listing every collision is thrown
+        
+        if warnFlag is True, all collisions are reported in one warning.
+        Returns a list of (entry, matchList) pairs, one for each collision.
+        '''
+        if collisionCode is not None:
+            collisionCode = collisionCode.lower()
+        
+        oldEntryList = self._entryList
+        newEntryList = []
+        collisionList = []
+        i = 0
+        for entry in sorted([Point(*entry) for entry in entryList]):
+            timestamp = entry[0]
+            while i < len(oldEntryList) and oldEntryList[i][0] < timestamp:
+                newEntryList.append(oldEntryList[i])
+                i += 1
+            
+            # Only the last entry inserted and the next old entries
+            # can share this entry's timestamp
+            matchList = []
+            if len(newEntryList) > 0 and newEntryList[-1][0] == timestamp:
+                matchList.append(newEntryList.pop())
+            while i < len(oldEntryList) and oldEntryList[i][0] == timestamp:
+                matchList.append(oldEntryList[i])
+                i += 1
+            
+            if len(matchList) > 0:
+                collisionList.append((entry, matchList))
+                if collisionCode == "merge":
+                    labelList = [matchEntry[-1] for matchEntry in matchList]
+                    entry = Point(timestamp, "-".join(labelList + [entry[-1]]))
+            
+            newEntryList.append(entry)
+        
+        newEntryList.extend(oldEntryList[i:])
+        
+        return self._finishInsertEntries(newEntryList, collisionList,
+                                         warnFlag, collisionCode)
+    
     def insertSpace(self, start, duration, collisionCode=None):
         '''
         Inserts a region into the tier
@@ -587,7 +937,7 @@ class PointTier(TextgridTier):
         '''
         
         newEntryList = []
-        for entry in self.entryList:
+        for entry in self._entryList:
             if entry[0] <= start:
                 newEntryList.append(entry)
             elif entry[0] > start:
@@ -675,93 +1025,34 @@ class IntervalTier(TextgridTier):
         
         assert(mode in ['strict', 'lax', 'truncated'])
         
-        # Debugging variables
-        cutTStart = 0
-        cutTWithin = 0
-        cutTEnd = 0
-        firstIntervalKeptProportion = 0
-        lastIntervalKeptProportion = 0
+        cropStart = float(cropStart)
+        cropEnd = float(cropEnd)
+        startI, endI = self._getOverlapRange(cropStart, cropEnd)
         
         newEntryList = []
-        for entry in self.entryList:
-            matchedEntry = None
-            
-            intervalStart = entry[0]
-            intervalEnd = entry[1]
-            intervalLabel = entry[2]
-            
-            # Don't need to investigate if the interval is before or after
-            # the crop region
-            if intervalEnd <= cropStart or intervalStart >= cropEnd:
-                continue
-            
-            # Determine if the current subEntry is wholly contained
-            # within the superEntry
-            if intervalStart >= cropStart and intervalEnd <= cropEnd:
-                matchedEntry = entry
-            
-            # If it is only partially contained within the superEntry AND
-            # inclusion is 'lax', include it anyways
-            elif mode == 'lax' and (intervalStart >= cropStart or
-                                    intervalEnd <= cropEnd):
-                matchedEntry = entry
-            
-            # If not strict, include partial tiers on the edges
-            # -- regardless, record how much information was lost
-            #        - for strict=True, the total time of the cut interval
-            #        - for strict=False, the portion of the interval that lies
-            #            outside the new interval
-
-            # The current interval stradles the end of the new interval
-            elif intervalStart >= cropStart and intervalEnd > cropEnd:
-                cutTEnd = intervalEnd - cropEnd
-                lastIntervalKeptProportion = ((cropEnd - intervalStart) /
-                                              (intervalEnd - intervalStart))
-
-                if mode == "truncated":
-                    matchedEntry = (intervalStart, cropEnd, intervalLabel)
-                    
-                else:
-                    cutTWithin += cropEnd - cropStart
-            
-            # The current interval stradles the start of the new interval
-            elif intervalStart < cropStart and intervalEnd <= cropEnd:
-                cutTStart = cropStart - intervalStart
-                firstIntervalKeptProportion = ((intervalEnd - cropStart) /
-                                               (intervalEnd - intervalStart))
-                if mode == "truncated":
-                    matchedEntry = (cropStart, intervalEnd, intervalLabel)
-                else:
-                    cutTWithin += cropEnd - cropStart
-
-            # The current interval contains the new interval completely
-            elif intervalStart <= cropStart and intervalEnd >= cropEnd:
-
-                if mode == "lax":
-                    matchedEntry = entry
-                elif mode == "truncated":
-                    matchedEntry = (cropStart, cropEnd, intervalLabel)
-                else:
-                    cutTWithin += cropEnd - cropStart
-                        
+        for entry in self._entryList[startI:endI]:
+            matchedEntry = _cropInterval(entry, cropStart, cropEnd, mode)
             if matchedEntry is not None:
                 newEntryList.append(matchedEntry)
 
         if rebaseToZero is True:
-            newEntryList = [(startT - cropStart, stopT - cropStart, label)
+            newEntryList = [Interval(startT - cropStart, stopT - cropStart,
+                                     label)
                             for startT, stopT, label in newEntryList]
-            minT = 0
+            minT = 0.0
             maxT = cropEnd - cropStart
         else:
             minT = cropStart
             maxT = cropEnd
+        
+        # In 'lax' mode, the edge entries can stick out of the crop region
+        if len(newEntryList) > 0:
+            minT = min(minT, newEntryList[0][0])
+            maxT = max(maxT, newEntryList[-1][1])
 
         # Create subtier
-        croppedTier = IntervalTier(self.name, newEntryList, minT, maxT)
-        
-        # DEBUG info
-#         debugInfo = (subTier, cutTStart, cutTWithin, cutTEnd,
-#                      firstIntervalKeptProportion, lastIntervalKeptProportion)
+        croppedTier = IntervalTier._fromOwnedList(self.name, newEntryList,
+                                                  minT, maxT, self.sampleRate)
     
         return croppedTier
     
@@ -771,16 +1062,33 @@ class IntervalTier(TextgridTier):
         
         Any overlapping portions of entries with entries in this textgrid
         will be removed from the returned tier.
-        '''
-        retTier = self.new()
         
-        for entry in tier.entryList:
-            retTier = retTier.eraseRegion(entry[0],
-                                          entry[1],
-                                          collisionCode='truncate',
-                                          doShrink=False)
+        Both tiers are swept through once, side by side.
+        '''
+        cutEntryList = tier._entryList
+        retEntryList = []
+        j = 0
+        for start, stop, label in self._entryList:
+            
+            # Skip the entries that end before this one starts
+            while j < len(cutEntryList) and cutEntryList[j][1] <= start:
+                j += 1
+            
+            # Keep whatever lies between the overlapping entries
+            k = j
+            while k < len(cutEntryList) and cutEntryList[k][0] < stop:
+                cutStart, cutStop = cutEntryList[k][:2]
+                if cutStart > start:
+                    retEntryList.append(Interval(start, cutStart, label))
+                start = max(start, cutStop)
+                k += 1
+            
+            if start < stop:
+                retEntryList.append(Interval(start, stop, label))
         
-        return retTier
+        return type(self)._fromOwnedList(self.name, retEntryList,
+                                         self.minTimestamp, self.maxTimestamp,
+                                         self.sampleRate)
 
     def editTimestamps(self, offset, allowOvershoot=False):
         '''
@@ -793,7 +1101,7 @@ class IntervalTier(TextgridTier):
         '''
         
         newEntryList = []
-        for start, stop, label in self.entryList:
+        for start, stop, label in self._entryList:
             
             newStart = offset + start
             newStop = offset + stop
@@ -801,15 +1109,12 @@ class IntervalTier(TextgridTier):
                 assert(newStart >= self.minTimestamp)
                 assert(newStop <= self.maxTimestamp)
             
-            if newStop < 0:
+            if newStop <= 0:
                 continue
             if newStart < 0:
-                newStart = 0
-            
-            if newStart < 0:
-                continue
+                newStart = 0.0
             
-            newEntryList.append((newStart, newStop, label))
+            newEntryList.append(Interval(newStart, newStop, label))
 
         # Determine new min and max timestamps
         newMin = min([entry[0] for entry in newEntryList])
@@ -821,7 +1126,8 @@ class IntervalTier(TextgridTier):
         if newMax < self.maxTimestamp:
             newMax = self.maxTimestamp
         
-        return IntervalTier(self.name, newEntryList, newMin, newMax)
+        return IntervalTier._fromOwnedList(self.name, newEntryList,
+                                           newMin, newMax, self.sampleRate)
 
     def eraseRegion(self, start, stop, collisionCode=None, doShrink=True):
         '''
@@ -839,41 +1145,39 @@ class IntervalTier(TextgridTier):
                   each item that occurs after /stop/
         '''
         
-        matchList = self.crop(start, stop, 'lax', False).entryList
-        newTier = self.new()
-
         # if the collisionCode is not properly set it isn't clear what to do
         assert(collisionCode == 'truncate' or
                collisionCode == 'categorical')
         
-        if len(matchList) == 0:
-            pass
-        else:
-            # Remove all the matches from the entryList
-            # Go in reverse order because we're destructively altering
-            # the order of the list (messes up index order)
-            for tmpEntry in matchList[::-1]:
-                newTier.deleteEntry(tmpEntry)
+        newTier = self.new()
+        startI, endI = newTier._getOverlapRange(start, stop)
+        matchList = newTier._entryList[startI:endI]
+        
+        # Remove all the matches from the entryList
+        del newTier._getOwnEntryList()[startI:endI]
+        
+        # If we're only truncating, reinsert entries on the left and
+        # right edges
+        if len(matchList) > 0 and collisionCode == 'truncate':
+            edgeList = []
             
-            # If we're only truncating, reinsert entries on the left and
-            # right edges
-            if collisionCode == 'truncate':
-
-                # Check left edge
-                if matchList[0][0] < start:
-                    newEntry = (matchList[0][0], start, matchList[0][-1])
-                    newTier.entryList.append(newEntry)
-                    
-                # Check right edge
-                if matchList[-1][1] > stop:
-                    newEntry = (stop, matchList[-1][1], matchList[-1][-1])
-                    newTier.entryList.append(newEntry)
+            # Check left edge
+            if matchList[0][0] < start:
+                edgeList.append(Interval(matchList[0][0], start,
+                                         matchList[0][-1]))
+                
+            # Check right edge
+            if matchList[-1][1] > stop:
+                edgeList.append(Interval(stop, matchList[-1][1],
+                                         matchList[-1][-1]))
+            
+            newTier._getOwnEntryList()[startI:startI] = edgeList
         
         if doShrink is True:
             
             diff = stop - start
             newEntryList = []
-            for entry in newTier.entryList:
+            for entry in newTier._entryList:
                 if entry[1] <= start:
                     newEntryList.append(entry)
                 elif entry[0] >= stop:
@@ -906,23 +1210,66 @@ class IntervalTier(TextgridTier):
             
         return newTier
     
+    def _getOverlapRange(self, start, stop):
+        '''
+        Returns the index range of the entries that overlap /start/-/stop/
+        
+        Entries are sorted and don't overlap, so only the entry before the
+        first one that starts at or after /start/ can stick into the range.
+        '''
+        entryList = self._entryList
+        startI = _bisectEntries(entryList, start)
+        if startI > 0 and entryList[startI - 1][1] > start:
+            startI -= 1
+        endI = max(startI, _bisectEntries(entryList, stop))
+        
+        return startI, endI
+    
+    def getIndexRangesInIntervals(self, timeList):
+        '''
+        Returns the range of times in timeList within each interval
+        
+        timeList must be sorted.  Returns a list of (interval, startI, endI)
+        where timeList[startI:endI] holds the times between the start and
+        end of the interval, inclusive.  The ranges can be used to slice
+        any data ordered like timeList (such as a numpy array of samples)
+        without copying it.
+        
+        The intervals and times are walked through together and neither
+        index ever moves backwards, so each lookup only bisects the times
+        that are left.
+        '''
+        returnList = []
+        startI = endI = 0
+        for interval in self._entryList:
+            startI = bisect.bisect_left(timeList, interval[0], startI)
+            endI = bisect.bisect_right(timeList, interval[1],
+                                       max(startI, endI))
+            returnList.append((interval, startI, endI))
+        
+        return returnList
+    
     def getValuesInIntervals(self, dataTupleList):
         '''
         Returns data from dataTupleList contained in labeled intervals
         
         dataTupleList should be of the form:
         [(time1, value1a, value1b,...), (time2, value2a, value2b...), ...]
-        '''
-        
-        returnList = []
         
-        for interval in self.entryList:
-            intervalDataList = utils.getValuesInInterval(dataTupleList,
+        If dataTupleList is sorted by time, it is joined to the intervals
+        in one pass (see getIndexRangesInIntervals()).  Otherwise, it is
+        scanned once per interval.
+        '''
+        timeList = [dataTuple[0] for dataTuple in dataTupleList]
+        if not _isSorted(timeList):
+            return [(interval, utils.getValuesInInterval(dataTupleList,
                                                          interval[0],
-                                                         interval[1])
-            returnList.append((interval, intervalDataList))
+                                                         interval[1]))
+                    for interval in self._entryList]
         
-        return returnList
+        return [(interval, dataTupleList[startI:endI])
+                for interval, startI, endI
+                in self.getIndexRangesInIntervals(timeList)]
             
     def getNonEntries(self):
         '''
@@ -930,7 +1277,7 @@ class IntervalTier(TextgridTier):
         
         This can include unlabeled segments and regions marked as silent.
         '''
-        entryList = self.entryList
+        entryList = self._entryList
         invertedEntryList = [(entryList[i][1], entryList[i + 1][0], "")
                              for i in range(len(entryList) - 1)]
         
@@ -966,36 +1313,92 @@ class IntervalTier(TextgridTier):
         '''
         startTime, endTime = entry[:2]
         
-        matchList = self.crop(startTime, endTime, 'lax', False).entryList
+        if not isinstance(entry, Interval):
+            entry = Interval(*entry)
+        
+        if collisionCode is not None:
+            collisionCode = collisionCode.lower()
+        
+        startI, endI = self._getOverlapRange(startTime, endTime)
+        matchList = self._entryList[startI:endI]
         
         if len(matchList) == 0:
-            self.entryList.append(entry)
+            self._getOwnEntryList().insert(startI, entry)
             
-        elif collisionCode.lower() == "replace":
-            for matchEntry in matchList:
-                self.deleteEntry(matchEntry)
-            self.entryList.append(entry)
+        elif collisionCode == "replace":
+            self._getOwnEntryList()[startI:endI] = [entry]
             
-        elif collisionCode.lower() == "merge":
-            for matchEntry in matchList:
-                self.deleteEntry(matchEntry)
-            matchList.append(entry)
-            matchList.sort()  # By starting time
+        elif collisionCode == "merge":
+            mergeList = sorted(matchList + [entry])  # By starting time
             
-            newEntry = (min([entry[0] for entry in matchList]),
-                        max([entry[1] for entry in matchList]),
-                        "-".join([entry[2] for entry in matchList]))
-            self.entryList.append(Interval(*newEntry))
+            newEntry = (min([entry[0] for entry in mergeList]),
+                        max([entry[1] for entry in mergeList]),
+                        "-".join([entry[2] for entry in mergeList]))
+            self._getOwnEntryList()[startI:endI] = [Interval(*newEntry)]
             
         else:
             raise TextgridCollisionException(self.name, entry, matchList)
-            
-        self.sort()
         
         if len(matchList) != 0 and warnFlag is True:
             fmtStr = "Collision warning for %s with items %s of tier %s"
             print((fmtStr % (str(entry), str(matchList), self.name)))
     
+    def insertEntries(self, entryList, warnFlag=True, collisionCode=None):
+        '''
+        Inserts many intervals into the tier at once
+        
+        The result is the same as calling insertEntry() with each new
+        entry, in sorted order.  However, the new entries are sorted just
+        once and then merged with the existing entries in a single pass.
+        
+        collisionCode: as in insertEntry().  If any entries collide and
+                       collisionCode is not 'replace' or 'merge', the tier
+                       is left unchanged and a TextgridCollisionException
+                       listing every collision is thrown
+        
+        if warnFlag is True, all collisions are reported in one warning.
+        Returns a list of (entry, matchList) pairs, one for each collision.
+        '''
+        if collisionCode is not None:
+            collisionCode = collisionCode.lower()
+        
+        oldEntryList = self._entryList
+        newEntryList = []
+        collisionList = []
+        i = 0
+        for entry in sorted([Interval(*entry) for entry in entryList]):
+            startTime, endTime = entry[:2]
+            
+            # Old entries that end before this entry starts can't collide
+            # with it or with any later entry
+            while i < len(oldEntryList) and oldEntryList[i][1] <= startTime:
+                newEntryList.append(oldEntryList[i])
+                i += 1
+            
+            # Only the last entry inserted and the next old entries
+            # can overlap this entry
+            matchList = []
+            if len(newEntryList) > 0 and newEntryList[-1][1] > startTime:
+                matchList.append(newEntryList.pop())
+            while i < len(oldEntryList) and oldEntryList[i][0] < endTime:
+                matchList.append(oldEntryList[i])
+                i += 1
+            
+            if len(matchList) > 0:
+                collisionList.append((entry, matchList))
+                if collisionCode == "merge":
+                    mergeList = sorted(matchList + [entry])
+                    entry = Interval(min([row[0] for row in mergeList]),
+                                     max([row[1] for row in mergeList]),
+                                     "-".join([row[2] for row in mergeList]))
+            
+            newEntryList.append(entry)
+        
+        newEntryList.extend(oldEntryList[i:])
+        
+        return self._finishInsertEntries(newEntryList, collisionList,
+                                         warnFlag, collisionCode)
+    
     def insertSpace(self, start, duration, collisionCode=None):
         '''
         Inserts a blank region into the tier
@@ -1015,7 +1418,7 @@ class IntervalTier(TextgridTier):
                collisionCode == 'no change')
         
         newEntryList = []
-        for entry in self.entryList:
+        for entry in self._entryList:
             # Entry exists before the insertion point
             if entry[1] <= start:
                 newEntryList.append(entry)
@@ -1054,21 +1457,36 @@ class IntervalTier(TextgridTier):
         Only intervals that exist in both tiers will remain in the
         returned tier.  If intervals partially overlap, only the overlapping
         portion will be returned.
+        
+        Both tiers are swept through once, side by side.
         '''
+        entryList = self._entryList
+        otherEntryList = tier._entryList
         retEntryList = []
-        for start, stop, label in tier.entryList:
-            subTier = self.crop(start, stop, "truncated", False)
+        i = j = 0
+        while i < len(entryList) and j < len(otherEntryList):
+            start, stop, label = entryList[i]
+            otherStart, otherStop, otherLabel = otherEntryList[j]
             
             # Combine the labels in the two tiers
-            stub = "%s-%%s" % label
-            subEntryList = [(subEntry[0], subEntry[1], stub % subEntry[2])
-                            for subEntry in subTier.entryList]
+            overlapStart = max(start, otherStart)
+            overlapStop = min(stop, otherStop)
+            if overlapStart < overlapStop:
+                retEntryList.append(Interval(overlapStart, overlapStop,
+                                             "%s-%s" % (otherLabel, label)))
             
-            retEntryList.extend(subEntryList)
+            # Whichever entry ends first can't overlap anything else
+            if stop < otherStop:
+                i += 1
+            else:
+                j += 1
         
         newName = "%s-%s" % (self.name, tier.name)
         
-        retTier = self.new(newName, retEntryList)
+        retTier = type(self)._fromOwnedList(newName, retEntryList,
+                                            self.minTimestamp,
+                                            self.maxTimestamp,
+                                            self.sampleRate)
         
         return retTier
 
@@ -1082,7 +1500,7 @@ class IntervalTier(TextgridTier):
         cumulativeAdjustAmount = 0
         lastFromEnd = 0
         newEntryList = []
-        allPoints = [self.entryList, targetTier.entryList]
+        allPoints = [self._entryList, targetTier._entryList]
         for fromEntry, targetEntry in utils.safeZip(allPoints, True):
             
             fromStart, fromEnd, fromLabel = fromEntry
@@ -1097,55 +1515,452 @@ class IntervalTier(TextgridTier):
                 currAdjustAmount = (targetEnd - targetStart)
             
             toEnd = cumulativeAdjustAmount = toStart + currAdjustAmount
-            newEntryList.append((toStart, toEnd, fromLabel))
+            newEntryList.append(Interval(toStart, toEnd, fromLabel))
             
             lastFromEnd = fromEnd
             
         newMin = self.minTimestamp
-        cumulativeDifference = (newEntryList[-1][1] - self.entryList[-1][1])
+        cumulativeDifference = (newEntryList[-1][1] - self._entryList[-1][1])
         newMax = self.maxTimestamp + cumulativeDifference
             
-        return IntervalTier(self.name, newEntryList, newMin, newMax)
+        return IntervalTier._fromOwnedList(self.name, newEntryList,
+                                           newMin, newMax, self.sampleRate)
 
         
-class Textgrid():
+class _ColumnarEntryList(MutableSequence):
+    '''
+    A list of entries stored as columns
     
-    def __init__(self):
-        'A container that stores and operates over interval and point tiers'
-        self.tierNameList = []  # Preserves the order of the tiers
-        self.tierDict = {}
+    Each time field (start and end for intervals, time for points) is
+    stored in an array of doubles.  Labels are interned in labelTable and
+    stored in labelCodes as indices into it.  Entries are created on the
+    fly when accessed, so this can stand in for a list of Intervals or
+    Points.
+    '''
     
-        self.minTimestamp = None
-        self.maxTimestamp = None
+    def __init__(self, entryType, timeColumns=None, labelCodes=None,
+                 labelTable=None):
+        if timeColumns is None:
+            timeColumns = [array.array("d")
+                           for _ in range(len(entryType._fields) - 1)]
+        if labelCodes is None:
+            labelCodes = array.array("i")
+        if labelTable is None:
+            labelTable = []
+        
+        self.entryType = entryType
+        self.timeColumns = timeColumns
+        self.labelCodes = labelCodes
+        self.labelTable = labelTable
+        self._codeDict = dict((label, code)
+                              for code, label in enumerate(labelTable))
+    
+    def _getCode(self, label):
+        '''Returns the code of a label, adding it to the table if needed'''
+        try:
+            code = self._codeDict[label]
+        except KeyError:
+            code = self._codeDict[label] = len(self.labelTable)
+            self.labelTable.append(label)
+        
+        return code
+    
+    def __len__(self):
+        return len(self.labelCodes)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        values = [column[index] for column in self.timeColumns]
+        values.append(self.labelTable[self.labelCodes[index]])
+        return self.entryType(*values)
+    
+    def __setitem__(self, index, entry):
+        if isinstance(index, slice):
+            entryList = list(entry)
+            for i, column in enumerate(self.timeColumns):
+                column[index] = array.array("d", [entry[i]
+                                                  for entry in entryList])
+            self.labelCodes[index] = array.array(
+                "i", [self._getCode(entry[-1]) for entry in entryList])
+            return
+        
+        for column, value in zip(self.timeColumns, entry[:-1]):
+            column[index] = value
+        self.labelCodes[index] = self._getCode(entry[-1])
+    
+    def __delitem__(self, index):
+        for column in self.timeColumns:
+            del column[index]
+        del self.labelCodes[index]
+    
+    def __iter__(self):
+        entryType = self.entryType
+        labelTable = self.labelTable
+        labelIter = (labelTable[code] for code in self.labelCodes)
+        for values in utils.safeZip(self.timeColumns + [labelIter], False):
+            yield entryType(*values)
     
     def __eq__(self, other):
-        isEqual = True
-        isEqual &= _isclose(self.minTimestamp, other.minTimestamp)
-        isEqual &= _isclose(self.maxTimestamp, other.maxTimestamp)
-
-        isEqual &= self.tierNameList == other.tierNameList
-        if isEqual:
-            for tierName in self.tierNameList:
-                isEqual &= self.tierDict[tierName] == other.tierDict[tierName]
-        
-        return isEqual
+        return list(self) == list(other)
     
-    def addTier(self, tier, tierIndex=None):
+    def __ne__(self, other):
+        return not self == other
+    
+    def __add__(self, other):
+        return list(self) + list(other)
+    
+    def __radd__(self, other):
+        return list(other) + list(self)
+    
+    def __repr__(self):
+        return repr(list(self))
+    
+    def append(self, entry):
+        for column, value in zip(self.timeColumns, entry[:-1]):
+            column.append(value)
+        self.labelCodes.append(self._getCode(entry[-1]))
+    
+    def insert(self, index, entry):
+        for column, value in zip(self.timeColumns, entry[:-1]):
+            column.insert(index, value)
+        self.labelCodes.insert(index, self._getCode(entry[-1]))
+    
+    def getRange(self, start, stop):
+        '''Returns the entries from start to stop as a _ColumnarEntryList'''
+        return _ColumnarEntryList(self.entryType,
+                                  [column[start:stop]
+                                   for column in self.timeColumns],
+                                  self.labelCodes[start:stop],
+                                  list(self.labelTable))
+    
+    def shiftTimes(self, offset):
+        '''Adds offset to every time in every entry'''
+        self.timeColumns = [array.array("d", [value + offset
+                                              for value in column])
+                            for column in self.timeColumns]
+    
+    def sort(self):
+        '''Sorts the entries, comparing them as tuples'''
+        times = self.timeColumns[0]
+        if all(times[i] < times[i + 1] for i in range(len(times) - 1)):
+            return
         
-        assert(tier.name not in list(self.tierDict.keys()))
+        entryList = sorted(self)
+        del self[:]
+        for entry in entryList:
+            self.append(entry)
 
-        if tierIndex is None:
-            self.tierNameList.append(tier.name)
-        else:
-            self.tierNameList.insert(tierIndex, tier.name)
-            
-        self.tierDict[tier.name] = tier
+
+class _ColumnarTier(object):
+    '''
+    Column-based entry storage shared by the columnar tier classes
+    
+    Must come before the regular tier class in the list of base classes.
+    '''
+    
+    def _setOwnEntryList(self, entryList):
+        if not isinstance(entryList, _ColumnarEntryList):
+            columns = _ColumnarEntryList(self.entryType)
+            columns.extend(entryList)
+            entryList = columns
+        TextgridTier._setOwnEntryList(self, entryList)
+    
+    def _copyEntryList(self, entryList):
+        return entryList.getRange(0, len(entryList))
+    
+    def _getTimeColumns(self):
+        timeColumns = self._entryList.timeColumns
+        return timeColumns[0], timeColumns[-1]
+    
+    def find(self, matchLabel, substrMatchFlag=False, usingRE=False):
+        '''
+        Returns the index of all entries that match the given label
         
-        minV = tier.minTimestamp
-        if self.minTimestamp is None or minV < self.minTimestamp:
-            self.minTimestamp = minV
+        See TextgridTier.find().  Each distinct label is only checked once.
+        '''
+        matchFunc = _getLabelMatchFunc(matchLabel, substrMatchFlag, usingRE)
+        matchCodes = set(code for code, label
+                         in enumerate(self._entryList.labelTable)
+                         if matchFunc(label))
         
-        maxV = tier.maxTimestamp
+        return [i for i, code in enumerate(self._entryList.labelCodes)
+                if code in matchCodes]
+
+
+class ColumnarPointTier(_ColumnarTier, PointTier):
+    '''
+    A point tier that stores its entries in columns
+    
+    Behaves like a PointTier, but takes a fraction of the memory.  The
+    times are stored in an array of doubles and each distinct label is only
+    stored once.  entryList is a view over the columns that creates each
+    Point as it is accessed.  The columns are available in
+    entryList.timeColumns, entryList.labelCodes, and entryList.labelTable.
+    '''
+    
+    def __init__(self, name, entryList, minT=None, maxT=None,
+                 pairedWav=None):
+        
+        if not isinstance(entryList, _ColumnarEntryList):
+            columns = _ColumnarEntryList(Point)
+            for time, label in entryList:
+                columns.append((float(time), label))
+            entryList = columns
+        
+        # Determine the min and max timestamps
+        times = entryList.timeColumns[0]
+        timeList = [min(times), max(times)] if len(times) > 0 else []
+        if minT is not None:
+            timeList.append(float(minT))
+        if maxT is not None:
+            timeList.append(float(maxT))
+            
+        if maxT is None and pairedWav is not None:
+            maxT = _getWavDuration(pairedWav)
+        
+        try:
+            minT = min(timeList)
+            maxT = max(timeList)
+        except ValueError:
+            raise TimelessTextgridTierException()
+        
+        # Skip PointTier.__init__(), which builds a list of Points
+        super(PointTier, self).__init__(name, entryList, minT, maxT)
+    
+    def crop(self, cropStart, cropEnd, mode=None,
+             rebaseToZero=True):
+        '''
+        Creates a new tier containing all entries inside the new interval
+        
+        See PointTier.crop().  The cropped entries are found by bisection.
+        '''
+        cropStart = float(cropStart)
+        cropEnd = float(cropEnd)
+        times = self._entryList.timeColumns[0]
+        newEntryList = self._entryList.getRange(
+            bisect.bisect_left(times, cropStart),
+            bisect.bisect_right(times, cropEnd))
+        
+        if rebaseToZero is True:
+            newEntryList.shiftTimes(-cropStart)
+            minT = 0.0
+            maxT = cropEnd - cropStart
+        else:
+            minT = cropStart
+            maxT = cropEnd
+        
+        return ColumnarPointTier._fromOwnedList(self.name, newEntryList,
+                                                minT, maxT, self.sampleRate)
+    
+    def editTimestamps(self, offset, allowOvershoot=False):
+        '''
+        Modifies all timestamps by a constant amount
+        
+        See PointTier.editTimestamps()
+        '''
+        newEntryList = self._copyEntryList(self._entryList)
+        newEntryList.shiftTimes(offset)
+        times = newEntryList.timeColumns[0]
+        
+        if not allowOvershoot and len(times) > 0:
+            assert(min(times) > self.minTimestamp)
+            assert(max(times) <= self.maxTimestamp)
+        
+        del newEntryList[:bisect.bisect_left(times, 0)]
+        
+        # Determine new min and max timestamps
+        newMin = min(self.minTimestamp, min(times))
+        newMax = max(self.maxTimestamp, max(times))
+        
+        return ColumnarPointTier._fromOwnedList(self.name, newEntryList,
+                                                newMin, newMax,
+                                                self.sampleRate)
+
+
+class ColumnarIntervalTier(_ColumnarTier, IntervalTier):
+    '''
+    An interval tier that stores its entries in columns
+    
+    Behaves like an IntervalTier, but takes a fraction of the memory.  The
+    start and end times are stored in arrays of doubles and each distinct
+    label is only stored once.  entryList is a view over the columns that
+    creates each Interval as it is accessed.  The columns are available in
+    entryList.timeColumns, entryList.labelCodes, and entryList.labelTable.
+    
+    crop(), editTimestamps(), and find() work directly on the columns.
+    Like praat, they assume that entries don't overlap.
+    '''
+    
+    def __init__(self, name, entryList, minT=None, maxT=None,
+                 pairedWav=None):
+        
+        if not isinstance(entryList, _ColumnarEntryList):
+            columns = _ColumnarEntryList(Interval)
+            for start, stop, label in entryList:
+                columns.append((float(start), float(stop), label.strip()))
+            entryList = columns
+
+        if minT is not None:
+            minT = float(minT)
+        if maxT is not None:
+            maxT = float(maxT)
+        
+        if maxT is None and pairedWav is not None:
+            maxT = _getWavDuration(pairedWav)
+        
+        # Prevent poorly-formed textgrids from being created
+        starts, ends = entryList.timeColumns
+        for i in range(len(entryList)):
+            if starts[i] >= ends[i]:
+                fmtStr = "Anomaly: startTime=%f, stopTime=%f, label=%s"
+                print((fmtStr % entryList[i]))
+            assert(starts[i] < ends[i])
+        
+        # Determine the minimum and maximum timestampes
+        minTimeList = [] if minT is None else [minT]
+        maxTimeList = [] if maxT is None else [maxT]
+        if len(entryList) > 0:
+            minTimeList.append(min(starts))
+            maxTimeList.append(max(ends))
+        
+        try:
+            minT = min(minTimeList)
+            maxT = max(maxTimeList)
+        except ValueError:
+            raise TimelessTextgridTierException()
+        
+        # Skip IntervalTier.__init__(), which builds a list of Intervals
+        super(IntervalTier, self).__init__(name, entryList, minT, maxT)
+    
+    def crop(self, cropStart, cropEnd, mode, rebaseToZero):
+        '''
+        Creates a new tier with all entries that fit inside the new interval
+        
+        See IntervalTier.crop().  The overlapping entries are found by
+        bisection.  Only the first and last of them can stick out of the
+        crop region, so the rest are copied straight from the columns.
+        '''
+        assert(mode in ['strict', 'lax', 'truncated'])
+        
+        cropStart = float(cropStart)
+        cropEnd = float(cropEnd)
+        starts, ends = self._entryList.timeColumns
+        startI = bisect.bisect_right(ends, cropStart)
+        endI = max(startI, bisect.bisect_left(starts, cropEnd))
+        newEntryList = self._entryList.getRange(startI, endI)
+        
+        # Go in reverse order, so deleting the last entry doesn't
+        # change the index of the first one
+        edgeIndices = set([0, len(newEntryList) - 1])
+        for i in sorted(edgeIndices, reverse=True):
+            if len(newEntryList) == 0:
+                break
+            matchedEntry = _cropInterval(newEntryList[i], cropStart,
+                                         cropEnd, mode)
+            if matchedEntry is None:
+                del newEntryList[i]
+            else:
+                newEntryList[i] = matchedEntry
+        
+        if rebaseToZero is True:
+            newEntryList.shiftTimes(-cropStart)
+            minT = 0.0
+            maxT = cropEnd - cropStart
+        else:
+            minT = cropStart
+            maxT = cropEnd
+        
+        # In 'lax' mode, the edge entries can stick out of the crop region
+        if len(newEntryList) > 0:
+            starts, ends = newEntryList.timeColumns
+            minT = min(minT, starts[0])
+            maxT = max(maxT, ends[-1])
+        
+        return ColumnarIntervalTier._fromOwnedList(self.name, newEntryList,
+                                                   minT, maxT, self.sampleRate)
+    
+    def editTimestamps(self, offset, allowOvershoot=False):
+        '''
+        Modifies all timestamps by a constant amount
+        
+        See IntervalTier.editTimestamps()
+        '''
+        newEntryList = self._copyEntryList(self._entryList)
+        newEntryList.shiftTimes(offset)
+        starts, ends = newEntryList.timeColumns
+        
+        if allowOvershoot is not True and len(newEntryList) > 0:
+            assert(min(starts) >= self.minTimestamp)
+            assert(max(ends) <= self.maxTimestamp)
+        
+        del newEntryList[:bisect.bisect_right(ends, 0)]
+        for i in range(len(starts)):
+            if starts[i] >= 0:
+                break
+            starts[i] = 0
+        
+        # Determine new min and max timestamps
+        newMin = min(self.minTimestamp, min(starts))
+        newMax = max(self.maxTimestamp, max(ends))
+        
+        return ColumnarIntervalTier._fromOwnedList(self.name, newEntryList,
+                                                   newMin, newMax,
+                                                   self.sampleRate)
+
+        
+class Textgrid():
+    
+    sampleRate = None
+    
+    def __init__(self, sampleRate=None):
+        '''
+        A container that stores and operates over interval and point tiers
+        
+        If sampleRate is not None, all times in the textgrid are sample
+        indices at that rate instead of seconds (see toSampleIndices()).
+        '''
+        self.tierNameList = []  # Preserves the order of the tiers
+        self.tierDict = {}
+    
+        self.minTimestamp = None
+        self.maxTimestamp = None
+        self.sampleRate = sampleRate
+    
+    def __eq__(self, other):
+        isEqual = True
+        isEqual &= self.sampleRate == other.sampleRate
+        isEqual &= _isclose(self.minTimestamp, other.minTimestamp)
+        isEqual &= _isclose(self.maxTimestamp, other.maxTimestamp)
+
+        isEqual &= self.tierNameList == other.tierNameList
+        if isEqual:
+            for tierName in self.tierNameList:
+                isEqual &= self.tierDict[tierName] == other.tierDict[tierName]
+        
+        return isEqual
+    
+    def addTier(self, tier, tierIndex=None):
+        
+        assert(tier.name not in list(self.tierDict.keys()))
+        
+        # Tiers in seconds and tiers in samples can't be mixed
+        # (see toSampleIndices() and toSeconds())
+        assert(getattr(tier, "sampleRate", None) == self.sampleRate)
+
+        if tierIndex is None:
+            self.tierNameList.append(tier.name)
+        else:
+            self.tierNameList.insert(tierIndex, tier.name)
+            
+        self.tierDict[tier.name] = tier
+        
+        minV = tier.minTimestamp
+        if self.minTimestamp is None or minV < self.minTimestamp:
+            self.minTimestamp = minV
+        
+        maxV = tier.maxTimestamp
         if self.maxTimestamp is None or maxV > self.maxTimestamp:
             self.maxTimestamp = maxV
     
@@ -1155,61 +1970,10 @@ class Textgrid():
         
         if onlyMatchingNames is False, tiers that don't appear in both
         textgrids will also appear
-        '''
-        retTG = Textgrid()
         
-        minTime = self.minTimestamp
-        maxTime = self.maxTimestamp + tg.maxTimestamp
-        
-        # Get all tier names.  Ordered first by this textgrid and
-        # then by the other textgrid.
-        combinedTierNameList = self.tierNameList
-        for tierName in tg.tierNameList:
-            if tierName not in combinedTierNameList:
-                combinedTierNameList.append(tierName)
-        
-        # Determine the tier names that will be in the final textgrid
-        finalTierNameList = []
-        if onlyMatchingNames is False:
-            finalTierNameList = combinedTierNameList
-        else:
-            for tierName in combinedTierNameList:
-                if tierName in self.tierNameList:
-                    if tierName in tg.tierNameList:
-                        finalTierNameList.append(tierName)
-        
-        # Add tiers from this textgrid
-        for tierName in self.tierNameList:
-            if tierName in finalTierNameList:
-                tier = self.tierDict[tierName]
-                retTG.addTier(tier)
-        
-        # Add tiers from the given textgrid
-        for tierName in tg.tierNameList:
-            if tierName in finalTierNameList:
-                appendTier = tg.tierDict[tierName]
-                appendTier = appendTier.new(minTimestamp=minTime,
-                                            maxTimestamp=maxTime)
-                
-                appendTier = appendTier.editTimestamps(self.maxTimestamp)
-                
-                if tierName in retTG.tierNameList:
-                    tier = retTG.tierDict[tierName]
-                    newEntryList = retTG.tierDict[tierName].entryList
-                    newEntryList += appendTier.entryList
-                    
-                    tier = tier.new(entryList=newEntryList,
-                                    minTimestamp=minTime,
-                                    maxTimestamp=maxTime)
-                    retTG.replaceTier(tierName, tier)
-                    
-                else:
-                    tier = appendTier
-                    tier = tier.new(minTimestamp=minTime,
-                                    maxTimestamp=maxTime)
-                    retTG.addTier(tier)
-        
-        return retTG
+        To join more than two textgrids, use concatenateTextgrids().
+        '''
+        return concatenateTextgrids([self, tg], onlyMatchingNames)
 
     def crop(self, cropStart, cropEnd, mode, rebaseToZero):
         '''
@@ -1228,7 +1992,7 @@ class Textgrid():
         
         assert(mode in ['strict', 'lax', 'truncated'])
         
-        newTG = Textgrid()
+        newTG = Textgrid(self.sampleRate)
         
         if rebaseToZero is True:
             minT = 0
@@ -1260,7 +2024,7 @@ class Textgrid():
         if doShrink is True:
             maxTimestamp -= diff
             
-        newTG = Textgrid()
+        newTG = Textgrid(self.sampleRate)
         for name in self.tierNameList:
             tier = self.tierDict[name]
             tier = tier.eraseRegion(start, stop, 'truncate', doShrink)
@@ -1275,10 +2039,10 @@ class Textgrid():
         Modifies all timestamps by a constant amount
         '''
         
-        tg = Textgrid()
+        tg = Textgrid(self.sampleRate)
         for tierName in self.tierNameList:
             tier = self.tierDict[tierName]
-            if len(tier.entryList) > 0:
+            if len(tier._entryList) > 0:
                 tier = tier.editTimestamps(offset, allowOvershoot)
             
             tg.addTier(tier)
@@ -1301,7 +2065,7 @@ class Textgrid():
         - None or any other value - AssertionError is thrown
         '''
         
-        newTG = Textgrid()
+        newTG = Textgrid(self.sampleRate)
         newTG.minTimestamp = 0
         newTG.maxTimestamp = self.maxTimestamp + duration
         
@@ -1318,43 +2082,53 @@ class Textgrid():
         Combine tiers
         
         /includeFunc/ regulates which intervals to include in the merging
-          with all others being tossed (default accepts all)
+          with all others being tossed (default accepts all).  It is called
+          with each entry and should return True to keep it.
           
         If /tierList/ is none, combine all tiers.
+        
+        All interval tiers are merged into one tier in a single pass, as
+        are all point tiers.  Overlapping intervals, and points at the same
+        time, are fused and their labels joined in order of time.
         '''
         
         if tierList is None:
             tierList = self.tierNameList
-            
-        if includeFunc is None:
-            includeFunc = lambda entryList: True
            
         # Determine the tiers to merge
-        intervalTierNameList = []
-        pointTierNameList = []
+        intervalTierList = []
+        pointTierList = []
         for tierName in tierList:
             tier = self.tierDict[tierName]
             if isinstance(tier, IntervalTier):
-                intervalTierNameList.append(tierName)
+                intervalTierList.append(tier)
             elif isinstance(tier, PointTier):
-                pointTierNameList.append(tierName)
+                pointTierList.append(tier)
         
         # Merge the interval tiers
         intervalTier = None
-        if len(intervalTierNameList) > 0:
-            intervalTier = self.tierDict[intervalTierNameList.pop(0)]
-        for tierName in intervalTierNameList:
-            intervalTier = intervalTier.union(self.tierDict[tierName])
+        if len(intervalTierList) > 0:
+            entryList = list(_fuseIntervals(
+                _mergeEntryLists(intervalTierList, includeFunc)))
+            intervalTier = IntervalTier._fromOwnedList(
+                intervalTierList[0].name, entryList,
+                min([tier.minTimestamp for tier in intervalTierList]),
+                max([tier.maxTimestamp for tier in intervalTierList]),
+                self.sampleRate)
 
         # Merge the point tiers
         pointTier = None
-        if len(pointTierNameList) > 0:
-            pointTier = self.tierDict[pointTierNameList.pop(0)]
-        for tierName in pointTierNameList:
-            pointTier = pointTier.merge(self.tierDict[tierName])
+        if len(pointTierList) > 0:
+            entryList = list(_fusePoints(
+                _mergeEntryLists(pointTierList, includeFunc)))
+            pointTier = PointTier._fromOwnedList(
+                pointTierList[0].name, entryList,
+                min([tier.minTimestamp for tier in pointTierList]),
+                max([tier.maxTimestamp for tier in pointTierList]),
+                self.sampleRate)
         
         # Create the final textgrid to output
-        tg = Textgrid()
+        tg = Textgrid(self.sampleRate)
         
         if intervalTier is not None:
             tg.addTier(intervalTier)
@@ -1365,14 +2139,30 @@ class Textgrid():
         return tg
 
     def new(self):
-        '''Returns a copy of this Textgrid'''
-        return copy.deepcopy(self)
+        '''
+        Returns a copy of this Textgrid
+        
+        The tiers of the copy share their entries with the tiers of this
+        textgrid until they are modified (see TextgridTier.entryList).
+        Tiers that haven't been parsed yet stay unparsed in both.
+        '''
+        tg = copy.copy(self)
+        tg.tierNameList = list(self.tierNameList)
+        tg.tierDict = type(self.tierDict)()
+        for name, tier in dict.items(self.tierDict):
+            if isinstance(tier, TextgridTier):
+                tier = tier.new()
+            elif not isinstance(tier, _UnparsedTier):
+                tier = copy.deepcopy(tier)
+            dict.__setitem__(tg.tierDict, name, tier)
+        
+        return tg
 
     def renameTier(self, oldName, newName):
         oldTier = self.tierDict[oldName]
         tierIndex = self.tierNameList.index(oldName)
         self.removeTier(oldName)
-        self.addTier(oldTier.new(newName, oldTier.entryList), tierIndex)
+        self.addTier(oldTier.new(newName), tierIndex)
     
     def removeTier(self, name):
         self.tierNameList.pop(self.tierNameList.index(name))
@@ -1383,240 +2173,1333 @@ class Textgrid():
         self.removeTier(name)
         self.addTier(newTier, tierIndex)
             
-    def save(self, fn, minimumIntervalLength=MIN_INTERVAL_LENGTH):
+    def save(self, fn, minimumIntervalLength=MIN_INTERVAL_LENGTH,
+             format="short"):
+        '''
+        Writes the textgrid to a file
+        
+        fn can be a file name or any open file-like object (e.g. a pipe or
+        a file in an archive).  The output is written in chunks as it
+        is generated, rather than built up in memory first.
+        
+        Gaps in interval tiers are saved as blank intervals.  Intervals
+        shorter than minimumIntervalLength are removed, unless it is
+        None.  The textgrid itself is not changed.  Times in samples
+        are saved in seconds.
+        
+        format = {'short', 'binary'}
+            If 'short', a short textgrid is written (a text file)
+            If 'binary', the textgrid is written in praat's binary format
+                ('ooBinaryFile'), which is smaller and faster to read.
+                fn must then accept bytes.
+        '''
+        
+        assert(format in ['short', 'binary'])
+        
+        # Times in samples are whole numbers, so there are no ultrashort
+        # intervals to remove
+        if self.sampleRate is not None:
+            self.toSeconds().save(fn, None, format)
+            return
+        
+        tierIter = self._iterTiersForSaving(minimumIntervalLength)
+        
+        if format == "binary":
+            if hasattr(fn, "write"):
+                _writeBytes(fn, self._iterAsBinary(tierIter))
+            else:
+                with io.open(fn, "wb") as fd:
+                    _writeBytes(fd, self._iterAsBinary(tierIter))
+        
+        elif hasattr(fn, "write"):
+            _writeText(fn, self._iterAsText(tierIter))
+        else:
+            with io.open(fn, "w", encoding="utf-8") as fd:
+                _writeText(fd, self._iterAsText(tierIter))
+    
+    def toSampleIndices(self, sampleRate):
+        '''
+        Returns a copy of the textgrid with times in samples, not seconds
+        
+        Each time is rounded to the index of the nearest sample at
+        sampleRate (e.g. the rate of the paired wav file).  Times are then
+        whole numbers, so they can be compared exactly and adding and
+        subtracting them can't leave behind ultrashort intervals.
+        Intervals that round to zero samples are dropped, as are points
+        that round to the same sample as an earlier point.
+        
+        All other methods of the copy take and return times in samples
+        (some return them as floats, but they stay whole numbers).  The
+        times are converted back to seconds when it is saved.  Each tier
+        of the copy has its sampleRate set too, and tiers in samples and
+        in seconds can't be added to the same textgrid.  Columnar tiers
+        keep their times in doubles, which hold sample indices exactly.
+        '''
+        assert(self.sampleRate is None)
+        
+        def toSampleIndex(time):
+            return int(round(time * sampleRate))
+        
+        return self._convertTimes(toSampleIndex, sampleRate)
+    
+    def toSeconds(self):
+        '''Returns a copy of a textgrid in samples with times in seconds'''
+        assert(self.sampleRate is not None)
+        
+        sampleRate = float(self.sampleRate)
         
-        for tier in self.tierDict.values():
-            tier.sort()
+        def toSeconds(sampleIndex):
+            return sampleIndex / sampleRate
         
-        # Fill in the blank spaces for interval tiers
+        return self._convertTimes(toSeconds, None)
+    
+    def _convertTimes(self, convertTime, sampleRate):
+        tg = Textgrid(sampleRate)
+        for name in self.tierNameList:
+            tg.addTier(_convertTierTimes(self.tierDict[name], convertTime,
+                                         sampleRate))
+        
+        tg.minTimestamp = convertTime(self.minTimestamp)
+        tg.maxTimestamp = convertTime(self.maxTimestamp)
+        
+        return tg
+    
+    def _iterTiersForSaving(self, minimumIntervalLength=None):
+        '''
+        Yields each tier in the form it is saved in
+        
+        Entries are sorted and the gaps in interval tiers are filled in
+        (see _normalizeIntervals()).  The tiers that are yielded are new
+        tiers; the ones in the textgrid are left as they are.  Each tier
+        is only prepared as it is reached, so only one extra tier is in
+        memory at a time.
+        '''
         for name in self.tierNameList:
             tier = self.tierDict[name]
+            entryList = tier._entryList
+            if not _isSorted(entryList):
+                entryList = sorted(entryList)
+            
             if isinstance(tier, IntervalTier):
+                entryList = _normalizeIntervals(entryList,
+                                                self.minTimestamp,
+                                                self.maxTimestamp,
+                                                minimumIntervalLength)
+                tier = IntervalTier._fromOwnedList(
+                    name, entryList,
+                    min(tier.minTimestamp, float(self.minTimestamp)),
+                    max(tier.maxTimestamp, float(self.maxTimestamp)))
+            elif entryList is not tier._entryList:
+                tier = PointTier._fromOwnedList(name, entryList,
+                                                tier.minTimestamp,
+                                                tier.maxTimestamp)
+            
+            yield tier
+    
+    def _iterAsText(self, tierIter=None):
+        '''
+        Yields the text of the textgrid header and then of each tier
+        
+        tierIter, if given, yields the tiers to write in place of the
+        textgrid's own tiers.
+        '''
+        if tierIter is None:
+            tierIter = (self.tierDict[name] for name in self.tierNameList)
+        
+        yield _getTextgridHeaderText(self.minTimestamp, self.maxTimestamp,
+                                     len(self.tierNameList))
+        
+        for tier in tierIter:
+            for text in tier._iterAsText():
+                yield text
+    
+    def _iterAsBinary(self, tierIter=None):
+        '''
+        Yields the textgrid header and then each tier in binary
+        
+        See _iterAsText() for tierIter.
+        '''
+        if tierIter is None:
+            tierIter = (self.tierDict[name] for name in self.tierNameList)
+        
+        yield (BINARY_HEADER + _packBinaryString(u"TextGrid", _UINT8) +
+               _TWO_DOUBLES.pack(self.minTimestamp, self.maxTimestamp) +
+               _UINT8.pack(1) + _INT32.pack(len(self.tierNameList)))
+        
+        for tier in tierIter:
+            for data in tier._iterAsBinary():
+                yield data
+
+
+def concatenateTextgrids(tgList, onlyMatchingNames=True):
+    '''
+    Joins textgrids end to end
+    
+    Each textgrid is shifted to start where the textgrids before it end
+    (by the sum of their maxTimestamps), as in Textgrid.appendTextgrid().
+    If onlyMatchingNames is True, only tiers that appear in every
+    textgrid are kept.  Otherwise, every tier is kept, in the order in
+    which they first appear.
+    
+    All of the offsets are worked out first and then each tier of the
+    new textgrid is built once, so the time taken is linear in the total
+    size of the textgrids.  To join textgrids that don't all fit in
+    memory, see concatenateTextgridsToFile().
+    '''
+    tgList = list(tgList)
+    assert(len(tgList) > 0)
+    
+    sampleRate = tgList[0].sampleRate
+    assert(all(tg.sampleRate == sampleRate for tg in tgList))
+    
+    offsetList = [0]
+    for tg in tgList[:-1]:
+        offsetList.append(offsetList[-1] + tg.maxTimestamp)
+    minT = tgList[0].minTimestamp
+    maxT = offsetList[-1] + tgList[-1].maxTimestamp
+    
+    tierNameList = _getConcatenatedTierNames([tg.tierNameList
+                                              for tg in tgList],
+                                             onlyMatchingNames)
+    
+    retTG = Textgrid(sampleRate)
+    for name in tierNameList:
+        tierClass = None
+        entryList = []
+        for tg, offset in zip(tgList, offsetList):
+            if name not in tg.tierNameList:
+                continue
+            
+            tier = tg.tierDict[name]
+            if tierClass is None:
+                tierClass = type(tier)
+            assert(tier.tierType == tierClass.tierType)
+            entryList.extend(_iterShiftedEntries(tier, offset))
+        
+        retTG.addTier(tierClass._fromOwnedList(name, entryList, minT, maxT,
+                                               sampleRate))
+    
+    retTG.minTimestamp = minT
+    retTG.maxTimestamp = maxT
+    
+    return retTG
+
+
+def concatenateTextgridsToFile(tgIter, fn, onlyMatchingNames=True,
+                               minimumIntervalLength=MIN_INTERVAL_LENGTH):
+    '''
+    Joins textgrids end to end, writing the result straight to a file
+    
+    The result is the same as concatenateTextgrids() followed by
+    Textgrid.save(), except that ultrashort intervals are only removed
+    within each textgrid, not across the joins.  tgIter can be any
+    iterable of textgrids (e.g. a generator that opens each file in
+    turn).  Only one of its textgrids is needed in memory at a time.
+    Each tier's entries are written to a temporary file as they arrive
+    and are copied into /fn/ at the end.
+    
+    fn can be a file name or any open file-like object, as in
+    Textgrid.save().
+    '''
+    spoolDict = {}
+    tierNameLists = []
+    minT = None
+    offset = 0
+    try:
+        for tg in tgIter:
+            if tg.sampleRate is not None:
+                tg = tg.toSeconds()
+            if minT is None:
+                minT = tg.minTimestamp
+            tierNameLists.append(list(tg.tierNameList))
+            
+            endTime = offset + tg.maxTimestamp
+            for name in tg.tierNameList:
+                tier = tg.tierDict[name]
+                if name not in spoolDict:
+                    spoolDict[name] = _TierSpool(tier.tierType, minT)
+                spool = spoolDict[name]
+                assert(spool.tierType == tier.tierType)
                 
-                tier = _fillInBlanks(tier,
-                                     "",
-                                     self.minTimestamp,
-                                     self.maxTimestamp)
-                if minimumIntervalLength is not None:
-                    tier = _removeUltrashortIntervals(tier,
-                                                      minimumIntervalLength)
-                self.tierDict[name] = tier
-        
-        for tier in self.tierDict.values():
-            tier.sort()
-        
-        # Header
-        outputTxt = ""
-        outputTxt += 'File type = "ooTextFile short"\n'
-        outputTxt += 'Object class = "TextGrid"\n\n'
-        outputTxt += "%s\n%s\n" % (repr(self.minTimestamp),
-                                   repr(self.maxTimestamp))
-        outputTxt += "<exists>\n%d\n" % len(self.tierNameList)
+                # The gap after the last interval is only filled in once
+                # the next interval (or the end) is reached, so that it
+                # can span several textgrids as a single blank interval
+                entryList = list(_iterShiftedEntries(tier, offset))
+                if len(entryList) == 0:
+                    continue
+                if tier.tierType == INTERVAL_TIER:
+                    entryList = _normalizeIntervals(entryList, spool.endTime,
+                                                    entryList[-1][1],
+                                                    minimumIntervalLength)
+                spool.write(entryList, entryList[-1][-2])
+            
+            offset = endTime
+        
+        assert(minT is not None)
+        maxT = offset
+        
+        tierNameList = _getConcatenatedTierNames(tierNameLists,
+                                                 onlyMatchingNames)
+        for name in tierNameList:
+            spool = spoolDict[name]
+            if spool.tierType == INTERVAL_TIER and spool.endTime < maxT:
+                spool.write(_normalizeIntervals([], spool.endTime, maxT),
+                            maxT)
+        
+        def iterText():
+            yield _getTextgridHeaderText(minT, maxT, len(tierNameList))
+            for name in tierNameList:
+                spool = spoolDict[name]
+                yield _getTierHeaderText(spool.tierType, name, minT, maxT,
+                                         spool.numEntries)
+                for text in spool.iterText():
+                    yield text
+        
+        if hasattr(fn, "write"):
+            _writeText(fn, iterText())
+        else:
+            with io.open(fn, "w", encoding="utf-8") as fd:
+                _writeText(fd, iterText())
+    
+    finally:
+        for spool in spoolDict.values():
+            spool.close()
+
+
+def _getConcatenatedTierNames(tierNameLists, onlyMatchingNames):
+    '''Returns the tier names, in order, for concatenateTextgrids()'''
+    tierNameList = []
+    for nameList in tierNameLists:
+        for name in nameList:
+            if name not in tierNameList:
+                tierNameList.append(name)
+    
+    if onlyMatchingNames is True:
+        tierNameList = [name for name in tierNameList
+                        if all(name in nameList
+                               for nameList in tierNameLists)]
+    
+    return tierNameList
+
+
+def _iterShiftedEntries(tier, offset):
+    '''Yields the entries of tier with /offset/ added to their times'''
+    if offset == 0:
+        for entry in tier._entryList:
+            yield entry
+    elif tier.tierType == INTERVAL_TIER:
+        for start, stop, label in tier._entryList:
+            yield Interval(start + offset, stop + offset, label)
+    else:
+        for time, label in tier._entryList:
+            yield Point(time + offset, label)
+
+
+class _TierSpool(object):
+    '''
+    The entries of one tier of a textgrid that is being written out
+    
+    The text of the entries is kept in a temporary file until the number
+    of entries, which goes in the tier header, is known.
+    '''
+    
+    def __init__(self, tierType, startTime):
+        self.tierType = tierType
+        self.endTime = startTime
+        self.numEntries = 0
+        self.fd = tempfile.TemporaryFile()
+    
+    def write(self, entryList, endTime):
+        _writeText(self.fd, _iterEntriesAsText(entryList))
+        self.numEntries += len(entryList)
+        self.endTime = endTime
+    
+    def iterText(self, bufferSize=2 ** 16):
+        self.fd.seek(0)
+        reader = codecs.getreader("utf-8")(self.fd)
+        return iter(lambda: reader.read(bufferSize), u"")
+    
+    def close(self):
+        self.fd.close()
+
+
+def _mergeEntryLists(tierList, includeFunc=None):
+    '''
+    Yields the entries of several tiers in sorted order
+    
+    The tiers are already sorted, so this is a k-way merge.  Entries with
+    the same times are yielded in the order of their tiers in tierList.
+    If includeFunc is not None, only the entries for which it returns True
+    are yielded.
+    '''
+    def decorate(entryList, tierIndex):
+        for entry in entryList:
+            if includeFunc is None or includeFunc(entry):
+                yield entry[:-1], tierIndex, entry
+    
+    decoratedIterList = [decorate(tier._entryList, i)
+                         for i, tier in enumerate(tierList)]
+    for _, _, entry in heapq.merge(*decoratedIterList):
+        yield entry
+
+
+def _fuseIntervals(entryIter):
+    '''
+    Fuses overlapping intervals in a stream of intervals sorted by start
+    
+    The labels of fused intervals are joined with '-'.
+    '''
+    labelList = []
+    for start, stop, label in entryIter:
+        if len(labelList) > 0 and start < groupStop:
+            groupStop = max(groupStop, stop)
+            labelList.append(label)
+            continue
         
-        for tierName in self.tierNameList:
-            outputTxt += self.tierDict[tierName].getAsText()
+        if len(labelList) > 0:
+            yield Interval(groupStart, groupStop, "-".join(labelList))
+        groupStart, groupStop, labelList = start, stop, [label]
+    
+    if len(labelList) > 0:
+        yield Interval(groupStart, groupStop, "-".join(labelList))
+
+
+def _fusePoints(entryIter):
+    '''
+    Fuses points at the same time in a stream of points sorted by time
+    
+    The labels of fused points are joined with '-'.
+    '''
+    for timestamp, group in itertools.groupby(entryIter,
+                                              key=lambda entry: entry[0]):
+        yield Point(timestamp, "-".join([entry[-1] for entry in group]))
+
+
+def _iterChunks(dataIter, bufferSize, emptyValue=u""):
+    '''Joins the text or bytes from /dataIter/ into /bufferSize/ chunks'''
+    buffer = []
+    bufferLength = 0
+    for data in dataIter:
+        buffer.append(data)
+        bufferLength += len(data)
+        if bufferLength >= bufferSize:
+            yield emptyValue.join(buffer)
+            buffer = []
+            bufferLength = 0
+    
+    yield emptyValue.join(buffer)
+
+
+def _getTextgridHeaderText(minT, maxT, numTiers):
+    '''Returns the header of a short textgrid'''
+    return (u'File type = "ooTextFile short"\n'
+            u'Object class = "TextGrid"\n\n'
+            u'%s\n%s\n<exists>\n%d\n' % (repr(minT), repr(maxT), numTiers))
+
+
+def _getTierHeaderText(tierType, name, minT, maxT, numEntries):
+    '''Returns the header of a tier in a short textgrid'''
+    return u'"%s"\n"%s"\n%s\n%s\n%d\n' % (tierType, name, repr(minT),
+                                          repr(maxT), numEntries)
+
+
+def _iterEntriesAsText(entryList):
+    '''Yields the text of each entry of a tier in a short textgrid'''
+    for entry in entryList:
+        label = entry[-1].replace('"', '""')
+        timeText = u"\n".join([repr(val) for val in entry[:-1]])
+        yield u'%s\n"%s"\n' % (timeText, label)
+
+
+def _writeText(fd, textIter, bufferSize=2 ** 16):
+    '''
+    Writes the text from /textIter/ to /fd/ in chunks of about /bufferSize/
+    
+    fd can be any file-like object.  If it only accepts bytes (e.g. a file
+    opened in binary mode or a pipe), the text is encoded as utf-8.
+    '''
+    doEncode = isinstance(fd, (io.RawIOBase, io.BufferedIOBase))
+    for chunk in _iterChunks(textIter, bufferSize):
+        if doEncode is False:
+            try:
+                fd.write(chunk)
+                continue
+            except TypeError:
+                doEncode = True
         
-        with io.open(fn, "w", encoding="utf-8") as fd:
-            fd.write(outputTxt)
+        fd.write(chunk.encode("utf-8"))
+
+
+def _writeBytes(fd, byteIter, bufferSize=2 ** 16):
+    '''Writes the bytes from /byteIter/ to /fd/ in /bufferSize/ chunks'''
+    for chunk in _iterChunks(byteIter, bufferSize, b""):
+        fd.write(chunk)
+
+
+def _countSurrogatePairs(utf16Data):
+    '''Counts the characters in big-endian utf-16 that use two code units'''
+    return len([byte for byte in bytearray(utf16Data[::2])
+                if 0xD8 <= byte <= 0xDB])
 
 
-def openTextgrid(fnFullPath):
+def _packBinaryString(text, lengthStruct=_UINT16):
+    '''
+    Packs a string the way praat does in binary files
     
+    The string is prefixed by its length.  ASCII strings follow as one
+    byte per character.  For other strings, the length is first set to
+    its maximum value as an escape code; the real length (in characters)
+    then follows, and finally the string in big-endian utf-16.
+    '''
     try:
-        with io.open(fnFullPath, "r", encoding="utf-16") as fd:
-            data = fd.read()
+        encodedText = text.encode("ascii")
     except UnicodeError:
-        with io.open(fnFullPath, "r", encoding="utf-8") as fd:
-            data = fd.read()
-    data = data.replace("\r\n", "\n")
-    
-    caseA = "ooTextFile short" in data
-    caseB = "item [" not in data
-    if caseA or caseB:
-        textgrid = _parseShortTextgrid(data)
+        pass
     else:
-        textgrid = _parseNormalTextgrid(data)
+        return lengthStruct.pack(len(encodedText)) + encodedText
     
-    return textgrid
+    encodedText = text.encode("utf-16-be")
+    length = len(encodedText) // 2 - _countSurrogatePairs(encodedText)
+    escapeCode = 2 ** (8 * lengthStruct.size) - 1
+    
+    return (lengthStruct.pack(escapeCode) + lengthStruct.pack(length) +
+            encodedText)
 
 
-def _parseNormalTextgrid(data):
+def _readBinaryString(data, i, lengthStruct=_UINT16):
     '''
-    Reads a normal textgrid
+    Reads a string from a praat binary file at index /i/
+    
+    Returns the string and the index just past it.  See _packBinaryString()
+    for the format.  Raises a ValueError if the string runs past the end of
+    data.
     '''
-    newTG = Textgrid()
+    length = lengthStruct.unpack_from(data, i)[0]
+    i += lengthStruct.size
+    if length != 2 ** (8 * lengthStruct.size) - 1:
+        if i + length > len(data):
+            raise ValueError("Unexpected end of textgrid data")
+        return data[i:i + length].decode("latin-1"), i + length
+    
+    length = lengthStruct.unpack_from(data, i)[0]
+    i += lengthStruct.size
+    
+    # Characters outside the BMP take up two code units but are only
+    # counted once in the length
+    end = i + 2 * length
+    numPairs = _countSurrogatePairs(data[i:end])
+    while numPairs > 0:
+        newEnd = end + 2 * numPairs
+        numPairs = _countSurrogatePairs(data[end:newEnd])
+        end = newEnd
+    
+    if end > len(data):
+        raise ValueError("Unexpected end of textgrid data")
     
-    # Toss textgrid header
-    header, data = data.split("item [", 1)
+    return data[i:end].decode("utf-16-be"), end
+
+
+def openTextgrid(fnFullPath, tierNames=None, lazy=False, columnar=False,
+                 cache=None, sampleRate=None):
+    '''
+    Opens a short, normal, or binary textgrid
+    
+    tierNames: if not None, only tiers with names in this list are loaded.
+               The other tiers are skipped over without being parsed.
+    lazy: if True, each tier is only parsed the first time it is accessed
+          (e.g. via tg.tierDict[tierName]).  Useful when only a few tiers
+          in a large textgrid are needed.  The unparsed tiers keep a copy
+          of their part of the file, so the file can be changed
+          afterwards.
+    columnar: if True, tiers are loaded as ColumnarIntervalTiers and
+              ColumnarPointTiers, which use much less memory.
+    cache: a TextgridCache.  If given, the textgrid is loaded from the
+           cache if it is there and is parsed and added to it otherwise.
+    sampleRate: if not None, times are loaded as sample indices at this
+                rate rather than in seconds (see
+                Textgrid.toSampleIndices()).  Every tier is parsed
+                straight away, even if lazy is True.
+    
+    The file is memory-mapped rather than read into memory.  Its encoding
+    is determined from its first few bytes (praat writes utf-16 with a
+    byte order mark; other files are taken to be utf-8).
+    '''
     
-    headerList = header.split("\n")
-    tgMin = float(headerList[3].split("=")[1].strip())
-    tgMax = float(headerList[4].split("=")[1].strip())
+    if sampleRate is not None:
+        tg = openTextgrid(fnFullPath, tierNames, lazy, columnar, cache)
+        return tg.toSampleIndices(sampleRate)
     
-    newTG.minTimestamp = tgMin
-    newTG.maxTimestamp = tgMax
+    if cache is not None:
+        return cache.openTextgrid(fnFullPath, tierNames, lazy, columnar)
+    
+    fileData = utils.mapFile(fnFullPath)
+    try:
+        if fileData[:len(BINARY_HEADER)] == BINARY_HEADER:
+            return _parseBinaryTextgrid(fileData, tierNames, lazy,
+                                        columnar)
+        
+        # utf-8 files are parsed straight from the memory map
+        encoding, bomLength = utils.sniffEncoding(fileData[:4])
+        if encoding == "utf-8":
+            return _parseTextgrid(fileData, tierNames, lazy, columnar)
+        
+        data = fileData[bomLength:].decode(encoding)
+        return _parseTextgrid(data, tierNames, lazy, columnar)
+    
+    finally:
+        if hasattr(fileData, "close"):
+            fileData.close()
+
+
+def openTextgrids(fnList, workers=None, tierNames=None, columnar=False,
+                  ordered=True):
+    '''
+    Opens many textgrids in parallel, yielding them as they are loaded
+    
+    Yields a tuple (fnFullPath, tg, error) for each file in fnList.  If a
+    file can't be opened, tg is None and error is the exception raised
+    while opening it; otherwise error is None.  One bad file doesn't stop
+    the others from loading.
+    
+    workers: the number of processes to open the files in (by default,
+             one per cpu).  If 1, the files are opened one by one in this
+             process.
+    ordered: if True, the textgrids are yielded in the order of fnList.
+             If False, each is yielded as soon as it has been loaded.
+    tierNames, columnar: as in openTextgrid()
+    
+    Each worker process sends its textgrid back as columns (see
+    ColumnarIntervalTier), which are much smaller than pickled lists of
+    entries and quick to turn back into tiers.
+    '''
+    argsIter = ((fnFullPath, tierNames) for fnFullPath in fnList)
+    
+    if workers == 1:
+        for fnFullPath, tierNames in argsIter:
+            try:
+                tg = openTextgrid(fnFullPath, tierNames, columnar=columnar)
+            except Exception as e:
+                yield fnFullPath, None, e
+            else:
+                yield fnFullPath, tg, None
+        return
+    
+    pool = multiprocessing.Pool(workers)
+    try:
+        mapFunc = pool.imap if ordered is True else pool.imap_unordered
+        for fnFullPath, data, error in mapFunc(_openTextgridAsColumns,
+                                               argsIter, chunksize=8):
+            if error is not None:
+                yield fnFullPath, None, error
+            else:
+                yield fnFullPath, _textgridFromColumns(data, columnar), None
+        pool.close()
+    finally:
+        # Also stops the workers if the caller stops iterating early
+        pool.terminate()
+        pool.join()
+
+
+class TextgridCache(object):
+    '''
+    An on-disk cache of parsed textgrids
+    
+    Textgrids are stored in praat's binary format, which is much faster
+    to read than a text textgrid.  A cached textgrid is found by its
+    path and by its size and modification time or, if hashContents is
+    True, by a hash of its contents.  So a changed file is parsed again
+    rather than read from the cache.
+    
+    Once the cache takes up more than maxSize bytes, the least recently
+    used textgrids are removed from it until it is down to three quarters
+    of maxSize.  The size of the cache is kept as a running total, so the
+    cache files are only listed and looked at when some need removing.
+    (Textgrids stored by other processes are only counted then, too.)
+    invalidate() and clear() remove textgrids explicitly.  A cached
+    textgrid that can't be read (e.g. because it was damaged) is removed
+    and the textgrid is parsed again.
+    
+    e.g.
+    cache = tgio.TextgridCache("/tmp/textgrid_cache")
+    tg = tgio.openTextgrid(fn, cache=cache)
+    '''
     
-    # Process each tier individually (will be output to separate folders)
-    tierList = data.split("item [")[1:]
-    for tierTxt in tierList:
+    def __init__(self, cachePath, maxSize=256 * 1024 * 1024,
+                 hashContents=False):
+        if not os.path.exists(cachePath):
+            os.makedirs(cachePath)
+        
+        self.cachePath = cachePath
+        self.maxSize = maxSize
+        self.hashContents = hashContents
+        self._cacheSize = None  # Counted the first time a textgrid is stored
+    
+    def _getPathKey(self, fnFullPath):
+        '''Returns the part of a cache file's name that names its source'''
+        fnFullPath = os.path.abspath(fnFullPath)
+        return hashlib.sha1(fnFullPath.encode("utf-8")).hexdigest()
+    
+    def _getCacheFN(self, fnFullPath):
+        '''Returns the cache file for the current version of a textgrid'''
+        if self.hashContents is True:
+            versionHash = hashlib.sha1()
+            with io.open(fnFullPath, "rb") as fd:
+                for chunk in iter(lambda: fd.read(2 ** 16), b""):
+                    versionHash.update(chunk)
+        else:
+            stat = os.stat(fnFullPath)
+            version = "%d %s" % (stat.st_size, repr(stat.st_mtime))
+            versionHash = hashlib.sha1(version.encode("utf-8"))
+        
+        name = "%s-%s.TextGrid" % (self._getPathKey(fnFullPath),
+                                   versionHash.hexdigest())
+        return os.path.join(self.cachePath, name)
+    
+    def _listCacheFNs(self, pathKey=None):
+        '''Lists the cache files, or only those for one source file'''
+        prefix = "" if pathKey is None else pathKey + "-"
+        return [os.path.join(self.cachePath, name)
+                for name in os.listdir(self.cachePath)
+                if name.startswith(prefix) and name.endswith(".TextGrid")]
+    
+    def openTextgrid(self, fnFullPath, tierNames=None, lazy=False,
+                     columnar=False):
+        '''
+        Opens a textgrid, from the cache if possible
         
-        hasData = True
+        See openTextgrid() for a description of the arguments
+        '''
+        cacheFN = self._getCacheFN(fnFullPath)
         
-        if 'class = "IntervalTier"' in tierTxt:
-            tierType = INTERVAL_TIER
-            searchWord = "intervals ["
+        # Another process may remove the file at any time
+        try:
+            tg = openTextgrid(cacheFN, tierNames, lazy, columnar)
+            os.utime(cacheFN, None)  # Mark it as recently used
+        except EnvironmentError:
+            pass
+        except (ValueError, IndexError, struct.error):
+            # A damaged cache file is dropped and the textgrid parsed again.
+            # Its size may have changed since it was counted, so the cache
+            # is counted again when the textgrid is stored.
+            self._remove(cacheFN)
+            self._cacheSize = None
         else:
-            tierType = POINT_TIER
-            searchWord = "points ["
+            return tg
+        
+        tg = openTextgrid(fnFullPath)
+        self._store(tg, fnFullPath, cacheFN)
+        
+        if tierNames is None and columnar is False:
+            return tg
+        return _selectTiers(tg, tierNames, columnar)
+    
+    def _store(self, tg, fnFullPath, cacheFN):
+        '''Adds a textgrid to the cache, replacing any older versions'''
+        self.invalidate(fnFullPath)
         
-        # Get tier meta-information
+        # Write to a temporary file first, so other processes never see
+        # a half-written textgrid
+        fd, tmpFN = tempfile.mkstemp(".tmp", dir=self.cachePath)
         try:
-            header, tierData = tierTxt.split(searchWord, 1)
-        except ValueError:
-            # A tier with no entries
-            if "size = 0" in tierTxt:
-                header = tierTxt
-                tierData = ""
-                hadData = False
-            else:
-                raise
-        tierName = header.split("name = ")[1].split("\n", 1)[0]
-        tierStart = header.split("xmin = ")[1].split("\n", 1)[0]
-        tierStart = strToIntOrFloat(tierStart)
-        tierEnd = header.split("xmax = ")[1].split("\n", 1)[0]
-        tierEnd = strToIntOrFloat(tierEnd)
-        tierName = tierName.strip()[1:-1]
-        
-        
-        # Get the tier entry list
-        tierEntryList = []
-        labelI = 0
-        if tierType == INTERVAL_TIER:
-            while True:
-                try:
-                    timeStart, timeStartI = _fetchRow(tierData,
-                                                      "xmin = ", labelI)
-                    timeEnd, timeEndI = _fetchRow(tierData,
-                                                  "xmax = ", timeStartI)
-                    label, labelI = _fetchRow(tierData, "text =", timeEndI)
-                except (ValueError, IndexError):
-                    break
-                
-                label = label.strip()
-                if label == "":
-                    continue
-                tierEntryList.append((timeStart, timeEnd, label))
-            tier = IntervalTier(tierName, tierEntryList, tierStart, tierEnd)
+            with os.fdopen(fd, "wb") as cacheFD:
+                _writeBytes(cacheFD, tg._iterAsBinary())
+                size = cacheFD.tell()
+        except BaseException:
+            self._remove(tmpFN)
+            raise
+        try:
+            os.rename(tmpFN, cacheFN)
+        except OSError:  # On windows, if another process just stored it
+            self._remove(tmpFN)
+        
+        if self._cacheSize is None:
+            self._cacheSize = sum([size for _, size, _ in self._statCache()])
         else:
-            while True:
-                try:
-                    time, timeI = _fetchRow(tierData, "number = ", labelI)
-                    label, labelI = _fetchRow(tierData, "mark =", timeI)
-                except (ValueError, IndexError):
-                    break
-                
-                label = label.strip()
-                if label == "":
-                    continue
-                tierEntryList.append((time, label))
-            tier = PointTier(tierName, tierEntryList, tierStart, tierEnd)
+            self._cacheSize += size
         
-        newTG.addTier(tier)
+        if self._cacheSize > self.maxSize:
+            self._evict()
+    
+    def _statCache(self):
+        '''Returns (mtime, size, cacheFN) for each file in the cache'''
+        statList = []
+        for cacheFN in self._listCacheFNs():
+            try:
+                stat = os.stat(cacheFN)
+            except OSError:
+                continue
+            statList.append((stat.st_mtime, stat.st_size, cacheFN))
+        
+        return statList
+    
+    def _evict(self):
+        '''Removes the least recently used textgrids'''
+        statList = self._statCache()
+        totalSize = sum([size for _, size, _ in statList])
         
+        # Going well under maxSize means the next few stores won't
+        # have to evict again
+        for _, size, cacheFN in sorted(statList):
+            if totalSize <= self.maxSize * 3 // 4:
+                break
+            self._remove(cacheFN)
+            totalSize -= size
+        
+        self._cacheSize = totalSize
+    
+    def _remove(self, cacheFN):
+        '''Removes a cache file and returns its size (0 if it was gone)'''
+        try:
+            size = os.path.getsize(cacheFN)
+            os.remove(cacheFN)
+        except OSError:
+            return 0  # Already removed by another process
+        
+        return size
+    
+    def invalidate(self, fnFullPath):
+        '''Removes every cached version of a textgrid'''
+        for cacheFN in self._listCacheFNs(self._getPathKey(fnFullPath)):
+            size = self._remove(cacheFN)
+            if self._cacheSize is not None:
+                self._cacheSize -= size
+    
+    def clear(self):
+        '''Removes every textgrid from the cache'''
+        for cacheFN in self._listCacheFNs():
+            self._remove(cacheFN)
+        self._cacheSize = 0
+
+
+def _selectTiers(tg, tierNames=None, columnar=False):
+    '''
+    Returns a textgrid with some of the tiers of tg
+    
+    The tiers are picked and stored as with openTextgrid()'s tierNames
+    and columnar arguments.  Tiers that are kept as they are are shared
+    with tg.
+    '''
+    newTG = Textgrid()
+    for name in tg.tierNameList:
+        if tierNames is not None and name not in tierNames:
+            continue
+        
+        tier = tg.tierDict[name]
+        if columnar is True:
+            entryList = _newEntryList(tier.tierType, columnar)
+            entryList.extend(tier._entryList)
+            tier = _newTier(tier.tierType, name, entryList,
+                            tier.minTimestamp, tier.maxTimestamp)
+        newTG.addTier(tier)
+    
+    newTG.minTimestamp = tg.minTimestamp
+    newTG.maxTimestamp = tg.maxTimestamp
+    
     return newTG
 
 
-def _parseShortTextgrid(data):
+def _openTextgridAsColumns(args):
     '''
-    Reads a short textgrid file
+    Opens a textgrid in a worker process of openTextgrids()
+    
+    Returns (fnFullPath, data, error).  data holds the textgrid's times
+    and a list with the header and the columns of each tier, to be read
+    by _textgridFromColumns().  Exceptions that can't be sent back to
+    the main process as they are are replaced by an Exception with the
+    same message.
     '''
+    fnFullPath, tierNames = args
+    try:
+        tg = openTextgrid(fnFullPath, tierNames, columnar=True)
+        tierDataList = []
+        for name in tg.tierNameList:
+            tier = tg.tierDict[name]
+            columns = tier._entryList
+            tierDataList.append((tier.tierType, name, tier.minTimestamp,
+                                 tier.maxTimestamp, columns.timeColumns,
+                                 columns.labelCodes, columns.labelTable))
+        data = (tg.minTimestamp, tg.maxTimestamp, tierDataList)
+    except Exception as e:
+        try:
+            pickle.loads(pickle.dumps(e))
+        except Exception:
+            e = Exception("%s: %s" % (type(e).__name__, str(e)))
+        return fnFullPath, None, e
+    
+    return fnFullPath, data, None
+
+
+def _textgridFromColumns(data, columnar=False):
+    '''Builds a textgrid from the data made by _openTextgridAsColumns()'''
     newTG = Textgrid()
+    newTG.minTimestamp, newTG.maxTimestamp, tierDataList = data
     
-    intervalIndicies = [(i, True)
-                        for i in utils.findAll(data, '"IntervalTier"')]
-    pointIndicies = [(i, False) for i in utils.findAll(data, '"TextTier"')]
+    for tierData in tierDataList:
+        tierType, name, tierStart, tierEnd = tierData[:4]
+        timeColumns, labelCodes, labelTable = tierData[4:]
+        entryType = Interval if tierType == INTERVAL_TIER else Point
+        
+        if columnar is True:
+            entryList = _ColumnarEntryList(entryType, timeColumns,
+                                           labelCodes, labelTable)
+        else:
+            labelList = [labelTable[code] for code in labelCodes]
+            entryList = list(map(entryType, *(timeColumns + [labelList])))
+        
+        newTG.addTier(_newTier(tierType, name, entryList, tierStart, tierEnd))
     
-    indexList = intervalIndicies + pointIndicies
-    indexList.append((len(data), None))  # The 'end' of the file
-    indexList.sort()
+    return newTG
+
+
+class _UnparsedTier(object):
+    '''
+    A placeholder for a tier that has been located but not yet parsed
     
-    tupleList = [(indexList[i][0], indexList[i + 1][0], indexList[i][1])
-                 for i in range(len(indexList) - 1)]
+    dataIndex is the position of the tier's first entry in data.
+    '''
     
-    # Set the textgrid's min and max times
-    header = data[:tupleList[0][0]]
-    headerList = header.split("\n")
-    tgMin = float(headerList[3].strip())
-    tgMax = float(headerList[4].strip())
+    def __init__(self, data, dataIndex, tierType, name, minT, maxT,
+                 numEntries, columnar=False):
+        self.data = data
+        self.dataIndex = dataIndex
+        self.tierType = tierType
+        self.name = name
+        self.minTimestamp = minT
+        self.maxTimestamp = maxT
+        self.numEntries = numEntries
+        self.columnar = columnar
+    
+    def __repr__(self):
+        return "<unparsed %s %s>" % (self.tierType, self.name)
     
-    newTG.minTimestamp = tgMin
-    newTG.maxTimestamp = tgMax
+    def detach(self, endIndex):
+        '''
+        Keeps a copy of only this tier's part of data, up to endIndex
+        
+        After this, the file that data was read from can be closed,
+        changed, or removed without affecting the tier.
+        '''
+        self.data = self.data[self.dataIndex:endIndex]
+        self.dataIndex = 0
+    
+    def parse(self):
+        tokens = _tokenize(self.data, self.dataIndex)
+        return _parseTierEntries(tokens, self.tierType, self.name,
+                                 self.minTimestamp, self.maxTimestamp,
+                                 self.numEntries, self.columnar)
+
 
-    # Load the data for each tier
-    for blockStartI, blockEndI, isInterval in tupleList:
-        tierData = data[blockStartI:blockEndI]
+class _UnparsedBinaryTier(_UnparsedTier):
+    '''A placeholder for a tier in a binary textgrid'''
+    
+    def parse(self):
+        return _readBinaryTier(self.data, self.dataIndex, self.tierType,
+                               self.name, self.minTimestamp,
+                               self.maxTimestamp, self.numEntries,
+                               self.columnar)[0]
+
+
+class _LazyTierDict(dict):
+    '''
+    A tierDict that parses each tier the first time it is accessed
+    
+    Until then, the tier is stored as an _UnparsedTier.
+    '''
+    
+    def __getitem__(self, name):
+        tier = dict.__getitem__(self, name)
+        if isinstance(tier, _UnparsedTier):
+            tier = tier.parse()
+            dict.__setitem__(self, name, tier)
         
-        # First row contains the tier type, which we already know
-        metaStartI = _fetchRow(tierData, '', 0)[1]
+        return tier
+    
+    def get(self, name, default=None):
+        if name not in self:
+            return default
+        return self[name]
+    
+    def pop(self, name, *args):
+        if name in self:
+            self[name]  # Parse the tier before handing it out
+        return dict.pop(self, name, *args)
+    
+    def popitem(self):
+        name = next(iter(self))
+        return name, self.pop(name)
+    
+    def values(self):
+        return [self[name] for name in self]
+    
+    def items(self):
+        return [(name, self[name]) for name in self]
+    
+    def copy(self):
+        return dict(self.items())
+
+
+def _getTokenRegexes(data):
+    '''
+    Returns the token and skip regexes for data and whether it is bytes
+    
+    data is either text or the raw bytes (e.g. a memory map) of a utf-8 file
+    '''
+    if isinstance(data, type(u"")):
+        return _TOKEN_RE, _SKIP_RE, False
+    
+    return _BYTES_TOKEN_RE, _BYTES_SKIP_RE, True
+
+
+def _tokenize(data, index=0):
+    '''
+    Yields, in order, each value stored in a praat text file
+    
+    Both short and long (normal) textgrids store the same sequence of
+    values--numbers, quoted strings, and flags such as <exists>.  The long
+    form decorates them with keys (e.g. 'xmin = ') and indices
+    (e.g. 'intervals [3]:') which are skipped here.  Quoted strings are
+    returned without their quotes, with doubled quotes ("") unescaped, and
+    with windows line endings converted to '\\n'.
+    
+    data can be text or the bytes of a utf-8 file; tokens are always text.
+    The data is scanned exactly once, starting at /index/.  Asking for a
+    token past the end of the data raises a ValueError, as _nextToken()
+    does, rather than StopIteration.
+    '''
+    tokenRE, isBytes = _getTokenRegexes(data)[::2]
+    
+    # The body of _getToken(), inlined for speed
+    for match in tokenRE.finditer(data, index):
+        groupI = match.lastindex
+        if groupI is None:  # An index in square brackets
+            continue
         
-        # Tier meta-information
-        tierName, tierNameEndI = _fetchRow(tierData, '', metaStartI)
-        tierStartTime, tierStartTimeI = _fetchRow(tierData, '', tierNameEndI)
-        tierEndTime, tierEndTimeI = _fetchRow(tierData, '', tierStartTimeI)
-        startTimeI = _fetchRow(tierData, '', tierEndTimeI)[1]
+        token = match.group(groupI)
+        if isBytes:
+            token = token.decode("utf-8")
+        if groupI == 1:
+            if '""' in token:
+                token = token.replace('""', '"')
+            if "\r" in token:
+                token = token.replace("\r\n", "\n")
         
-        tierStartTime = strToIntOrFloat(tierStartTime)
-        tierEndTime = strToIntOrFloat(tierEndTime)
+        yield token
+    
+    raise ValueError("Unexpected end of textgrid data")
+
+
+def _getToken(match, isBytes):
+    '''Returns the token in a match of the token regex (see _tokenize())'''
+    token = match.group(match.lastindex)
+    if isBytes:
+        token = token.decode("utf-8")
+    if match.lastindex == 1:
+        token = token.replace('""', '"').replace("\r\n", "\n")
+    
+    return token
+
+
+def _nextToken(data, index):
+    '''
+    Returns the next token after /index/ and the index just past it
+    '''
+    tokenRE, isBytes = _getTokenRegexes(data)[::2]
+    
+    for match in tokenRE.finditer(data, index):
+        if match.lastindex is not None:
+            return _getToken(match, isBytes), match.end()
+    
+    raise ValueError("Unexpected end of textgrid data")
+
+
+def _skipTokens(data, index, numTokens):
+    '''
+    Returns the index just past the next /numTokens/ tokens
+    
+    The tokens are only located--none of them are converted or copied.
+    '''
+    tokenRE, skipRE = _getTokenRegexes(data)[:2]
+    
+    while numTokens >= _SKIP_CHUNK_SIZE:
+        match = skipRE.match(data, index)
+        if match is None:  # Unexpected decoration; go one token at a time
+            break
+        index = match.end()
+        numTokens -= _SKIP_CHUNK_SIZE
+    
+    if numTokens == 0:
+        return index
+    
+    for match in tokenRE.finditer(data, index):
+        if match.lastindex is not None:
+            numTokens -= 1
+            if numTokens == 0:
+                return match.end()
+    
+    raise ValueError("Unexpected end of textgrid data")
+
+
+def _newEntryList(tierType, columnar=False):
+    '''Returns an empty entry list to parse a tier into'''
+    if columnar is False:
+        return []
+    
+    entryType = Interval if tierType == INTERVAL_TIER else Point
+    return _ColumnarEntryList(entryType)
+
+
+def _newTier(tierType, tierName, entryList, tierStart, tierEnd):
+    '''Builds a tier of the right class for a parsed entry list'''
+    columnar = isinstance(entryList, _ColumnarEntryList)
+    if tierType == INTERVAL_TIER:
+        tierClass = ColumnarIntervalTier if columnar else IntervalTier
+    else:
+        tierClass = ColumnarPointTier if columnar else PointTier
+    
+    # Praat writes the entries in order, but other programs may not.
+    # Their tiers go through the constructor, which sorts the entries.
+    if columnar:
+        isSorted = _isSorted(entryList.timeColumns[0])
+    else:
+        isSorted = _isSorted(entryList)
+    if not isSorted:
+        return tierClass(tierName, list(entryList), float(tierStart),
+                         float(tierEnd))
+    
+    return tierClass._fromOwnedList(tierName, entryList, float(tierStart),
+                                    float(tierEnd))
+
+
+def _parseTierEntries(tokens, tierType, tierName, tierStart, tierEnd,
+                      numEntries, columnar=False):
+    '''
+    Builds a tier from the next /numEntries/ entries in /tokens/
+    '''
+    entryList = _newEntryList(tierType, columnar)
+    if tierType == INTERVAL_TIER:
+        for _ in range(numEntries):
+            start = next(tokens)
+            end = next(tokens)
+            label = next(tokens).strip()
+            if label == "":
+                continue
+            entryList.append(Interval(float(start), float(end), label))
+    else:
+        for _ in range(numEntries):
+            time = next(tokens)
+            label = next(tokens).strip()
+            if label == "":
+                continue
+            entryList.append(Point(float(time), label))
+    
+    return _newTier(tierType, tierName, entryList, tierStart, tierEnd)
+
+
+def _parseTextgrid(data, tierNames=None, lazy=False, columnar=False):
+    '''
+    Reads a short or normal textgrid
+    
+    See openTextgrid() for a description of tierNames, lazy, and columnar
+    '''
+    if tierNames is not None or lazy is True:
+        return _indexTextgrid(data, tierNames, lazy, columnar)
+    
+    newTG = Textgrid()
+    tokens = _tokenize(data)
+    
+    # Header -- the file type and object class are not needed
+    next(tokens)
+    next(tokens)
+    newTG.minTimestamp = float(next(tokens))
+    newTG.maxTimestamp = float(next(tokens))
+    
+    # A textgrid without any tiers
+    if next(tokens) != "exists":
+        return newTG
+    
+    numTiers = int(next(tokens))
+    for _ in range(numTiers):
+        tierType = next(tokens)
+        tierName = next(tokens).strip()
+        tierStart = strToIntOrFloat(next(tokens))
+        tierEnd = strToIntOrFloat(next(tokens))
+        numEntries = int(next(tokens))
         
-        # Tier entry data
-        entryList = []
-        if isInterval:
-            while True:
-                try:
-                    startTime, endTimeI = _fetchRow(tierData, '', startTimeI)
-                    endTime, labelI = _fetchRow(tierData, '', endTimeI)
-                    label, startTimeI = _fetchRow(tierData, '', labelI)
-                except (ValueError, IndexError):
-                    break
-                
-                label = label.strip()
-                if label == "":
-                    continue
-                entryList.append((startTime, endTime, label))
-                
-            newTG.addTier(IntervalTier(tierName, entryList,
-                                       tierStartTime, tierEndTime))
-            
-        else:
-            while True:
-                try:
-                    time, labelI = _fetchRow(tierData, '', startTimeI)
-                    label, startTimeI = _fetchRow(tierData, '', labelI)
-                except (ValueError, IndexError):
-                    break
-                label = label.strip()
-                if label == "":
-                    continue
-                entryList.append((time, label))
-                
-            newTG.addTier(PointTier(tierName, entryList,
-                                    tierStartTime, tierEndTime))
+        newTG.addTier(_parseTierEntries(tokens, tierType, tierName,
+                                        tierStart, tierEnd, numEntries,
+                                        columnar))
+    
+    return newTG
 
+
+def _indexTextgrid(data, tierNames=None, lazy=False, columnar=False):
+    '''
+    Reads a textgrid, locating each tier but only parsing those requested
+    
+    If lazy is True, no tier is parsed here; each is parsed when first
+    accessed through the textgrid's tierDict.
+    '''
+    newTG = Textgrid()
+    if lazy is True:
+        newTG.tierDict = _LazyTierDict()
+    
+    # Header -- the file type and object class are not needed
+    i = _skipTokens(data, 0, 2)
+    tgMin, i = _nextToken(data, i)
+    tgMax, i = _nextToken(data, i)
+    newTG.minTimestamp = float(tgMin)
+    newTG.maxTimestamp = float(tgMax)
+    
+    # A textgrid without any tiers
+    exists, i = _nextToken(data, i)
+    if exists != "exists":
+        return newTG
+    
+    numTiers, i = _nextToken(data, i)
+    for _ in range(int(numTiers)):
+        tierType, i = _nextToken(data, i)
+        tierName, i = _nextToken(data, i)
+        tierStart, i = _nextToken(data, i)
+        tierEnd, i = _nextToken(data, i)
+        numEntries, i = _nextToken(data, i)
+        
+        unparsedTier = _UnparsedTier(data, i, tierType, tierName.strip(),
+                                     strToIntOrFloat(tierStart),
+                                     strToIntOrFloat(tierEnd),
+                                     int(numEntries), columnar)
+        
+        # Jump to the next tier
+        numFields = 3 if tierType == INTERVAL_TIER else 2
+        i = _skipTokens(data, i, unparsedTier.numEntries * numFields)
+        
+        if tierNames is not None and unparsedTier.name not in tierNames:
+            continue
+        
+        if lazy is True:
+            unparsedTier.detach(i)
+            newTG.tierNameList.append(unparsedTier.name)
+            newTG.tierDict[unparsedTier.name] = unparsedTier
+        else:
+            newTG.addTier(unparsedTier.parse())
+    
     return newTG
 
 
-def strToIntOrFloat(inputStr):
-    return float(inputStr) if '.' in inputStr else int(inputStr)
+def _readBinaryEntries(data, i, tierType, numEntries, skipLabels=False,
+                       columnar=False):
+    '''
+    Reads the entries of a tier in a binary textgrid starting at index /i/
+    
+    Returns the non-blank entries and the index just past the last entry.
+    If skipLabels is True, the entries are only located, not read, and the
+    returned entry list is empty.
+    '''
+    if tierType == INTERVAL_TIER:
+        timeStruct, entryType = _TWO_DOUBLES, Interval
+    else:
+        timeStruct, entryType = _DOUBLE, Point
+    timeSize = timeStruct.size
+    
+    entryList = _newEntryList(tierType, columnar)
+    if skipLabels is True:
+        for _ in range(numEntries):
+            i += timeSize
+            length = _UINT16.unpack_from(data, i)[0]
+            if length == 0xFFFF:
+                i = _readBinaryString(data, i)[1]
+            else:
+                i += 2 + length
+        
+        if i > len(data):
+            raise ValueError("Unexpected end of textgrid data")
+        
+        return entryList, i
+    
+    for _ in range(numEntries):
+        timeTuple = timeStruct.unpack_from(data, i)
+        label, i = _readBinaryString(data, i + timeSize)
+        label = label.strip()
+        if label == "":
+            continue
+        entryList.append(entryType(*(timeTuple + (label, ))))
+    
+    return entryList, i
 
 
-def _fetchRow(dataStr, searchStr, index):
-    startIndex = dataStr.index(searchStr, index) + len(searchStr)
-    endIndex = dataStr.index("\n", startIndex)
+def _readBinaryTier(data, i, tierType, tierName, tierStart, tierEnd,
+                    numEntries, columnar=False):
+    '''
+    Builds a tier from the entries in a binary textgrid at index /i/
+    
+    Returns the tier and the index just past its last entry.
+    '''
+    entryList, i = _readBinaryEntries(data, i, tierType, numEntries,
+                                      columnar=columnar)
     
-    word = dataStr[startIndex:endIndex]
-    word = word.strip()
-    if word[0] == '"' and word[-1] == '"':
-        word = word[1:-1]
-    word = word.strip()
+    return _newTier(tierType, tierName, entryList, tierStart, tierEnd), i
+
+
+def _parseBinaryTextgrid(data, tierNames=None, lazy=False, columnar=False):
+    '''
+    Reads a textgrid saved in praat's binary format
     
-    return word, endIndex + 1
+    See openTextgrid() for a description of tierNames, lazy, and columnar
+    '''
+    newTG = Textgrid()
+    if lazy is True:
+        newTG.tierDict = _LazyTierDict()
+    
+    # Header -- the object class is not needed
+    i = _readBinaryString(data, len(BINARY_HEADER), _UINT8)[1]
+    newTG.minTimestamp, newTG.maxTimestamp = _TWO_DOUBLES.unpack_from(data, i)
+    i += _TWO_DOUBLES.size
+    
+    # A textgrid without any tiers
+    hasTiers = _UINT8.unpack_from(data, i)[0]
+    i += _UINT8.size
+    if not hasTiers:
+        return newTG
+    
+    numTiers = _INT32.unpack_from(data, i)[0]
+    i += _INT32.size
+    for _ in range(numTiers):
+        tierType, i = _readBinaryString(data, i, _UINT8)
+        tierType = tierType.split()[0]  # Drop the class version, if any
+        tierName, i = _readBinaryString(data, i)
+        tierStart, tierEnd = _TWO_DOUBLES.unpack_from(data, i)
+        i += _TWO_DOUBLES.size
+        numEntries = _INT32.unpack_from(data, i)[0]
+        i += _INT32.size
+        
+        tierName = tierName.strip()
+        
+        if tierNames is None and lazy is False:
+            tier, i = _readBinaryTier(data, i, tierType, tierName,
+                                      tierStart, tierEnd, numEntries,
+                                      columnar)
+            newTG.addTier(tier)
+            continue
+        
+        unparsedTier = _UnparsedBinaryTier(data, i, tierType, tierName,
+                                           tierStart, tierEnd, numEntries,
+                                           columnar)
+        
+        # Jump to the next tier
+        i = _readBinaryEntries(data, i, tierType, numEntries,
+                               skipLabels=True)[1]
+        
+        if tierNames is not None and tierName not in tierNames:
+            continue
+        
+        if lazy is True:
+            unparsedTier.detach(i)
+            newTG.tierNameList.append(tierName)
+            newTG.tierDict[tierName] = unparsedTier
+        else:
+            newTG.addTier(unparsedTier.parse())
+    
+    return newTG
+
+
+def strToIntOrFloat(inputStr):
+    return float(inputStr) if '.' in inputStr else int(inputStr)
@@ -6,16 +6,58 @@ Created on Oct 30, 2015
 
 import os
 from os.path import join
+import bisect
 import subprocess
 import functools
 import itertools
 import io
+import codecs
+import mmap
 from pkg_resources import resource_filename
 
 # Get the folder one level above the current folder
 scriptsPath = resource_filename("praatio", "praatScripts", )
 
 
+class _TimeColumn(object):
+    '''
+    A read-only view of the times (first column) of a list of data rows
+    
+    Rows can be tuples or lists, so they can't be bisected directly.
+    '''
+    
+    def __init__(self, dataList):
+        self.dataList = dataList
+    
+    def __len__(self):
+        return len(self.dataList)
+    
+    def __getitem__(self, i):
+        return self.dataList[i][0]
+
+
+def _findTimeIndex(timestamp, timeList, fuzzyMatching=False, lo=0):
+    '''
+    Returns the index of /timestamp/ in /timeList/ and whether it was found
+    
+    If fuzzyMatching is True, the index of the nearest time is returned
+    instead (the earlier one on ties).  If nothing is found, the index
+    where /timestamp/ would be inserted is returned.
+    '''
+    i = bisect.bisect_left(timeList, timestamp, lo)
+    if i < len(timeList) and timeList[i] == timestamp:
+        return i, True
+    
+    if fuzzyMatching is False or len(timeList) == lo:
+        return i, False
+    
+    if i == len(timeList) or (i > lo and timestamp - timeList[i - 1] <=
+                              timeList[i] - timestamp):
+        i -= 1
+    
+    return i, True
+
+
 def getValueAtTime(timestamp, sortedDataTupleList, fuzzyMatching=False,
                    startI=0):
     '''
@@ -23,68 +65,49 @@ def getValueAtTime(timestamp, sortedDataTupleList, fuzzyMatching=False,
     
     If fuzzyMatching is True, if there is not a value
     at the requested timestamp, the nearest feature value will be taken.
+    If no value is found, the timestamp and "--" are returned.
     
     The procedure assumes that all data is ordered in time.
     dataTupleList should be in the form
     [(t1, v1a, v1b, ..), (t2, v2a, v2b, ..), ..]
     
-    The procedure makes one pass through dataTupleList and one
-    pass through self.entryList.  If the data is not sequentially
-    ordered, the incorrect response will be returned.
-    
-    For efficiency purposes, it takes a starting index and returns the ending
-    index.
+    The value is found by bisection, looking only at data from startI
+    onwards.  The returned index can be passed back in as startI when
+    looking up a later timestamp.  To look up many timestamps at once,
+    use getValuesAtTimes().
     '''
+    i, found = _findTimeIndex(timestamp, _TimeColumn(sortedDataTupleList),
+                              fuzzyMatching, startI)
+    if found is False:
+        return timestamp, "--", i
     
-    i = startI
-    
-    # Only find exact timestamp matches
-    if fuzzyMatching is False:
-        while True:
-            try:
-                dataTuple = sortedDataTupleList[i]
-            except IndexError:
-                currTime = timestamp
-                currVal = "--"
-                break
-
-            currTime = dataTuple[0]
-            currVal = dataTuple[1]
-            if timestamp == currTime:
-                break
-            i += 1
-        retTime = currTime
-        retVal = currVal
-    
-    # Find the closest timestamp
-    else:
-        bestTime = sortedDataTupleList[i][0]
-        bestVal = sortedDataTupleList[i][1]
-        i += 1
-        while True:
-            try:
-                dataTuple = sortedDataTupleList[i]
-            except IndexError:
-                break  # Last known value is the closest one
-
-            currTime = dataTuple[0]
-            currVal = dataTuple[1]
-
-            currDiff = abs(currTime - timestamp)
-            bestDiff = abs(bestTime - timestamp)
-            if currDiff < bestDiff:  # We're closer to the target val
-                bestTime = currTime
-                bestVal = currVal
-                if currDiff == 0:
-                    break  # Can't do better than a perfect match
-            elif currDiff > bestDiff:
-                break  # We've past the best value.
-            i += 1
-        
-        retTime = bestTime
-        retVal = bestVal
+    dataTuple = sortedDataTupleList[i]
+    
+    return dataTuple[0], dataTuple[1], i
+
 
-    return retTime, retVal, i
+def getValuesAtTimes(timestampList, sortedDataTupleList, fuzzyMatching=False):
+    '''
+    Get the values in the data list (sorted by time) at many timestamps
+    
+    Returns a list of (time, value) pairs in the same order as
+    timestampList.  Missing values are handled as in getValueAtTime().
+    The timestamps don't need to be sorted or evenly spaced.  Each one is
+    found by bisection, so n timestamps are looked up in m data points in
+    O(n log m) time.
+    '''
+    timeList = [dataTuple[0] for dataTuple in sortedDataTupleList]
+    
+    retList = []
+    for timestamp in timestampList:
+        i, found = _findTimeIndex(timestamp, timeList, fuzzyMatching)
+        if found is False:
+            retList.append((timestamp, "--"))
+        else:
+            dataTuple = sortedDataTupleList[i]
+            retList.append((dataTuple[0], dataTuple[1]))
+    
+    return retList
 
 
 def getValuesInInterval(dataTupleList, start, stop):
@@ -104,6 +127,63 @@ def getValuesInInterval(dataTupleList, start, stop):
     return intervalDataList
 
 
+def sniffEncoding(headData):
+    '''
+    Determines the encoding of a praat text file from its first few bytes
+    
+    Returns the encoding and the length of the byte order mark (BOM).
+    Praat writes utf-16 files with a BOM.  Files without a BOM are utf-16
+    if their first character contains a zero byte and utf-8 otherwise.
+    '''
+    for bom, encoding in ((codecs.BOM_UTF8, "utf-8"),
+                          (codecs.BOM_UTF16_LE, "utf-16-le"),
+                          (codecs.BOM_UTF16_BE, "utf-16-be")):
+        if headData[:len(bom)] == bom:
+            return encoding, len(bom)
+    
+    if headData[1:2] == b"\x00":
+        return "utf-16-le", 0
+    if headData[:1] == b"\x00":
+        return "utf-16-be", 0
+    
+    return "utf-8", 0
+
+
+def mapFile(fn):
+    '''
+    Returns a read-only memory map of a file
+    
+    The map supports slicing, regexes, and struct.unpack_from() like
+    bytes do, but the file is only paged into memory as it is read.
+    Empty files can't be mapped, so b"" is returned for them instead.
+    '''
+    with io.open(fn, "rb") as fd:
+        try:
+            return mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return b""
+
+
+def readTextFile(fn):
+    '''
+    Reads a praat text file, sniffing its encoding
+    
+    Windows line endings are converted to '\\n'.
+    '''
+    fileData = mapFile(fn)
+    try:
+        encoding, bomLength = sniffEncoding(fileData[:4])
+        data = fileData[bomLength:].decode(encoding)
+    finally:
+        if hasattr(fileData, "close"):
+            fileData.close()
+    
+    if "\r" in data:
+        data = data.replace("\r\n", "\n")
+    
+    return data
+
+
 def sign(x):
     '''Returns 1 if x is positive, 0 if x is 0, and -1 otherwise'''
     retVal = 0